@@ -0,0 +1,29 @@
+from typing import Dict, Union
+
+from schemas.game import GameEvent
+from schemas.wire import JSON_CODEC
+
+
+class EncodedEvent:
+    """Game event serialized at most once per wire codec and shared by every recipient of the same payload"""
+
+    __slots__ = ("event", "_encoded")
+
+    def __init__(self, event: GameEvent):
+        self.event = event
+        self._encoded: Dict[str, Union[str, bytes]] = {}
+
+    @property
+    def type(self) -> str:
+        return self.event.type
+
+    @property
+    def text(self) -> str:
+        return self.encode(JSON_CODEC)
+
+    def encode(self, codec) -> Union[str, bytes]:
+        data = self._encoded.get(codec.name)
+        if data is None:
+            data = codec.encode(self.event)
+            self._encoded[codec.name] = data
+        return data
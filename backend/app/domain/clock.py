@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from app.domain.scheduler import DeadlineScheduler
+
+
+class Clock:
+    """Time source for rooms.
+
+    Deadlines live on the monotonic timescale so wall-clock jumps can't move
+    them, wall time is only for timestamps shown to clients.
+    """
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def wall(self) -> float:
+        return time.time()
+
+    def to_wall(self, deadline: float) -> float:
+        """Wall-clock time at which a monotonic deadline passes, as of now"""
+        return self.wall() + (deadline - self.monotonic())
+
+    async def sleep(self, delay: float):
+        await asyncio.sleep(delay)
+
+    def make_scheduler(self) -> DeadlineScheduler:
+        """Deadline scheduler for rooms running on this clock"""
+        return DeadlineScheduler(self.monotonic)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class VirtualClock(Clock):
+    """Time which only moves when advanced, so games simulate as fast as the CPU allows.
+
+    Every room on the clock shares its scheduler. Advancing jumps straight to
+    each due deadline in turn and runs its callback to completion before the
+    next one, which keeps runs deterministic.
+    """
+
+    def __init__(self, start: float = 0.0, wall_start: float = 1_750_000_000.0):
+        self.now = start
+        self.wall_offset = wall_start - start
+        self.scheduler = DeadlineScheduler(self.monotonic, autostart=False)
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def wall(self) -> float:
+        return self.now + self.wall_offset
+
+    async def sleep(self, delay: float):
+        done = asyncio.get_running_loop().create_future()
+
+        async def wake():
+            if not done.done():
+                done.set_result(None)
+
+        self.scheduler.call_at(self.now + delay, wake)
+        await done
+
+    def make_scheduler(self) -> DeadlineScheduler:
+        return self.scheduler
+
+    async def advance(self, seconds: float):
+        await self.run_until(self.now + seconds)
+
+    async def run_until(self, deadline: float):
+        """Fire every timer due by `deadline`, then leave the clock there"""
+        while True:
+            await self._settle()
+            when = self.scheduler.next_deadline()
+            if when is None or when > deadline:
+                break
+            self.now = max(self.now, when)
+            await self.scheduler.fire_due()
+        self.now = max(self.now, deadline)
+        await self._settle()
+
+    async def _settle(self):
+        # let tasks woken by the last step, e.g. posted room commands, run first
+        for _ in range(20):
+            await asyncio.sleep(0)
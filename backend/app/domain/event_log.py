@@ -0,0 +1,42 @@
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from schemas.game import GameLogEntry
+
+
+class EventLog:
+    """Append-only game log addressed by numeric offsets.
+
+    Only the newest `retention` entries are kept in memory, older offsets stay
+    valid as numbers but can no longer be read.
+    """
+
+    def __init__(self, retention: int = 500):
+        self.retention = retention
+        self._entries: Deque[GameLogEntry] = deque(maxlen=retention)
+        self.next_offset = 0
+
+    @property
+    def first_offset(self) -> int:
+        """Offset of the oldest entry still retained"""
+        return self.next_offset - len(self._entries)
+
+    def append(self, entry: GameLogEntry) -> int:
+        self._entries.append(entry)
+        self.next_offset += 1
+        return self.next_offset - 1
+
+    def read(self, start: int, limit: Optional[int] = None) -> Tuple[int, List[GameLogEntry]]:
+        """Entries from `start` onwards, returns the offset of the first one actually returned"""
+        start = max(start, self.first_offset)
+        end = self.next_offset if limit is None else min(self.next_offset, start + limit)
+        base = self.first_offset
+        return start, [self._entries[i - base] for i in range(start, end)]
+
+    def page_before(self, before: Optional[int], limit: int) -> Tuple[int, List[GameLogEntry]]:
+        """Up to `limit` entries preceding `before` (the newest ones when None)"""
+        end = self.next_offset if before is None else min(before, self.next_offset)
+        start = max(self.first_offset, end - limit)
+        if start >= end:
+            return end, []
+        return self.read(start, end - start)
@@ -1,23 +1,32 @@
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
+from collections import defaultdict, deque
 import random
 import asyncio
+import inspect
+import itertools
 import logging
-from typing import Dict, List
+import os
+import re
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
 from schemas.game import (
     ActionAck,
     ActionAckPayload,
     EveningNews,
     EveningNewsPayload,
     GameEvent,
+    GameLog,
     GameLogEntry,
+    GameLogPayload,
+    GameLogRequest,
+    GameStateAck,
     GameStateRequest,
     GameStateSync,
     GameStateSyncPayload,
     MessageReceived,
     MorningNews,
     MorningNewsPayload,
+    NarratorChunk,
+    NarratorChunkPayload,
     NarratorMessage,
     NarratorMessagePayload,
     NarratorFinished,
@@ -44,21 +53,114 @@ from schemas.game import (
     ProfilesComplete,
     ProfilesCompletePayload,
 )
+from app import metrics
+from app.domain.broadcast import EncodedEvent
+from app.domain.clock import SYSTEM_CLOCK, Clock
+from app.domain.event_log import EventLog
 from app.domain.game_state import GameState, Phase, PlayerGameState, Role
-from app.services.llm_client import DeepSeekClient
+from app.domain.night_narratives import NightNarratives, Outcome
+from app.domain.rate_limit import DEFAULT_RATE_LIMITS, RateLimit
+from app.domain.scheduler import DeadlineScheduler, Timer, deadline_scheduler
+from app.domain.single_flight import SingleFlight
+from app.domain.state_sync import StateSyncTracker
+from app.services.backends import make_backend
+from app.services.llm_backend import LLMBackend
+from app.services.llm_scheduler import Priority
 from app.services.narrator_service import NarratorService
-from app.services.character_generator import CharacterGenerator
+from app.services.character_generator import CharacterGenerator, CharacterProfile as GeneratedProfile
 
 
+STATE_SYNCS = metrics.counter(
+    "game_state_syncs_total",
+    "Room state syncs, sent or suppressed: every sync interval a room with players spent clean counts as one suppressed",
+)
+
+# public events which are recorded in the game log
+LOGGED_EVENT_TYPES = frozenset({
+    "player.joined",
+    "player.left",
+    "phase.change",
+    "message.received",
+    "narrator.message",
+    "action.morning_news",
+    "action.evening_news",
+})
+
+# how long the room waits on a narration before using the canned text
+NARRATION_DEADLINE_S = float(os.getenv("NARRATION_DEADLINE_S", "4"))
+
+# how long narrator deltas are gathered into one narrator.chunk, unless a sentence ends first
+NARRATION_CHUNK_INTERVAL_S = float(os.getenv("NARRATION_CHUNK_INTERVAL_S", "0.1"))
+SENTENCE_END = re.compile(r"[.!?…][\"')\]]*\s*$")
+
+OPENING_STORY_FALLBACK = "Night falls over the quiet town. The residents lock their doors, knowing that danger lurks in the shadows."
+
 
 class PlayerAdapter(ABC):
     @abstractmethod
     async def receive_event(self, event: GameEvent):
         raise NotImplementedError
 
+    async def receive_encoded(self, frame: EncodedEvent):
+        """Receive an event pre-encoded once for all its recipients"""
+        await self.receive_event(frame.event)
+
+
+Command = Tuple[Callable, tuple, Optional[asyncio.Future]]
+
+
+class NarrationStream:
+    """One narration, broadcast chunk by chunk while the LLM is still writing it.
+
+    The LLM's deltas are a token or two each, so they're gathered into a chunk
+    until a sentence ends or `interval_s` has passed since the previous one.
+    The first delta goes out at once. Whatever is pending when the narration
+    ends is left to the final narrator.message, which carries the whole text.
+    """
+
+    def __init__(self, room: "GameManager", stream_id: int, interval_s: float = NARRATION_CHUNK_INTERVAL_S):
+        self.room = room
+        self.stream_id = stream_id
+        self.interval_s = interval_s
+        self.chunks = 0
+        self.started: Optional[float] = None
+        self.sent_at = 0.0
+        self.pending = ""
+
+    async def send(self, text: str):
+        now = self.room.clock.monotonic()
+        if self.started is None:
+            self.started = now
+        self.pending += text
+        if self.chunks and now - self.sent_at < self.interval_s and not SENTENCE_END.search(self.pending):
+            return
+        self.room._broadcast(
+            NarratorChunk(
+                type="narrator.chunk",
+                payload=NarratorChunkPayload(stream_id=self.stream_id, index=self.chunks, text=self.pending),
+            )
+        )
+        self.chunks += 1
+        self.sent_at = now
+        self.pending = ""
+        # players start reading on the first chunk, not once the whole command is applied
+        await self.room._dispatch()
+
+    def shown_s(self) -> float:
+        """How long players have been watching the narration type out"""
+        return 0.0 if self.started is None else self.room.clock.monotonic() - self.started
+
 
-# TODO: refactor to return events, not send them - race conditions!
 class GameManager:
+    """One room, run as an actor.
+
+    Client events, ticks, narrator and profile timers all become commands in
+    the room's inbox, applied one at a time. A command only mutates state and
+    queues outbound events, which are dispatched to players once it's applied.
+    Narrations and profiles are written beside the actor, their chunks and
+    results come back in through the inbox, so a slow LLM never holds the room.
+    """
+
     def __init__(
         self,
         mafiosi_count: int = 2,
@@ -68,7 +170,14 @@ class GameManager:
         vote_duration_s=35,
         lobby_duration_s=30,
         character_intro_duration_s=5,
-        ended_duation_s=20
+        ended_duation_s=20,
+        log_retention=500,
+        rate_limits: Optional[Dict[str, RateLimit]] = None,
+        sync_interval_s=1.0,
+        scheduler: Optional[DeadlineScheduler] = None,
+        clock: Optional[Clock] = None,
+        narration_deadline_s: float = NARRATION_DEADLINE_S,
+        llm_backend: Optional[LLMBackend] = None,
     ):
         self.mafiosi_count = mafiosi_count
         self.medic_count = medic_count
@@ -78,52 +187,174 @@ class GameManager:
         self.lobby_duration_s = lobby_duration_s
         self.character_intro_duration_s = character_intro_duration_s
         self.ended_duration_s = ended_duation_s
+        self.sync_interval_s = sync_interval_s
+        self.narration_deadline_s = narration_deadline_s
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        if scheduler is None:
+            # the shared scheduler runs on the system clock, any other clock brings its own
+            scheduler = deadline_scheduler if clock is None else self.clock.make_scheduler()
+        self.scheduler = scheduler
+        # inbound frame limits for each connection to this room, by event type
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
 
         self.game_state = GameState()
-        self.llm_client = DeepSeekClient()
+        # the deployment's backend unless the room brings its own, e.g. the offline one for load tests
+        self.llm_client = make_backend() if llm_backend is None else llm_backend
         self.character_profiles = {}
         self.profiles_generated = False
         self.showing_profiles = False
         self.profiles_shown_this_game = False
         self.narrator_service = NarratorService(self.llm_client)
         self.character_generator = CharacterGenerator(self.llm_client)
+        self.night_narratives = NightNarratives(self._generate_night_narrative)
         self.players: Dict[str, PlayerAdapter] = dict()
         self.player_names: Dict[str, str] = dict()
         self.lobby = True
-        self.next_phase_timestamp: float = (datetime.now(tz=timezone.utc) + timedelta(
-            minutes=1, milliseconds=499
-        )).timestamp()
         self.cast_votes: Dict[str, str] = defaultdict(str)
         self.heal_votes: Dict[str, str] = defaultdict(str)
-        self.event_log: List[GameLogEntry] = []
-        self.opening_story: str = ""
+        self.event_log = EventLog(log_retention)
+        self.state_sync = StateSyncTracker()
+        # parts of the room state changed since the last sync: phase, players,
+        # votes and narrator
+        self._dirty: Set[str] = set()
+        self._dirty_since = 0.0
+        self._clean_since = 0.0
+        self._tick_timer: Optional[Timer] = None
+        self._ticking = False
+        # end of the current phase: a monotonic deadline, and the wall time shown to clients
+        self.phase_deadline = 0.0
+        self.next_phase_timestamp = 0.0
+        self._set_phase_deadline(60.499)
+        # generations every client asks for, e.g. the opening story, run once per game
+        self.flights = SingleFlight()
         self.narrator_active = False
+        # a phase-end narration is being written beside the actor, the next phase waits for it
+        self._narrating = False
+        self._narration_task: Optional[asyncio.Task] = None
+        self._narration_ids = itertools.count(1)
         self.logger = logging.getLogger(__name__)
 
-        self._tick_task = None
-        self._scheduler_started = False
-
-    def _ensure_tick_scheduler(self):
-        """Ensure the regular tick scheduler is running"""
-        if not self._scheduler_started:
+        self._inbox: Deque[Command] = deque()
+        # events queued by the command being applied, sent by _dispatch once it's done.
+        # Commands reach _send/_broadcast through dozens of nested helpers, an outbox
+        # gives the same split as transitions returning their events without
+        # threading an event list through every one of them, and a command still
+        # never touches a player socket.
+        self._outbox: List[Tuple[PlayerAdapter, EncodedEvent]] = []
+        self._actor_task: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+
+    def _post(self, apply: Callable, *args, done: Optional[asyncio.Future] = None):
+        """Queue a command for the room's actor without waiting for it"""
+        self._inbox.append((apply, args, done))
+        if self._actor_task is None or self._actor_task.done():
+            self._actor_task = asyncio.create_task(self._run_actor())
+
+    async def _submit(self, apply: Callable, *args):
+        """Queue a command and wait until it's applied and its events dispatched, returning its result.
+
+        Never call from within a command, it would wait on itself.
+        """
+        done = asyncio.get_running_loop().create_future()
+        self._post(apply, *args, done=done)
+        return await done
+
+    def _spawn(self, work: Awaitable) -> asyncio.Task:
+        """Run `work` beside the actor, e.g. a generation the room mustn't wait on"""
+        task = asyncio.ensure_future(work)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def _run_actor(self):
+        # runs only while commands are waiting, an idle room has no task
+        while self._inbox:
+            apply, args, done = self._inbox.popleft()
+            error = result = None
             try:
-                self._tick_task = asyncio.create_task(self._tick_loop())
-                self._scheduler_started = True
-                self.logger.info("🕐 Started game tick scheduler")
-            except RuntimeError as e:
-                self.logger.error(f"🕐 Failed to start scheduler: {e}")
-
-    async def _tick_loop(self):
-        """Regular tick loop that runs every second"""
-        while True:
+                result = apply(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as e:
+                error = e
+                self.logger.error(f"🎬 Command {apply.__name__} failed: {e}")
+            await self._dispatch()
+            if done is not None and not done.done():
+                if error is None:
+                    done.set_result(result)
+                else:
+                    done.set_exception(error)
+
+    async def _dispatch(self):
+        """Hand the events queued by the last command to their players, in order"""
+        outbox, self._outbox = self._outbox, []
+        for player, frame in outbox:
             try:
-                await self._tick()
-                await asyncio.sleep(1.0)
+                await player.receive_encoded(frame)
             except Exception as e:
-                self.logger.error(f"🕐 Error in tick loop: {e}")
-                await asyncio.sleep(1.0)
+                self.logger.error(f"📡 Failed to dispatch {frame.type}: {e}")
+
+    def _send(self, player: PlayerAdapter, event: GameEvent):
+        self._outbox.append((player, EncodedEvent(event)))
 
-    async def _broadcast(
+    def _send_encoded(self, player: PlayerAdapter, frame: EncodedEvent):
+        self._outbox.append((player, frame))
+
+    def _call_later(self, delay: float, apply: Callable, *args) -> Timer:
+        """Run a command through the inbox once `delay` seconds have passed"""
+        async def submit():
+            await self._submit(apply, *args)
+        return self.scheduler.call_at(self.clock.monotonic() + delay, submit)
+
+    def _ensure_tick_scheduler(self):
+        """Ensure the room's next tick is registered with the scheduler"""
+        if self._tick_timer is None:
+            self._schedule_tick()
+
+    def _next_tick_at(self) -> Optional[float]:
+        """The phase deadline, or the pending state sync if that comes first.
+
+        None for an empty room, or one with neither a countdown running nor
+        unsynced changes, which needs no wakeup at all.
+        """
+        if not self.players:
+            return None
+        tick_at = None
+        if self._dirty:
+            tick_at = self._dirty_since + self.sync_interval_s
+        if (
+            not self.narrator_active
+            and not self._narrating
+            and not self.showing_profiles
+            and not (self.lobby and len(self.players) < 4)
+        ):
+            tick_at = self.phase_deadline if tick_at is None else min(tick_at, self.phase_deadline)
+        return tick_at
+
+    def _schedule_tick(self):
+        """Re-register the room's next tick, after anything moving its phase deadline"""
+        if self._ticking:
+            # the running tick schedules the next one when it's done
+            return
+        if self._tick_timer is not None:
+            self.scheduler.cancel(self._tick_timer)
+            self._tick_timer = None
+        tick_at = self._next_tick_at()
+        if tick_at is not None:
+            self._tick_timer = self.scheduler.call_at(tick_at, self._run_tick)
+
+    async def _run_tick(self):
+        self._tick_timer = None
+        self._ticking = True
+        try:
+            await self._submit(self._tick)
+        except Exception as e:
+            self.logger.error(f"🕐 Error in tick: {e}")
+        finally:
+            self._ticking = False
+            self._schedule_tick()
+
+    def _broadcast(
         self, event: GameEvent, excluded_player_ids=None, included_player_roles=None
     ):
         excluded_player_ids = excluded_player_ids or []
@@ -131,7 +362,10 @@ class GameManager:
 
         if included_player_roles:
             self.logger.info(f"📡 Broadcasting {event.type} to roles: {included_player_roles}")
+        elif not excluded_player_ids and event.type in LOGGED_EVENT_TYPES:
+            self._append_log(event)
 
+        frame = EncodedEvent(event)
         for uuid, player in self.players.items():
             player_role = self.game_state.players[uuid]["role"]
             should_send = uuid not in excluded_player_ids and (
@@ -143,13 +377,59 @@ class GameManager:
                 self.logger.info(f"📡 Player {uuid} role={player_role}, should_send={should_send}")
 
             if should_send:
-                await player.receive_event(event)
+                self._send_encoded(player, frame)
+
+    def _set_phase_deadline(self, duration_s: float):
+        """Start the countdown of the phase just entered, every phase change goes through here"""
+        self.phase_deadline = self.clock.monotonic() + duration_s
+        self.next_phase_timestamp = self.clock.to_wall(self.phase_deadline)
+        self._mark_dirty("phase")
+
+    def _extend_phase(self, duration_s: float):
+        self.phase_deadline += duration_s
+        self.next_phase_timestamp += duration_s
+        self._mark_dirty("phase")
+
+    def _mark_dirty(self, *parts: str):
+        if not self._dirty:
+            # first change since the last sync, arm the timer which syncs it
+            self._dirty_since = self.clock.monotonic()
+            if self.players:
+                # the once-a-second syncs the room had no timer for while it was clean
+                skipped = int((self._dirty_since - self._clean_since) / self.sync_interval_s)
+                if skipped > 0:
+                    STATE_SYNCS.inc(skipped, outcome="suppressed")
+            self._dirty.update(parts)
+            self._schedule_tick()
+        else:
+            self._dirty.update(parts)
+
+    def _append_log(self, event: GameEvent):
+        # not pushed to the players, clients read the log with game.log_request
+        self.event_log.append(
+            GameLogEntry(
+                timestamp=self.clock.wall(),
+                event=event.type,
+                details=event.payload.model_dump(),
+            )
+        )
 
-    def _calculate_narrator_duration(self, text: str) -> float:
-        """Calculate how long narrator animation should take"""
+    def _construct_game_log_event(self, offset: int, entries: List[GameLogEntry]) -> GameLog:
+        return GameLog(
+            type="game.log",
+            payload=GameLogPayload(
+                offset=offset,
+                entries=entries,
+                first_offset=self.event_log.first_offset,
+                next_offset=self.event_log.next_offset,
+            ),
+        )
+
+    def _calculate_narrator_duration(self, text: str, shown_s: float = 0.0) -> float:
+        """Calculate how long narrator animation should take, less what already played while streaming"""
         # 40ms per character + 3 seconds pause after animation
         char_count = len(text)
-        animation_time = (char_count * 40) / 1000  # 40ms per character in seconds
+        animation_time = max(0.0, (char_count * 40) / 1000 - shown_s)  # 40ms per character in seconds
         pause_time = 3.0  # 3 seconds pause after animation
         total_duration = animation_time + pause_time
 
@@ -173,68 +453,91 @@ class GameManager:
         self.logger.info(f"🎭 Profile duration: {char_count} chars, animation={animation_time:.1f}s, pause={pause_time}s, total={duration:.1f}s")
         return duration
 
-    async def _send_narrator_message(self, text: str):
-        """Send narrator message to all players with calculated duration"""
-        import time
+    def _open_narration(self) -> NarrationStream:
+        return NarrationStream(self, next(self._narration_ids))
 
-        animation_duration = self._calculate_narrator_duration(text)
+    def _send_narrator_message(self, text: str, stream: Optional[NarrationStream] = None) -> NarratorMessage:
+        """Send narrator message to all players with calculated duration, completing `stream` if it was streamed"""
+        animation_duration = self._calculate_narrator_duration(text, stream.shown_s() if stream else 0.0)
 
         self.narrator_active = True
+        self._mark_dirty("narrator")
         self.logger.info(f"🎭 narrator_active set to TRUE - timer should be paused")
 
         narrator_event = NarratorMessage(
             type="narrator.message",
             payload=NarratorMessagePayload(
                 text=text,
-                timestamp=time.time(),
-                duration=animation_duration
+                timestamp=self.clock.wall(),
+                duration=animation_duration,
+                stream_id=stream.stream_id if stream else None
             )
         )
 
         self.logger.info(f"🎭 Sending narrator message (duration: {animation_duration:.1f}s, timer paused): {text}")
-        await self._broadcast(narrator_event)
+        self._broadcast(narrator_event)
 
-        await self._sync_game_state()
+        self._sync_game_state()
 
-        task = asyncio.create_task(self._schedule_narrator_finish(animation_duration))
-        self.logger.info(f"🎭 Created narrator finish task: {task}")
-
-        def task_done_callback(task):
-            if task.exception():
-                self.logger.error(f"🎭 Narrator finish task failed: {task.exception()}")
-            else:
-                self.logger.info(f"🎭 Narrator finish task completed successfully")
+        self.logger.info(f"🎭 Narrator scheduled to finish in {animation_duration:.1f}s")
+        self._call_later(animation_duration, self._finish_narrator, animation_duration)
+        return narrator_event
 
-        task.add_done_callback(task_done_callback)
-
-    async def _schedule_narrator_finish(self, duration: float):
-        """Automatically finish narrator after specified duration"""
-        self.logger.info(f"🎭 Narrator scheduled to finish in {duration:.1f}s")
-        await asyncio.sleep(duration)
-
-        self.next_phase_timestamp += duration
+    def _finish_narrator(self, duration: float):
+        """Finish the narrator once its animation played, extending the phase by its duration"""
+        self._extend_phase(duration)
         self.logger.info(f"🎭 Extended phase time by {duration:.1f}s - new end: {self.next_phase_timestamp}")
 
         self.narrator_active = False
+        self._mark_dirty("narrator")
         self.logger.info(f"🎭 narrator_active set to FALSE - timer resumed with extended time")
+        self._schedule_tick()
 
-        await self._sync_game_state()
+        self._sync_game_state()
 
-    async def send_opening_story(self):
-        if not self.opening_story:
-            try:
-                player_names = list(self.player_names.values())
-                self.opening_story = self.narrator_service.generate_story_opening(player_names)
-            except Exception:
-                self.opening_story = "Night falls over the quiet town. The residents lock their doors, knowing that danger lurks in the shadows."
+    def _request_opening_story(self, player: PlayerAdapter):
+        told = self.flights.result("opening_story")
+        if told is not None:
+            # a late duplicate, answered from the story already told this game
+            self._send(player, told)
+            return
+        # every client asks, requests arriving while it's written join the one generation
+        self._spawn(self.send_opening_story())
+
+    async def send_opening_story(self) -> NarratorMessage:
+        """Tell the opening story once, however many clients ask for it.
+
+        Runs beside the actor so the room carries on while the narrator writes,
+        the chunks and the final message go through the inbox. Never call from
+        within a command.
+        """
+        return await self.flights.do("opening_story", self._tell_opening_story)
+
+    async def _tell_opening_story(self) -> NarratorMessage:
+        stream = self._open_narration()
+
+        async def send_chunk(text: str):
+            await self._submit(stream.send, text)
 
-        await self._send_narrator_message(self.opening_story)
-        self.opening_story = ""
+        try:
+            player_names = list(self.player_names.values())
+            story = await self.narrator_service.generate_story_opening(
+                player_names, on_chunk=send_chunk, deadline_s=self.narration_deadline_s
+            )
+        except Exception:
+            story = OPENING_STORY_FALLBACK
+        return await self._submit(self._send_narrator_message, story, stream)
     
-    async def _generate_character_profiles(self):
-        if self.profiles_generated:
-            return
-        
+    async def prepare_character_profiles(self) -> List[GeneratedProfile]:
+        """Write the players' character profiles once, however many times it's asked for.
+
+        Runs beside the actor like the opening story, the room carries on while
+        the profiles are written and only applying them goes through the inbox.
+        Never call from within a command.
+        """
+        return await self.flights.do("character_profiles", self._write_character_profiles)
+
+    async def _write_character_profiles(self) -> List[GeneratedProfile]:
         player_data = []
         for player_id, player_name in self.player_names.items():
             player_data.append({
@@ -243,18 +546,22 @@ class GameManager:
             })
 
         try:
-            profiles = self.character_generator.generate_profiles_for_players(player_data)
-
-            for profile in profiles:
-                self.character_profiles[profile.player_id] = profile
+            profiles = await self.character_generator.generate_profiles_for_players(player_data)
+        except Exception:
+            profiles = self._fallback_profiles(player_data)
+        await self._submit(self._apply_character_profiles, profiles)
+        return profiles
 
-            self.narrator_service.set_character_profiles(profiles)
-            self.profiles_generated = True
+    def _apply_character_profiles(self, profiles: List[GeneratedProfile]):
+        if self.profiles_generated:
+            return
+        for profile in profiles:
+            self.character_profiles[profile.player_id] = profile
 
-        except Exception:
-            await self._generate_fallback_profiles(player_data)
+        self.narrator_service.set_character_profiles(profiles)
+        self.profiles_generated = True
 
-    async def _generate_fallback_profiles(self, player_data):
+    def _fallback_profiles(self, player_data) -> List[GeneratedProfile]:
         fallback_professions = [
             ("👨‍🍳", "Chef", "The town's beloved chef who knows everyone's secrets through dinner conversations."),
             ("👮", "Police Officer", "A sharp-eyed detective who notices everything but trusts no one."),
@@ -267,74 +574,89 @@ class GameManager:
         ]
 
         profiles = []
-        for i, (player_id, name) in enumerate(player_data):
+        for i, player in enumerate(player_data):
+            player_id, name = player["player_id"], player["name"]
             emoji, profession, description = fallback_professions[i % len(fallback_professions)]
 
-            profile = CharacterProfile(
+            profiles.append(GeneratedProfile(
                 player_id=player_id,
                 name=name,
                 profession=profession,
                 description=f"{name} is {description}",
                 emoji=emoji,
-                current_index=i + 1,
-                total_count=len(player_data)
-            )
-            profiles.append(profile)
-            self.character_profiles[player_id] = profile
-
-        self.narrator_service.set_character_profiles(profiles)
-        self.profiles_generated = True
+            ))
+        return profiles
 
-    async def _show_character_profiles(self):
+    def _show_character_profiles(self):
         self.logger.info("🎭 _show_character_profiles() called")
-        await self._generate_character_profiles()
+        if not self.profiles_generated:
+            # still being written, the presentation starts once they're applied
+            self._spawn(self._show_character_profiles_when_ready())
+            return
+        self._present_character_profiles()
 
+    async def _show_character_profiles_when_ready(self):
+        await self.prepare_character_profiles()
+        await self._submit(self._present_character_profiles)
+
+    def _present_character_profiles(self):
+        if not self.showing_profiles:
+            return
         if not self.character_profiles:
             self.logger.warning("No character profiles to show")
             self.showing_profiles = False
+            self._schedule_tick()
             return
 
-        await self._broadcast(
+        self._broadcast(
             ProfilesStart(
                 type="character.profiles_start",
                 payload=ProfilesStartPayload(total_count=len(self.character_profiles))
             )
         )
 
-        for index, (_, profiles) in enumerate(self.character_profiles.items(), start=1):
-            if index > 1:
-                await asyncio.sleep(1)
-
-            # Calculate duration based on description length
-            profile_duration = self._calculate_profile_duration(profiles.description)
-
-            payload = CharacterProfilePayload(
-                player_id=profiles.player_id,
-                name=profiles.name,
-                profession=profiles.profession,
-                description=profiles.description,
-                emoji=profiles.emoji,
-                current_index=index,
-                total_count=len(self.character_profiles)
-            )
-            await self._broadcast(
-                CharacterProfile(
-                    type="character.profile",
-                    payload=payload
+        self._show_character_profile(1)
+
+    def _show_character_profile(self, index: int):
+        """Show the index-th profile, the next one follows once its animation and a one second pause are over"""
+        if not self.showing_profiles:
+            return
+        if index > len(self.character_profiles):
+            self._broadcast(
+                ProfilesComplete(
+                    type="character.profiles_complete",
+                    payload=ProfilesCompletePayload()
+                    )
                 )
-            )
+            self.showing_profiles = False
+            self.logger.info("Finished showing character profiles")
+            self._schedule_tick()
+            return
 
-            self.logger.info(f"Showed profile {index}/{len(self.character_profiles)}: {profiles.name} {profiles.profession} (duration: {profile_duration:.1f}s)")
-            await asyncio.sleep(profile_duration)
+        profiles = list(self.character_profiles.values())[index - 1]
 
-        await self._broadcast(
-            ProfilesComplete(
-                type="character.profiles_complete",
-                payload=ProfilesCompletePayload()
-                )
+        # Calculate duration based on description length
+        profile_duration = self._calculate_profile_duration(profiles.description)
+
+        payload = CharacterProfilePayload(
+            player_id=profiles.player_id,
+            name=profiles.name,
+            profession=profiles.profession,
+            description=profiles.description,
+            emoji=profiles.emoji,
+            current_index=index,
+            total_count=len(self.character_profiles)
+        )
+        self._broadcast(
+            CharacterProfile(
+                type="character.profile",
+                payload=payload
             )
-        self.showing_profiles = False
-        self.logger.info("Finished showing character profiles")
+        )
+
+        self.logger.info(f"Showed profile {index}/{len(self.character_profiles)}: {profiles.name} {profiles.profession} (duration: {profile_duration:.1f}s)")
+        pause = 1 if index < len(self.character_profiles) else 0
+        self._call_later(profile_duration + pause, self._show_character_profile, index + 1)
 
     def _add_default_state_player_to_game_state(self, uuid: str):
         self.game_state.add_player(
@@ -345,15 +667,23 @@ class GameManager:
         self.players[uuid] = player
         self.player_names[uuid] = name
         self._add_default_state_player_to_game_state(uuid)
+        if self.lobby and len(self.players) == 4:
+            self._set_phase_deadline(self.lobby_duration_s)
+        self._mark_dirty("players")
+        self._schedule_tick()
 
     def remove_player(self, uuid: str):
         del self.players[uuid]
         del self.player_names[uuid]
         self.game_state.remove_player(uuid)
+        self.state_sync.forget(uuid)
+        self._mark_dirty("players")
+        self._schedule_tick()
 
     def _reset_votes(self):
         self.cast_votes = defaultdict(str)
         self.heal_votes = defaultdict(str)
+        self._mark_dirty("votes")
 
     def _get_heal_winner(self):
         if len(self.heal_votes) == 0:
@@ -419,7 +749,6 @@ class GameManager:
                 narrator_active=self.narrator_active,
                 votes=visible_votes,
                 winner=winner,
-                logs=self.event_log,
             ),
         )
 
@@ -444,24 +773,49 @@ class GameManager:
                 narrator_active=self.narrator_active,
                 votes=self.cast_votes,
                 winner=winner,
-                logs=self.event_log,
             ),
         )
 
-    async def _sync_game_state(self):
+    def _publish_game_state(self) -> int:
+        """Publish one game state view per visibility class, returns the room state version"""
+        viewer_roles = {state["role"] for state in self.game_state.players.values()}
+        return self.state_sync.publish({
+            role: self._construct_confidentially_revealing_game_state_sync_event(role).payload
+            for role in viewer_roles
+        })
+
+    def _sync_game_state(self):
+        """Send players what changed since the last sync, nothing when the room is clean.
+
+        Clients asking with game.sync_request are answered regardless.
+        """
+        if not self._dirty:
+            STATE_SYNCS.inc(outcome="suppressed")
+            return
+        STATE_SYNCS.inc(outcome="sent")
+        dirty, self._dirty = self._dirty, set()
+        self._clean_since = self.clock.monotonic()
+        self._publish_game_state()
         for uuid, pa in self.players.items():
-            await pa.receive_event(
-                self._construct_confidentially_revealing_game_state_sync_event(
-                    self.game_state.players[uuid]["role"]
-                )
-            )
+            frame = self.state_sync.event_for(uuid, self.game_state.players[uuid]["role"])
+            if frame is not None:
+                self._send_encoded(pa, frame)
+
+    def _sync_revealed_game_state(self):
+        self._dirty.clear()
+        self._clean_since = self.clock.monotonic()
+        self.state_sync.publish({"revealed": self._construct_revealing_game_state_sync_event().payload})
+        for uuid, pa in self.players.items():
+            frame = self.state_sync.event_for(uuid, "revealed")
+            if frame is not None:
+                self._send_encoded(pa, frame)
 
-    async def _end_game(self):
-        self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(seconds=self.ended_duration_s)).timestamp()
-        await self._broadcast(self._construct_revealing_game_state_sync_event())
-        await self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="ended", ends_at=self.next_phase_timestamp)))
+    def _end_game(self):
+        self._set_phase_deadline(self.ended_duration_s)
+        self._sync_revealed_game_state()
+        self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="ended", ends_at=self.next_phase_timestamp)))
 
-    async def _check_game_over(self):
+    def _check_game_over(self):
         if self.showing_profiles:
             self.logger.info("🚫 _check_game_over() skipped - showing profiles")
             return
@@ -470,11 +824,12 @@ class GameManager:
         self.logger.info(f"🔍 _check_game_over(): game_over={game_over}")
         if game_over:
             self.logger.info("🏁 Game over detected - ending game")
-            await self._end_game()
+            self._end_game()
 
     async def _end_lobby(self):
         self.logger.info("🏁 _end_lobby() called - Ending lobby...")
         self.lobby = False
+        self._mark_dirty("players")
 
         for p_uuid in self.game_state.players.keys():
             self.game_state.players[p_uuid]["alive"] = True
@@ -486,13 +841,13 @@ class GameManager:
         narrator_time = 8
         total_intro_time = self.character_intro_duration_s + profile_time + narrator_time
 
-        self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(seconds=total_intro_time)).timestamp()
-        await self._sync_game_state()
-        await self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="character_intro", ends_at=self.next_phase_timestamp)))
+        self._set_phase_deadline(total_intro_time)
+        self._sync_game_state()
+        self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="character_intro", ends_at=self.next_phase_timestamp)))
 
         if not self.profiles_shown_this_game:
             self.showing_profiles = True
-            await self._show_character_profiles()
+            self._show_character_profiles()
             self.profiles_shown_this_game = True
         else:
             self.logger.info("🚫 Skipping profile presentation - already shown this game")
@@ -500,53 +855,113 @@ class GameManager:
     async def _end_character_intro(self):
         self.showing_profiles = False
         self.game_state.end_character_intro()
-        self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(seconds=self.night_duration_s)).timestamp()
-        await self._sync_game_state()
-        await self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="night", ends_at=self.next_phase_timestamp)))
+        self._set_phase_deadline(self.night_duration_s)
+        self._sync_game_state()
+        self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="night", ends_at=self.next_phase_timestamp)))
+
+    def _night_outcome(self) -> Optional[Outcome]:
+        """What the night comes to if it ended now"""
+        vote_winner = self._get_vote_winner()
+        if not vote_winner:
+            return None
+        return ("save" if vote_winner == self._get_heal_winner() else "death", vote_winner)
+
+    def _speculate_night_outcome(self):
+        self.night_narratives.update(self._night_outcome())
+
+    async def _generate_night_narrative(self, kind: str, target: str) -> str:
+        name = self.player_names.get(target, target)
+        context = self._narration_context()
+        # prepared ahead, it has until the night ends
+        deadline_s = max(self.narration_deadline_s, self.phase_deadline - self.clock.monotonic())
+        # nobody waits on a guess yet, narrations a phase is waiting on go first
+        priority = Priority.BACKGROUND
+        if kind == "death":
+            return await self.narrator_service.generate_death_narrative(
+                name, "mafia", context, record=False, deadline_s=deadline_s, priority=priority
+            )
+        return await self.narrator_service.generate_save_narrative(
+            name, context, record=False, deadline_s=deadline_s, priority=priority
+        )
 
     async def _end_night(self):
         vote_winner = self._get_vote_winner()
         heal_winner = self._get_heal_winner()
+        outcome = self._night_outcome()
         self.game_state.end_night(vote_winner, heal_winner)
+        self._mark_dirty("players")
+        # the day starts once its narrations are written, beside the actor
+        self._narrating = True
+        self._narration_task = self._spawn(self._narrate_end_of_night(outcome))
 
-        if vote_winner and vote_winner != heal_winner:
-            try:
-                victim_name = self.player_names.get(vote_winner, vote_winner)
-                death_narrative = self.narrator_service.generate_death_narrative(
-                    victim_name, "mafia", {"day_count": self.narrator_service.game_context.day_count}
-                )
-                await self._send_narrator_message(death_narrative)
-            except Exception as e:
-                self.logger.error(f"Failed to generate death narrative: {e}")
-                victim_name = self.player_names.get(vote_winner, vote_winner)
-                await self._send_narrator_message(f"{victim_name} was found dead this morning. The town mourns another loss to the shadows.")
-
-            await self._broadcast(
+    async def _narrate_end_of_night(self, outcome: Optional[Outcome]):
+        try:
+            speculated = await self.night_narratives.take(outcome)
+            if outcome is not None:
+                kind, target = outcome
+                name = self.player_names.get(target, target)
+                stream = self._open_narration()
+                if kind == "death":
+                    narrative = speculated or await self._write_narration(
+                        stream,
+                        lambda on_chunk: self.narrator_service.generate_death_narrative(
+                            name, "mafia", self._narration_context(), record=False, on_chunk=on_chunk,
+                            deadline_s=self.narration_deadline_s,
+                        ),
+                        f"{name} was found dead this morning. The town mourns another loss to the shadows.",
+                    )
+                else:
+                    narrative = speculated or await self._write_narration(
+                        stream,
+                        lambda on_chunk: self.narrator_service.generate_save_narrative(
+                            name, self._narration_context(), record=False, on_chunk=on_chunk,
+                            deadline_s=self.narration_deadline_s,
+                        ),
+                        f"The night passed quietly. {name} was protected by unseen forces.",
+                    )
+                try:
+                    await self._submit(self._announce_night_outcome, outcome, name, narrative, stream)
+                except Exception:
+                    # already logged by the actor, the day starts regardless
+                    pass
+            await self._submit(self._start_day)
+
+            stream = self._open_narration()
+            narrative = await self._write_narration(
+                stream,
+                lambda on_chunk: self.narrator_service.generate_phase_transition(
+                    "night", "day", on_chunk=on_chunk, deadline_s=self.narration_deadline_s
+                ),
+                "Dawn breaks over the troubled town as the residents emerge from their homes...",
+            )
+            await self._submit(self._finish_phase_narration, narrative, stream)
+        finally:
+            self._post(self._stop_narrating)
+
+    def _narration_context(self) -> Dict:
+        return {"day_count": self.narrator_service.game_context.day_count}
+
+    def _announce_night_outcome(self, outcome: Outcome, name: str, narrative: str, stream: NarrationStream):
+        kind, target = outcome
+        self._send_narrator_message(narrative, stream)
+        if kind == "death":
+            self._broadcast(
                 MorningNews(
                     type="action.morning_news",
-                    payload=MorningNewsPayload(target_id=vote_winner),
+                    payload=MorningNewsPayload(target_id=target),
                 )
             )
-        elif vote_winner and vote_winner == heal_winner:
-            try:
-                saved_name = self.player_names.get(vote_winner, vote_winner)
-                save_narrative = self.narrator_service.generate_save_narrative(
-                    saved_name, {"day_count": self.narrator_service.game_context.day_count}
-                )
-                await self._send_narrator_message(save_narrative)
-            except Exception as e:
-                self.logger.error(f"Failed to generate save narrative: {e}")
-                saved_name = self.player_names.get(vote_winner, vote_winner)
-                await self._send_narrator_message(f"The night passed quietly. {saved_name} was protected by unseen forces.")
+            # the death only goes into the story once it happened
+            self.narrator_service.record_death(name, "mafia")
         else:
-            pass
+            self.narrator_service.record_save(name)
 
+    def _start_day(self):
         self._reset_votes()
 
-        self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(
-            seconds=self.day_duration_s
-        )).timestamp()
-        await self._broadcast(
+        self._set_phase_deadline(self.day_duration_s)
+        self._narrating = False
+        self._broadcast(
             PhaseChange(
                 type="phase.change",
                 payload=PhaseChangePayload(
@@ -554,24 +969,18 @@ class GameManager:
                 ),
             )
         )
-        await self._sync_game_state()
+        self._sync_game_state()
 
-        try:
-            day_narrative = self.narrator_service.generate_phase_transition("night", "day")
-            await self._send_narrator_message(day_narrative)
-        except Exception:
-            await self._send_narrator_message("Dawn breaks over the troubled town as the residents emerge from their homes...")
-
-        await self._check_game_over()
+    def _finish_phase_narration(self, narrative: str, stream: NarrationStream):
+        self._send_narrator_message(narrative, stream)
+        self._check_game_over()
 
     async def _end_day(self):
         self.game_state.end_day()
         self._reset_votes()
 
-        self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(
-            seconds=self.vote_duration_s
-        )).timestamp()
-        await self._broadcast(
+        self._set_phase_deadline(self.vote_duration_s)
+        self._broadcast(
             PhaseChange(
                 type="phase.change",
                 payload=PhaseChangePayload(
@@ -579,31 +988,50 @@ class GameManager:
                 ),
             )
         )
-        await self._sync_game_state()
-
-        try:
-            voting_narrative = self.narrator_service.generate_phase_transition("day", "voting")
-            await self._send_narrator_message(voting_narrative)
-        except Exception:
-            await self._send_narrator_message("The sun reaches its zenith as heated discussions fill the town square. The time for words has passed - now comes the moment of terrible decision.")
+        self._sync_game_state()
+        self._spawn(self._narrate_end_of_day())
+
+    async def _narrate_end_of_day(self):
+        stream = self._open_narration()
+        narrative = await self._write_narration(
+            stream,
+            lambda on_chunk: self.narrator_service.generate_phase_transition(
+                "day", "voting", on_chunk=on_chunk, deadline_s=self.narration_deadline_s
+            ),
+            "The sun reaches its zenith as heated discussions fill the town square. The time for words has passed - now comes the moment of terrible decision.",
+        )
+        await self._submit(self._send_narrator_message, narrative, stream)
 
     async def _end_voting(self):
         vote_winner = self._get_vote_winner()
+        vote_results = {"total_votes": len(self.cast_votes), "margin": "decisive"}
         self.game_state.end_voting(vote_winner)
+        self._mark_dirty("players")
+        # the night starts once the verdict is narrated, beside the actor
+        self._narrating = True
+        self._narration_task = self._spawn(self._narrate_end_of_voting(vote_winner, vote_results))
 
-        if vote_winner:
-            try:
-                voted_player_name = self.player_names.get(vote_winner, vote_winner)
-                vote_results = {"total_votes": len(self.cast_votes), "margin": "decisive"}
-                voting_narrative = self.narrator_service.generate_voting_narrative(
-                    voted_player_name, vote_results
+    async def _narrate_end_of_voting(self, vote_winner: Optional[str], vote_results: Dict):
+        try:
+            narrative = stream = None
+            if vote_winner:
+                name = self.player_names.get(vote_winner, vote_winner)
+                stream = self._open_narration()
+                narrative = await self._write_narration(
+                    stream,
+                    lambda on_chunk: self.narrator_service.generate_voting_narrative(
+                        name, vote_results, on_chunk=on_chunk, deadline_s=self.narration_deadline_s
+                    ),
+                    f"After intense deliberation, the town has decided. {name} must leave.",
                 )
-                await self._send_narrator_message(voting_narrative)
-            except Exception:
-                voted_player_name = self.player_names.get(vote_winner, vote_winner)
-                await self._send_narrator_message(f"After intense deliberation, the town has decided. {voted_player_name} must leave.")
+            await self._submit(self._start_night, vote_winner, narrative, stream)
+        finally:
+            self._post(self._stop_narrating)
 
-            await self._broadcast(
+    def _start_night(self, vote_winner: Optional[str], narrative: Optional[str], stream: Optional[NarrationStream]):
+        if vote_winner:
+            self._send_narrator_message(narrative, stream)
+            self._broadcast(
                 EveningNews(
                     type="action.evening_news",
                     payload=EveningNewsPayload(target_id=vote_winner),
@@ -611,12 +1039,9 @@ class GameManager:
             )
         self._reset_votes()
 
-
-
-        self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(
-            seconds=self.night_duration_s
-        )).timestamp()
-        await self._broadcast(
+        self._set_phase_deadline(self.night_duration_s)
+        self._narrating = False
+        self._broadcast(
             PhaseChange(
                 type="phase.change",
                 payload=PhaseChangePayload(
@@ -624,23 +1049,49 @@ class GameManager:
                 ),
             )
         )
-        await self._sync_game_state()
-        await self._check_game_over()
+        self._sync_game_state()
+        self._check_game_over()
+
+    async def _write_narration(
+        self, stream: NarrationStream, generate: Callable[[Callable], Awaitable[str]], fallback: str
+    ) -> str:
+        """Write a narration beside the actor, its chunks going out through the inbox, `fallback` if it fails"""
+        async def send_chunk(text: str):
+            await self._submit(stream.send, text)
+
+        try:
+            return await generate(send_chunk)
+        except Exception as e:
+            self.logger.error(f"Failed to generate narration: {e}")
+            return fallback
+
+    def _stop_narrating(self):
+        """The phase-end narration is over or was abandoned, the phase timer runs again"""
+        if self._narrating:
+            self._narrating = False
+            self._schedule_tick()
 
     async def _restart_game(self):
         self.logger.info("🔄 _restart_game() called")
+        self._mark_dirty("players")
         self._reset_votes()
         self.lobby = True
         self.character_profiles = {}
         self.profiles_generated = False
         self.showing_profiles = False
         self.profiles_shown_this_game = False
-
-        self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(seconds=self.lobby_duration_s)).timestamp()
+        self.night_narratives.discard()
+        self.flights.forget()
+        if self._narration_task is not None:
+            self._narration_task.cancel()
+            self._narration_task = None
+        self._narrating = False
+
+        self._set_phase_deadline(self.lobby_duration_s)
         self.game_state = GameState()
         for player_uuid in self.players.keys():
             self._add_default_state_player_to_game_state(player_uuid)
-        await self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="lobby", ends_at=self.next_phase_timestamp)))
+        self._broadcast(PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="lobby", ends_at=self.next_phase_timestamp)))
 
     def _assign_roles_randomly(self):
         uuid_list = list(self.players.keys())
@@ -659,17 +1110,18 @@ class GameManager:
                 self.game_state.players[uuid]["role"] = Role.INNOCENT
 
     async def _tick(self):
-        current_time = datetime.now(tz=timezone.utc).timestamp()
+        now = self.clock.monotonic()
 
         if self.lobby and len(self.players) < 4:
-            self.next_phase_timestamp = (datetime.now(tz=timezone.utc) + timedelta(
-                seconds=self.lobby_duration_s
-            )).timestamp()
-        elif self.narrator_active:
+            # the lobby countdown starts when the 4th player joins, nothing to move meanwhile
+            self.logger.debug("⏳ Timer paused - waiting for players")
+        elif self.narrator_active or self._narrating:
             self.logger.debug("🎭 Timer paused - narrator is active")
-            await self._sync_game_state()
+            self._sync_game_state()
             return
-        elif self.next_phase_timestamp <= current_time:
+        elif self.showing_profiles:
+            self.logger.debug("🎭 Timer paused - showing character profiles")
+        elif self.phase_deadline <= now:
             if self.lobby:
                 await self._end_lobby()
             elif self.game_state.phase == Phase.CHARACTER_INTRO:
@@ -684,17 +1136,19 @@ class GameManager:
                 await self._restart_game()
 
         if not self.narrator_active:
-            await self._sync_game_state()
+            self._sync_game_state()
 
     async def _receive_vote(self, voter: PlayerAdapter, vote: Vote | NightAction):
         payload = vote.payload
         self.cast_votes[payload.actor_id] = payload.target_id
+        self._mark_dirty("votes")
         if self.game_state.phase == Phase.NIGHT:
             included_roles = [Role.MAFIA]
+            self._speculate_night_outcome()
         else:
             included_roles = []
 
-        await self._broadcast(
+        self._broadcast(
             VoteCast(
                 type="action.vote_cast",
                 payload=VoteCastPayload(
@@ -703,7 +1157,8 @@ class GameManager:
             ),
             included_player_roles=included_roles,
         )
-        await voter.receive_event(
+        self._send(
+            voter,
             ActionAck(
                 type="action.ack",
                 payload=ActionAckPayload(
@@ -715,7 +1170,8 @@ class GameManager:
     async def _receive_heal(self, healer: PlayerAdapter, heal_action: NightAction):
         payload = heal_action.payload
         if not self.game_state.players[payload.target_id]["alive"]:
-            await healer.receive_event(
+            self._send(
+                healer,
                 ActionAck(
                     type="action.ack",
                     payload=ActionAckPayload(
@@ -726,6 +1182,8 @@ class GameManager:
             return
 
         self.heal_votes[payload.actor_id] = payload.target_id
+        self._mark_dirty("votes")
+        self._speculate_night_outcome()
 
         vote_cast_event = VoteCast(
             type="action.vote_cast",
@@ -733,12 +1191,13 @@ class GameManager:
                 actor_id=payload.actor_id, target_id=payload.target_id
             ),
         )
-        await self._broadcast(
+        self._broadcast(
             vote_cast_event,
             included_player_roles=[Role.MEDIC],
         )
 
-        await healer.receive_event(
+        self._send(
+            healer,
             ActionAck(
                 type="action.ack",
                 payload=ActionAckPayload(
@@ -748,12 +1207,24 @@ class GameManager:
         )
 
     async def receive_event(self, event: GameEvent, player: PlayerAdapter):
+        """Hand a client event to the room's actor and wait until it's been applied"""
+        await self._submit(self._apply_event, event, player)
+
+    async def leave(self, uuid: str):
+        """Remove a disconnected player, in turn with the room's other commands"""
+        await self._submit(self._remove_if_present, uuid)
+
+    def _remove_if_present(self, uuid: str):
+        if uuid in self.players:
+            self.remove_player(uuid)
+
+    async def _apply_event(self, event: GameEvent, player: PlayerAdapter):
         self._ensure_tick_scheduler()
 
         match event:
             case PlayerJoin(type="player.join", payload=payload):
                 self.add_player(payload.player_id, payload.name, player)
-                await self._broadcast(
+                self._broadcast(
                     PlayerJoined(
                         type="player.joined",
                         payload=PlayerJoinedPayload(
@@ -761,15 +1232,15 @@ class GameManager:
                         ),
                     )
                 )
-                await self._sync_game_state()
+                self._sync_game_state()
 
-                if self.lobby and len(self.players) >= 4 and not self.profiles_generated:
-                    import asyncio
-                    asyncio.create_task(self._generate_character_profiles())
+                if self.lobby and len(self.players) >= 4 and "character_profiles" not in self.flights:
+                    # written beside the actor, the room keeps serving players meanwhile
+                    self._spawn(self.prepare_character_profiles())
             case PlayerLeave(payload=payload):
                 if payload.player_id in self.players:
                     self.remove_player(payload.player_id)
-                    await self._broadcast(
+                    self._broadcast(
                         PlayerLeft(
                             type="player.left",
                             payload=PlayerLeftPayload(player_id=payload.player_id),
@@ -790,7 +1261,8 @@ class GameManager:
                 ):
                     await self._receive_heal(player, event)
                 else:
-                    await player.receive_event(
+                    self._send(
+                        player,
                         ActionAck(
                             type="action.ack",
                             payload=ActionAckPayload(
@@ -802,7 +1274,8 @@ class GameManager:
                 if self.game_state.phase == Phase.VOTING:
                     await self._receive_vote(player, event)
                 else:
-                    await player.receive_event(
+                    self._send(
+                        player,
                         ActionAck(
                             type="action.ack",
                             payload=ActionAckPayload(
@@ -812,11 +1285,12 @@ class GameManager:
                     )
             case SendMessage(payload=payload):
                 if self.lobby or self.game_state.phase == Phase.DAY:
-                    await self._broadcast(
+                    self._broadcast(
                         MessageReceived(type="message.received", payload=payload)
                     )
                 else:
-                    await player.receive_event(
+                    self._send(
+                        player,
                         ActionAck(
                             type="action.ack",
                             payload=ActionAckPayload(
@@ -825,15 +1299,25 @@ class GameManager:
                         )
                     )
             case GameStateRequest(type="game.sync_request", player_id=player_id):
-                await player.receive_event(
-                    self._construct_confidentially_revealing_game_state_sync_event(self.game_state.players[player_id]["role"]),
-                )
+                role = self.game_state.players[player_id]["role"]
+                self._publish_game_state()
+                self.state_sync.resync(player_id)
+                self._send_encoded(player, self.state_sync.full_event(player_id, role))
+            case GameStateAck(payload=payload):
+                self.state_sync.ack(payload.player_id, payload.version)
+            case GameLogRequest(payload=payload):
+                if payload.after is not None:
+                    page = self.event_log.read(payload.after, payload.limit)
+                else:
+                    page = self.event_log.page_before(payload.before, payload.limit)
+                self._send(player, self._construct_game_log_event(*page))
             case OpeningStoryRequest(type="opening.story_request"):
-                await self.send_opening_story()
+                self._request_opening_story(player)
             case NarratorFinished(payload=payload):
                 self.logger.debug(f"🎭 Ignoring narrator finished event from {payload.player_id}")
             case _:
-                await player.receive_event(
+                self._send(
+                    player,
                     ActionAck(
                         type="action.ack",
                         payload=ActionAckPayload(
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app import metrics
+from app.services.llm_scheduler import Usage, charge_to
+
+
+# what the night comes to if it ended now: ("death" or "save", target uuid)
+Outcome = Tuple[str, str]
+
+SPECULATIONS = metrics.counter(
+    "narrator_speculations_total", "Night narratives generated ahead of the end of the night, by kind"
+)
+SPECULATION_RESULTS = metrics.counter(
+    "narrator_speculation_results_total",
+    "How the end of the night found its narrative: hit (finished), pending (in flight) or miss",
+)
+WASTED_SPECULATIONS = metrics.counter(
+    "narrator_speculations_wasted_total", "Speculative night narratives cancelled or never used"
+)
+WASTED_TOKENS = metrics.counter(
+    "narrator_speculation_wasted_tokens_total",
+    "Estimated tokens of unused speculative narratives which reached the provider",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NightNarratives:
+    """Narratives of the likely night outcome, generated while the night still runs.
+
+    The room calls update() whenever the mafia or medic votes change, with the
+    outcome the night would have if it ended now. Its narrative starts in the
+    background and generations for outcomes no longer in play are cancelled,
+    finished ones are kept in case the votes swing back. At the end of the
+    night take() hands out the finished text, or waits for the one in flight.
+    """
+
+    def __init__(self, generate: Callable[[str, str], Awaitable[str]]):
+        self.generate = generate
+        self._tasks: Dict[Outcome, asyncio.Task] = {}
+        # LLM jobs each speculation got started, what it cost if it goes unused
+        self._usage: Dict[Outcome, Usage] = {}
+
+    def update(self, outcome: Optional[Outcome]):
+        for stale, task in list(self._tasks.items()):
+            if stale != outcome and not task.done():
+                self._waste(stale, task)
+                del self._tasks[stale]
+        if outcome is not None and outcome not in self._tasks:
+            SPECULATIONS.inc(kind=outcome[0])
+            usage = self._usage[outcome] = Usage()
+            self._tasks[outcome] = asyncio.create_task(self._speculate(outcome, usage))
+
+    async def _speculate(self, outcome: Outcome, usage: Usage) -> str:
+        # set within the speculation's own task, nothing else is charged to it
+        charge_to(usage)
+        return await self.generate(*outcome)
+
+    async def take(self, outcome: Optional[Outcome]) -> Optional[str]:
+        """The narrative for how the night ended, None when there is none to use"""
+        task = self._tasks.pop(outcome, None) if outcome is not None else None
+        self._usage.pop(outcome, None)
+        self.discard()
+        if outcome is None:
+            return None
+        if task is None:
+            SPECULATION_RESULTS.inc(result="miss")
+            return None
+
+        SPECULATION_RESULTS.inc(result="hit" if task.done() else "pending")
+        try:
+            return await task
+        except Exception as e:
+            logger.warning(f"🎭 Speculative {outcome[0]} narrative failed: {e}")
+            return None
+
+    def discard(self):
+        """Drop every speculative narrative, at the end of a night or game"""
+        for outcome, task in self._tasks.items():
+            self._waste(outcome, task)
+        self._tasks.clear()
+        self._usage.clear()
+
+    def _waste(self, outcome: Outcome, task: asyncio.Task):
+        if task.done():
+            if not task.cancelled():
+                # retrieve it so a failed generation isn't reported as never retrieved
+                task.exception()
+        else:
+            task.cancel()
+        WASTED_SPECULATIONS.inc(kind=outcome[0])
+        usage = self._usage.pop(outcome, None)
+        if usage is not None and usage.tokens:
+            WASTED_TOKENS.inc(usage.tokens)
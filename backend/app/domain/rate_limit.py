@@ -0,0 +1,91 @@
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+
+
+class RateLimit(NamedTuple):
+    rate: float  # frames per second refilled
+    burst: int  # frames accepted back to back
+
+
+# key for event types without a limit of their own, and frames that didn't parse
+DEFAULT_KEY = "*"
+
+DEFAULT_RATE_LIMITS: Dict[str, RateLimit] = {
+    DEFAULT_KEY: RateLimit(5, 20),
+    "player.join": RateLimit(0.2, 2),
+    "message.send": RateLimit(1, 5),
+    "action.vote": RateLimit(2, 5),
+    "action.night": RateLimit(2, 5),
+    "game.sync_request": RateLimit(1, 5),
+    "game.log_request": RateLimit(1, 5),
+    "opening.story_request": RateLimit(0.2, 2),
+}
+
+
+def parse_rate_limits(spec: str) -> Dict[str, RateLimit]:
+    """Parse `type=rate:burst` pairs separated by commas, e.g. `message.send=0.5:3,*=10:40`"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        event_type, _, limit = item.partition("=")
+        rate, _, burst = limit.partition(":")
+        limits[event_type.strip()] = RateLimit(float(rate), int(burst or 1))
+    return limits
+
+
+DEFAULT_RATE_LIMITS.update(parse_rate_limits(os.getenv("WS_RATE_LIMITS", "")))
+
+# rejected frames a connection may accumulate before it's disconnected,
+# forgiven at FLOOD_FORGIVE_RATE per second
+FLOOD_STRIKES = int(os.getenv("WS_FLOOD_STRIKES", "20"))
+FLOOD_FORGIVE_RATE = float(os.getenv("WS_FLOOD_FORGIVE_RATE", "0.2"))
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now: float, cost: float = 1) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+
+class InboundRateLimiter:
+    """Token buckets for one connection, one per inbound event type.
+
+    Rejected frames are themselves metered by a strike bucket, a connection
+    which keeps flooding after being told off empties it and gets disconnected.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        strikes: int = FLOOD_STRIKES,
+        forgive_rate: float = FLOOD_FORGIVE_RATE,
+        clock=time.monotonic,
+    ):
+        self.limits = DEFAULT_RATE_LIMITS if limits is None else limits
+        self.clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._strikes = TokenBucket(forgive_rate, strikes, clock())
+
+    def allow(self, event_type: str) -> bool:
+        bucket = self._buckets.get(event_type)
+        now = self.clock()
+        if bucket is None:
+            limit = self.limits.get(event_type) or self.limits[DEFAULT_KEY]
+            bucket = self._buckets[event_type] = TokenBucket(limit.rate, limit.burst, now)
+        return bucket.take(now)
+
+    def strike(self) -> bool:
+        """Record a rejected frame, returns False once the connection should be dropped"""
+        return self._strikes.take(self.clock())
@@ -0,0 +1,144 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from app import metrics
+
+
+PENDING_TIMERS = metrics.gauge(
+    "scheduler_pending_timers", "Deadlines waiting in the process-wide scheduler"
+)
+FIRED_TIMERS = metrics.counter(
+    "scheduler_fired_timers_total", "Deadlines which came due and ran their callback"
+)
+LATENESS = metrics.gauge(
+    "scheduler_last_lateness_seconds", "How late the most recent deadline fired"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    __slots__ = ("when", "callback", "cancelled")
+
+    def __init__(self, when: float, callback: Callable[[], Awaitable]):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+
+class DeadlineScheduler:
+    """Process-wide heap of deadlines served by a single task.
+
+    The task sleeps until the earliest deadline, so rooms with nothing due cost
+    nothing. Each due callback runs in its own task and can't delay the others.
+    Deadlines are on the `clock` timescale, time.monotonic by default. Without
+    `autostart` no task is started and whoever drives the clock fires due
+    timers with fire_due, as virtual time does.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, autostart: bool = True):
+        self.clock = clock
+        self.autostart = autostart
+        self._heap: List[Tuple[float, int, Timer]] = []
+        self._order = itertools.count()
+        self._cancelled = 0
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._callbacks: Set[asyncio.Task] = set()
+
+    def __len__(self):
+        return len(self._heap) - self._cancelled
+
+    def call_at(self, when: float, callback: Callable[[], Awaitable]) -> Timer:
+        """Run `callback()` once `when` has passed, until the returned timer is cancelled"""
+        timer = Timer(when, callback)
+        heapq.heappush(self._heap, (when, next(self._order), timer))
+        PENDING_TIMERS.inc()
+        self._ensure_runner()
+        if self._heap[0][2] is timer and self._wakeup is not None:
+            self._wakeup.set()
+        return timer
+
+    def cancel(self, timer: Timer):
+        if timer.cancelled:
+            return
+        timer.cancelled = True
+        self._cancelled += 1
+        PENDING_TIMERS.dec()
+        # cancelled entries are skipped lazily, drop them once they dominate
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def next_deadline(self) -> Optional[float]:
+        """When the earliest pending timer is due, None when there is none"""
+        self._drop_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    async def fire_due(self):
+        """Run every timer due by now in deadline order, each callback to completion"""
+        while self._heap:
+            self._drop_cancelled()
+            if not self._heap or self._heap[0][0] > self.clock():
+                return
+            _, _, timer = heapq.heappop(self._heap)
+            PENDING_TIMERS.dec()
+            FIRED_TIMERS.inc()
+            await self._fire(timer)
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def _ensure_runner(self):
+        if not self.autostart:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # started by the first deadline scheduled from within the event loop
+            return
+        if self._runner is None or self._runner.done() or self._runner.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._runner = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            self._drop_cancelled()
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            when, _, timer = self._heap[0]
+            delay = when - self.clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            PENDING_TIMERS.dec()
+            FIRED_TIMERS.inc()
+            LATENESS.set(-delay)
+            task = asyncio.create_task(self._fire(timer))
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+
+    async def _fire(self, timer: Timer):
+        try:
+            await timer.callback()
+        except Exception as e:
+            logger.error(f"🕐 Scheduled callback failed: {e}")
+
+
+# shared by every room of this process
+deadline_scheduler = DeadlineScheduler()
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from app import metrics
+
+
+FLIGHT_CALLS = metrics.counter(
+    "single_flight_calls_total",
+    "Calls for a single-flight key, by whether they started it, joined it in flight or replayed its result",
+)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces calls for the same key into one.
+
+    The first caller for a key starts the call, everyone arriving while it's
+    in flight awaits the same result. A successful result is kept until the key
+    is forgotten, so late duplicates replay it instead of calling again. A
+    failed flight is dropped and the next caller starts a new one.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            FLIGHT_CALLS.inc(result="started")
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._landed(key, done))
+        else:
+            FLIGHT_CALLS.inc(result="replayed" if flight.done() else "joined")
+        # a caller giving up mustn't cancel the flight for everyone else
+        return await asyncio.shield(flight)
+
+    def result(self, key: Hashable) -> Optional[Any]:
+        """Result of the flight for `key` if it landed, None while in flight or never started"""
+        flight = self._flights.get(key)
+        if flight is None or not flight.done():
+            return None
+        return flight.result()
+
+    def forget(self, key: Optional[Hashable] = None):
+        """Drop the flight for `key`, or every flight, cancelling any still in the air"""
+        keys = list(self._flights) if key is None else [key]
+        for key in keys:
+            flight = self._flights.pop(key, None)
+            if flight is not None and not flight.done():
+                flight.cancel()
+
+    def _landed(self, key: Hashable, flight: asyncio.Future):
+        if flight.cancelled() or flight.exception() is not None:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from app.domain.broadcast import EncodedEvent
+from schemas.game import (
+    GameStatePatch,
+    GameStatePatchPayload,
+    GameStateSync,
+    GameStateSyncPayload,
+)
+
+
+SCALAR_FIELDS = ("phase", "phase_ends_at", "narrator_active", "winner")
+
+
+class StateView:
+    """Snapshot of game.state as seen by one visibility class at one version"""
+
+    __slots__ = ("payload", "players", "votes", "fields")
+
+    def __init__(self, payload: GameStateSyncPayload):
+        self.payload = payload
+        self.players = {p.player_id: p for p in payload.players}
+        self.votes = dict(payload.votes or {})
+        self.fields = {name: getattr(payload, name) for name in SCALAR_FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, StateView):
+            return NotImplemented
+        return (
+            self.fields == other.fields
+            and self.votes == other.votes
+            and self.players == other.players
+        )
+
+
+def diff_views(base: StateView, new: StateView) -> Dict:
+    """Compute patch fields turning `base` into `new`"""
+    players = [p for pid, p in new.players.items() if base.players.get(pid) != p]
+    removed_players = [pid for pid in base.players if pid not in new.players]
+    votes: Dict[str, Optional[str]] = {
+        voter: target for voter, target in new.votes.items() if base.votes.get(voter) != target
+    }
+    for voter in base.votes:
+        if voter not in new.votes:
+            votes[voter] = None
+    fields = {
+        name: value for name, value in new.fields.items() if base.fields[name] != value
+    }
+
+    return {
+        "players": players,
+        "removed_players": removed_players,
+        "votes": votes,
+        "fields": fields,
+    }
+
+
+class StateSyncTracker:
+    """Keeps a room's versioned game.state views and decides between full snapshots and patches.
+
+    Every published set of views which differs from the latest one gets a new,
+    monotonically increasing version. Clients that acknowledged a version still
+    held in history receive cumulative patches from that version, everyone else
+    gets full snapshots. Patches only contain upserts, so re-applying a patch on
+    top of a newer state than its base is harmless.
+    """
+
+    def __init__(self, history_size: int = 16):
+        self.history_size = history_size
+        self.version = 0
+        self._views: "OrderedDict[int, Dict[Hashable, StateView]]" = OrderedDict()
+        self._sent: Dict[str, "OrderedDict[int, Hashable]"] = {}
+        self._acked: Dict[str, Tuple[int, Hashable]] = {}
+        self._events: Dict[Tuple, EncodedEvent] = {}
+
+    def publish(self, views: Dict[Hashable, GameStateSyncPayload]) -> int:
+        """Register the current views, bumping the version only if something changed"""
+        snapshots = {key: StateView(payload) for key, payload in views.items()}
+        latest = self._views.get(self.version)
+        if latest is not None and all(
+            key in latest and latest[key] == view for key, view in snapshots.items()
+        ):
+            return self.version
+
+        self.version += 1
+        self._views[self.version] = snapshots
+        while len(self._views) > self.history_size:
+            self._views.popitem(last=False)
+        self._events.clear()
+        return self.version
+
+    def event_for(self, player_id: str, key: Hashable) -> Optional[EncodedEvent]:
+        """Event bringing the player up to the latest version, None if they're already there.
+
+        Players in the same visibility class with the same acknowledged version
+        share one EncodedEvent, so every distinct payload is serialized once.
+        """
+        acked = self._acked.get(player_id)
+        if acked is None or self._view(*acked) is None:
+            return self.full_event(player_id, key)
+
+        sent = self._sent.get(player_id)
+        if sent and next(reversed(sent)) == self.version and sent[self.version] == key:
+            return None
+
+        event = self._patch_event(acked, key)
+        self._record_sent(player_id, key)
+        return event
+
+    def full_event(self, player_id: str, key: Hashable) -> EncodedEvent:
+        """Full snapshot of the latest version, used on join and resync"""
+        cache_key = ("full", key)
+        event = self._events.get(cache_key)
+        if event is None:
+            view = self._views[self.version][key]
+            event = EncodedEvent(GameStateSync(
+                type="game.state",
+                payload=view.payload.model_copy(update={"version": self.version}),
+            ))
+            self._events[cache_key] = event
+        self._record_sent(player_id, key)
+        return event
+
+    def ack(self, player_id: str, version: int) -> bool:
+        sent = self._sent.get(player_id)
+        if not sent or version not in sent:
+            return False
+        acked = self._acked.get(player_id)
+        if acked is not None and acked[0] > version:
+            return False
+
+        self._acked[player_id] = (version, sent[version])
+        for sent_version in [v for v in sent if v < version]:
+            del sent[sent_version]
+        return True
+
+    def resync(self, player_id: str):
+        self._acked.pop(player_id, None)
+        self._sent.pop(player_id, None)
+
+    def forget(self, player_id: str):
+        self.resync(player_id)
+
+    def _view(self, version: int, key: Hashable) -> Optional[StateView]:
+        return self._views.get(version, {}).get(key)
+
+    def _patch_event(self, base: Tuple[int, Hashable], key: Hashable) -> EncodedEvent:
+        cache_key = ("patch", base, key)
+        event = self._events.get(cache_key)
+        if event is None:
+            changes = diff_views(self._view(*base), self._views[self.version][key])
+            event = EncodedEvent(GameStatePatch(
+                type="game.state_patch",
+                payload=GameStatePatchPayload(
+                    version=self.version, base_version=base[0], **changes
+                ),
+            ))
+            self._events[cache_key] = event
+        return event
+
+    def _record_sent(self, player_id: str, key: Hashable):
+        sent = self._sent.setdefault(player_id, OrderedDict())
+        sent.pop(self.version, None)
+        sent[self.version] = key
+        while len(sent) > self.history_size:
+            sent.popitem(last=False)
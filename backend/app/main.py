@@ -2,7 +2,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 
+from app import metrics
 from app.routers.websocket import router as websocket_router
+from app.services.llm_cache import llm_cache
+from app.services.llm_client import close_http_client
 
 
 app = FastAPI()
@@ -31,4 +34,13 @@ async def root():
 async def health_check():
     return {"status": "healthy", "medic_role": "added"}
 
+@app.get("/metrics")
+async def metrics_snapshot():
+    return metrics.snapshot()
+
+@app.on_event("shutdown")
+async def close_llm_connections():
+    await close_http_client()
+    llm_cache.close()
+
 app.include_router(websocket_router, prefix="/ws")
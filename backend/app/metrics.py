@@ -0,0 +1,74 @@
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """Monotonically increasing in-process counter, optionally split by labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self.values: Dict[LabelKey, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels):
+        self.values[_label_key(labels)] += amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(_label_key(labels), 0.0)
+
+    def total(self) -> float:
+        return sum(self.values.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": self.kind,
+            "description": self.description,
+            "values": [
+                {"labels": dict(key), "value": value} for key, value in self.values.items()
+            ],
+        }
+
+
+class Gauge(Counter):
+    """In-process value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self.values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.values[_label_key(labels)] -= amount
+
+
+_registry: Dict[str, Counter] = {}
+
+
+def _register(metric_cls, name: str, description: str):
+    metric = _registry.get(name)
+    if metric is None:
+        metric = metric_cls(name, description)
+        _registry[name] = metric
+    return metric
+
+
+def counter(name: str, description: str) -> Counter:
+    return _register(Counter, name, description)
+
+
+def gauge(name: str, description: str) -> Gauge:
+    return _register(Gauge, name, description)
+
+
+def snapshot() -> Dict[str, Any]:
+    """All registered metrics, as served by the /metrics endpoint"""
+    return {name: metric.snapshot() for name, metric in sorted(_registry.items())}
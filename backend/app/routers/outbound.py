@@ -0,0 +1,132 @@
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Deque, List, Optional, Tuple
+
+from app import metrics
+from app.domain.broadcast import EncodedEvent
+
+
+SEND_QUEUE_DEPTH = metrics.gauge(
+    "ws_send_queue_depth", "Frames waiting in per-connection send queues"
+)
+DROPPED_FRAMES = metrics.counter(
+    "ws_dropped_frames_total", "Outbound frames dropped because a send queue was full"
+)
+OVERFLOW_DISCONNECTS = metrics.counter(
+    "ws_overflow_disconnects_total", "Connections closed because their send queue was full"
+)
+COALESCED_FRAMES = metrics.counter(
+    "ws_coalesced_frames_total", "Queued state syncs replaced by a newer one before being written"
+)
+
+STATE_EVENT_TYPES = frozenset({"game.state", "game.state_patch"})
+# per-connection control frames, never numbered nor replayed
+SESSION_EVENT_TYPES = frozenset({"player.uuid", "session.resumed", "heartbeat.ping"})
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class QueueOverflowError(Exception):
+    pass
+
+
+class OutboundQueue:
+    """Bounded queue of frames waiting to be written to one connection.
+
+    State syncs are latest-wins: at most one of them waits in the queue and a
+    newer one replaces it, while discrete events keep their relative order.
+    """
+
+    def __init__(self, maxsize: int = 64, policy: OverflowPolicy = OverflowPolicy.COALESCE):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.frames: Deque[EncodedEvent] = deque()
+        self._pending_state: Optional[EncodedEvent] = None
+        self._ready = asyncio.Event()
+        # frames lost to the overflow policy, a gap the client can't replay
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def put(self, frame: EncodedEvent):
+        """Enqueue a frame without waiting, applying the overflow policy when full.
+
+        Raises QueueOverflowError if the policy is to disconnect the client.
+        """
+        is_state = frame.type in STATE_EVENT_TYPES
+        if is_state and self._pending_state is not None:
+            self.frames.remove(self._pending_state)
+            SEND_QUEUE_DEPTH.dec()
+            COALESCED_FRAMES.inc(type=self._pending_state.type)
+            self._pending_state = None
+
+        if len(self.frames) >= self.maxsize:
+            self._make_room()
+        self.frames.append(frame)
+        if is_state:
+            self._pending_state = frame
+        SEND_QUEUE_DEPTH.inc()
+        self._ready.set()
+
+    async def get(self) -> EncodedEvent:
+        while not self.frames:
+            self._ready.clear()
+            await self._ready.wait()
+        SEND_QUEUE_DEPTH.dec()
+        frame = self.frames.popleft()
+        if frame is self._pending_state:
+            self._pending_state = None
+        return frame
+
+    def clear(self):
+        SEND_QUEUE_DEPTH.dec(len(self.frames))
+        self.frames.clear()
+        self._pending_state = None
+
+    def _make_room(self):
+        if self.policy == OverflowPolicy.DISCONNECT:
+            OVERFLOW_DISCONNECTS.inc()
+            raise QueueOverflowError(f"Send queue full ({self.maxsize} frames)")
+
+        dropped = self.frames[0]
+        if self.policy == OverflowPolicy.COALESCE and dropped is self._pending_state and len(self.frames) > 1:
+            # keep the pending state sync, it is what brings the client back in sync
+            dropped = self.frames[1]
+        self.frames.remove(dropped)
+        if dropped is self._pending_state:
+            self._pending_state = None
+        SEND_QUEUE_DEPTH.dec()
+        self.dropped += 1
+        DROPPED_FRAMES.inc(policy=self.policy.value, type=dropped.type)
+
+
+class ReplayBuffer:
+    """The most recent frames written to one session, numbered in send order.
+
+    A client counts the sequenced frames it receives, and after a reconnect
+    asks for everything past the last one it saw.
+    """
+
+    def __init__(self, size: int = 256):
+        self.frames: Deque[Tuple[int, EncodedEvent]] = deque(maxlen=size)
+        self.seq = 0
+
+    def record(self, frame: EncodedEvent) -> int:
+        self.seq += 1
+        self.frames.append((self.seq, frame))
+        return self.seq
+
+    def since(self, last_seq: int) -> Optional[List[EncodedEvent]]:
+        """Frames sent after `last_seq`, None when some of them are no longer buffered"""
+        if last_seq < 0 or last_seq > self.seq:
+            return None
+        first_seq = self.frames[0][0] if self.frames else self.seq + 1
+        if last_seq + 1 < first_seq:
+            return None
+        return [frame for seq, frame in self.frames if seq > last_seq]
@@ -1,11 +1,24 @@
+import asyncio
 from collections import defaultdict
 import logging
-from typing import Dict, override
+import os
+import secrets
+import time
+from typing import Dict, Optional, Tuple, override
 from uuid import uuid4
+from app import metrics
+from app.domain.broadcast import EncodedEvent
 from app.domain.game_manager import GameManager, PlayerAdapter
-from fastapi import WebSocket, WebSocketDisconnect
+from app.domain.rate_limit import DEFAULT_KEY, InboundRateLimiter
+from app.routers.outbound import (
+    SESSION_EVENT_TYPES,
+    OutboundQueue,
+    OverflowPolicy,
+    QueueOverflowError,
+    ReplayBuffer,
+)
+from fastapi import WebSocket, WebSocketDisconnect, status
 from fastapi.routing import APIRouter
-from pydantic import ValidationError
 
 
 from schemas.game import (
@@ -13,35 +26,233 @@ from schemas.game import (
     ActionAckPayload,
     GameEvent,
     GameStateRequest,
-    NarratorFinished,
-    NightAction,
-    OpeningStoryRequest,
-    PlayerJoin,
-    PlayerLeave,
-    PlayerLeavePayload,
-    SendMessage,
-    Vote,
+    HeartbeatPayload,
+    HeartbeatPing,
+    HeartbeatPong,
+    PlayerUuid,
+    PlayerUuidPayload,
+    SessionResumed,
+    SessionResumedPayload,
 )
+from schemas.wire import JSON_CODEC, negotiate
 
 
 router = APIRouter()
 
+# shared by every rejected frame, so flooding costs a single queued reference
+RATE_LIMITED_ACK = EncodedEvent(
+    ActionAck(type="action.ack", payload=ActionAckPayload(success=False, message="Too many requests"))
+)
+
+SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+OVERFLOW_POLICY = OverflowPolicy(os.getenv("WS_OVERFLOW_POLICY", OverflowPolicy.COALESCE.value))
+REPLAY_BUFFER_SIZE = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "256"))
+# seconds a dropped connection keeps its seat before the player is removed
+RESUME_GRACE_S = float(os.getenv("WS_RESUME_GRACE_S", "15"))
+# seconds between heartbeat.ping frames, and without any inbound frame before
+# the connection is considered dead; 0 disables either
+HEARTBEAT_INTERVAL_S = float(os.getenv("WS_HEARTBEAT_INTERVAL_S", "10"))
+HEARTBEAT_TIMEOUT_S = float(os.getenv("WS_HEARTBEAT_TIMEOUT_S", "30"))
+
+SESSION_RESUMES = metrics.counter(
+    "ws_session_resumes_total", "Reconnects which resumed a session, by whether every missed frame was replayed"
+)
+SESSION_EXPIRIES = metrics.counter(
+    "ws_session_expiries_total", "Dropped sessions removed after the resume grace window"
+)
+SESSIONS = metrics.gauge(
+    "ws_sessions", "Sessions held in uuid_adapters, by whether a socket is attached"
+)
+HALF_OPEN_CONNECTIONS = metrics.gauge(
+    "ws_half_open_connections", "Attached sockets which missed their last heartbeat"
+)
+RATE_LIMITED_FRAMES = metrics.counter(
+    "ws_rate_limited_frames_total", "Inbound frames rejected by the per-connection rate limiter"
+)
+FLOOD_DISCONNECTS = metrics.counter(
+    "ws_flood_disconnects_total", "Connections closed for repeatedly exceeding their rate limits"
+)
+IDLE_EVICTIONS = metrics.counter(
+    "ws_idle_evictions_total", "Connections dropped after the heartbeat timeout passed without any inbound frame"
+)
+
 
 class WebSocketPlayerAdapter(PlayerAdapter):
-    def __init__(self, ws: WebSocket):
-        self.ws = ws
+    """Player session which writes frames from its own bounded queue, so
+    broadcasts only enqueue and a slow client can't stall the room.
+
+    The session outlives its socket: while detached, frames keep queueing and a
+    reconnect carrying the resume token picks up where the old socket left off.
+    """
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        send_queue_size: int = SEND_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OVERFLOW_POLICY,
+        codec=JSON_CODEC,
+        replay_size: int = REPLAY_BUFFER_SIZE,
+        heartbeat_interval_s: float = HEARTBEAT_INTERVAL_S,
+        heartbeat_timeout_s: float = HEARTBEAT_TIMEOUT_S,
+        limiter: Optional[InboundRateLimiter] = None,
+    ):
+        self.ws: Optional[WebSocket] = ws
+        self.codec = codec
         self.open = True
+        self.queue = OutboundQueue(send_queue_size, overflow_policy)
+        self.replay = ReplayBuffer(replay_size)
+        self.resume_token = secrets.token_urlsafe(24)
+        self.expiry: Optional[asyncio.Task] = None
+        self.heartbeat_interval_s = heartbeat_interval_s
+        self.heartbeat_timeout_s = heartbeat_timeout_s
+        self.last_seen = time.monotonic()
+        self.half_open = False
+        self.limiter = limiter or InboundRateLimiter()
+        self._start_tasks()
+
+    def _start_tasks(self):
+        self._writer_task = asyncio.create_task(self._write_loop())
+        self._heartbeat_task = None
+        if self.heartbeat_interval_s > 0:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    def _stop_tasks(self):
+        # close() may run inside the heartbeat task when a ping overflows the queue
+        for task in (self._writer_task, self._heartbeat_task):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._set_half_open(False)
+
+    def _set_half_open(self, half_open: bool):
+        if half_open != self.half_open:
+            self.half_open = half_open
+            HALF_OPEN_CONNECTIONS.inc(1 if half_open else -1)
 
     @override
     async def receive_event(self, event: GameEvent):
+        await self.receive_encoded(EncodedEvent(event))
+
+    @override
+    async def receive_encoded(self, frame: EncodedEvent):
+        if not self.open:
+            return
         try:
-            if self.open:
-                json_data = event.model_dump_json()
-                logging.info(f"Sending event {json_data}")
-                await self.ws.send_text(json_data)
-        except (WebSocketDisconnect, RuntimeError) as e:
-            logging.warning(f"{e}")
-            self.open = False
+            self.queue.put(frame)
+        except QueueOverflowError as e:
+            logging.warning(f"Disconnecting slow client: {e}")
+            await self.close(status.WS_1008_POLICY_VIOLATION)
+
+    async def _write_loop(self):
+        while self.open:
+            frame = await self.queue.get()
+            if frame.type not in SESSION_EVENT_TYPES:
+                self.replay.record(frame)
+            try:
+                await self._send(frame)
+            except (WebSocketDisconnect, RuntimeError) as e:
+                # the receive loop notices the drop and detaches the session,
+                # the frame stays in the replay buffer for a resume
+                logging.warning(f"{e}")
+                return
+
+    async def _heartbeat_loop(self):
+        while self.open:
+            await asyncio.sleep(self.heartbeat_interval_s)
+            # nothing came back since before the previous ping
+            if time.monotonic() - self.last_seen > self.heartbeat_interval_s:
+                self._set_half_open(True)
+            await self.receive_event(
+                HeartbeatPing(type="heartbeat.ping", payload=HeartbeatPayload(timestamp=time.time()))
+            )
+
+    async def _send(self, frame: EncodedEvent):
+        data = frame.encode(self.codec)
+        logging.debug("Sending event %s", frame.type)
+        if self.codec.binary:
+            await self.ws.send_bytes(data)
+        else:
+            await self.ws.send_text(data)
+
+    def detach(self):
+        """Stop writing to the dropped socket, frames keep queueing until the session is resumed or closed"""
+        self._stop_tasks()
+        self.ws = None
+
+    async def attach(self, ws: WebSocket, codec, uuid: str, last_seq: int) -> bool:
+        """Resume the session on a new socket.
+
+        Sends session.resumed and replays the frames sent after `last_seq`
+        before carrying on with the queued ones. Returns False when some missed
+        frames were no longer buffered, or the full queue dropped some since the
+        session was last resumed, so the caller resyncs the whole state.
+        """
+        if self.expiry is not None:
+            self.expiry.cancel()
+            self.expiry = None
+        previous = self.ws
+        self.detach()
+        self.ws = ws
+        self.codec = codec
+        if previous is not None:
+            # reconnected before the old socket was noticed to be dead
+            try:
+                await previous.close(status.WS_1000_NORMAL_CLOSURE)
+            except RuntimeError:
+                pass
+
+        missed = self.replay.since(last_seq)
+        complete = missed is not None and self.queue.dropped == 0
+        self.queue.dropped = 0
+        missed = missed or []
+        await self._send(EncodedEvent(SessionResumed(
+            type="session.resumed",
+            payload=SessionResumedPayload(
+                uuid=uuid, seq=self.replay.seq - len(missed), replayed=len(missed), complete=complete
+            ),
+        )))
+        for frame in missed:
+            await self._send(frame)
+        self.last_seen = time.monotonic()
+        self._start_tasks()
+        SESSION_RESUMES.inc(complete=str(complete).lower())
+        return complete
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE):
+        """Stop writing and close the socket, the receive loop then runs the disconnect cleanup"""
+        was_open = self.open
+        self.open = False
+        self._stop_tasks()
+        self.queue.clear()
+        if was_open and self.ws is not None:
+            try:
+                await self.ws.close(code)
+            except RuntimeError:
+                pass
+
+    async def receive_client_event(self) -> GameEvent:
+        """Read the next frame and validate it straight into an inbound event.
+
+        Raises ValueError for malformed frames and unknown event types, and
+        WebSocketDisconnect once the heartbeat timeout passes without any frame.
+        """
+        try:
+            message = await asyncio.wait_for(self.ws.receive(), self.heartbeat_timeout_s or None)
+        except asyncio.TimeoutError:
+            IDLE_EVICTIONS.inc()
+            logging.warning("Evicting connection silent for %ss", self.heartbeat_timeout_s)
+            try:
+                await self.ws.close(status.WS_1001_GOING_AWAY)
+            except RuntimeError:
+                pass
+            raise WebSocketDisconnect(status.WS_1001_GOING_AWAY)
+        self.last_seen = time.monotonic()
+        self._set_half_open(False)
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+        data = message.get("bytes")
+        if data is None:
+            data = message.get("text")
+        return self.codec.decode_event(data)
 
 
 room_game_managers: Dict[str, GameManager] = defaultdict(GameManager)
@@ -49,59 +260,120 @@ room_game_managers: Dict[str, GameManager] = defaultdict(GameManager)
 # maps uuid to adapter
 uuid_adapters: Dict[str, WebSocketPlayerAdapter] = {}
 
+# maps resume token to the room and uuid of its session
+resume_tokens: Dict[str, Tuple[str, str]] = {}
+
+
+async def _end_session(room_id: str, ws_uuid: str):
+    """Drop a session for good, the player leaves the room which is deleted once empty"""
+    ws_adapter = uuid_adapters.pop(ws_uuid, None)
+    if ws_adapter is None:
+        return
+    resume_tokens.pop(ws_adapter.resume_token, None)
+    gm = room_game_managers[room_id]
+    if ws_uuid in gm.players:
+        await gm.leave(ws_uuid)
+        #await gm._broadcast(
+        #    PlayerLeft(type="player.left", payload=PlayerLeftPayload(player_id=ws_uuid))
+        #)
+    # the room may have been dropped and recreated while the player was leaving
+    if not gm.players and room_game_managers.get(room_id) is gm:
+        del room_game_managers[room_id]
+    _update_session_gauge()
+
+
+def _update_session_gauge():
+    attached = sum(1 for ws_adapter in uuid_adapters.values() if ws_adapter.ws is not None)
+    SESSIONS.set(attached, state="attached")
+    SESSIONS.set(len(uuid_adapters) - attached, state="detached")
+
+
+async def _expire_session(room_id: str, ws_uuid: str, ws_adapter: WebSocketPlayerAdapter):
+    await asyncio.sleep(RESUME_GRACE_S)
+    SESSION_EXPIRIES.inc()
+    await ws_adapter.close()
+    await _end_session(room_id, ws_uuid)
+
+
+async def _reject_flood(ws_adapter: WebSocketPlayerAdapter, event_type: str):
+    """Refuse a frame over its rate limit, raising WebSocketDisconnect for repeat offenders"""
+    RATE_LIMITED_FRAMES.inc(type=event_type)
+    if not ws_adapter.limiter.strike():
+        FLOOD_DISCONNECTS.inc()
+        logging.warning("Disconnecting client flooding %s", event_type)
+        await ws_adapter.close(status.WS_1008_POLICY_VIOLATION)
+        raise WebSocketDisconnect(status.WS_1008_POLICY_VIOLATION)
+    await ws_adapter.receive_encoded(RATE_LIMITED_ACK)
+
 
 @router.websocket("/{room_id}")
-async def websocket_endpoint(ws: WebSocket, room_id: str):
-    await ws.accept()
-    ws_uuid = str(uuid4())
-    ws_adapter = WebSocketPlayerAdapter(ws)
-    uuid_adapters[ws_uuid] = ws_adapter
+async def websocket_endpoint(
+    ws: WebSocket, room_id: str, resume: Optional[str] = None, last_seq: int = 0
+):
+    codec, subprotocol = negotiate(ws.scope.get("subprotocols", []))
+    await ws.accept(subprotocol=subprotocol)
+    session = resume_tokens.get(resume) if resume else None
+    if session is not None and session[0] == room_id:
+        ws_uuid = session[1]
+        ws_adapter = uuid_adapters[ws_uuid]
+    else:
+        session = None
+        ws_uuid = str(uuid4())
+        ws_adapter = WebSocketPlayerAdapter(
+            ws, codec=codec, limiter=InboundRateLimiter(room_game_managers[room_id].rate_limits)
+        )
+        uuid_adapters[ws_uuid] = ws_adapter
+        resume_tokens[ws_adapter.resume_token] = (room_id, ws_uuid)
+        _update_session_gauge()
 
     try:
-        await ws.send_json({"type": "player.uuid", "payload": {"uuid": ws_uuid}})
+        if session is not None:
+            complete = await ws_adapter.attach(ws, codec, ws_uuid, last_seq)
+            _update_session_gauge()
+            gm = room_game_managers[room_id]
+            if not complete and ws_uuid in gm.players:
+                await gm.receive_event(
+                    GameStateRequest(type="game.sync_request", player_id=ws_uuid), ws_adapter
+                )
+        else:
+            await ws_adapter.receive_event(
+                PlayerUuid(
+                    type="player.uuid",
+                    payload=PlayerUuidPayload(uuid=ws_uuid, resume_token=ws_adapter.resume_token),
+                )
+            )
         while True:
             try:
-                msg = await ws.receive_json()
-
-                match msg["type"]:
-                    case "player.join":
-                        event = PlayerJoin.model_validate(msg)
-                    case "player.leave":
-                        event = PlayerLeave.model_validate(msg)
-                    case "action.night":
-                        event = NightAction.model_validate(msg)
-                    case "action.vote":
-                        event = Vote.model_validate(msg)
-                    case "message.send":
-                        event = SendMessage.model_validate(msg)
-                    case "game.sync_request":
-                        event = GameStateRequest.model_validate(msg)
-                    case "opening.story_request":
-                        event = OpeningStoryRequest.model_validate(msg)
-                    case "narrator.finished":
-                        event = NarratorFinished.model_validate(msg)
-                    case _:
-                        raise ValidationError
-                await room_game_managers[room_id].receive_event(
-                    event, uuid_adapters[ws_uuid]
-                )
-
-            except ValidationError:
-                await ws.send_json(
+                event = await ws_adapter.receive_client_event()
+            except ValueError:
+                if not ws_adapter.limiter.allow(DEFAULT_KEY):
+                    await _reject_flood(ws_adapter, DEFAULT_KEY)
+                    continue
+                await ws_adapter.receive_event(
                     ActionAck(
                         type="action.ack",
                         payload=ActionAckPayload(
                             success=False, message="Invalid event payload"
                         ),
-                    ).model_dump()
+                    )
                 )
+                continue
+            if not ws_adapter.limiter.allow(event.type):
+                await _reject_flood(ws_adapter, event.type)
+                continue
+            if isinstance(event, HeartbeatPong):
+                continue
+            await room_game_managers[room_id].receive_event(
+                event, uuid_adapters[ws_uuid]
+            )
     except (WebSocketDisconnect, RuntimeError):
-        gm = room_game_managers[room_id]
-        if ws_uuid in gm.players:
-            gm.remove_player(ws_uuid)
-            #await gm._broadcast(
-            #    PlayerLeft(type="player.left", payload=PlayerLeftPayload(player_id=ws_uuid))
-            #)
-        del uuid_adapters[ws_uuid]
-        if not gm.players:
-            del room_game_managers[room_id]
+        if ws_adapter.ws is not ws:
+            # superseded by a resumed connection
+            return
+        if ws_adapter.open and RESUME_GRACE_S > 0:
+            ws_adapter.detach()
+            ws_adapter.expiry = asyncio.create_task(_expire_session(room_id, ws_uuid, ws_adapter))
+            _update_session_gauge()
+        else:
+            await ws_adapter.close()
+            await _end_session(room_id, ws_uuid)
@@ -0,0 +1,41 @@
+import logging
+import os
+from typing import Callable, Dict, Optional
+
+from .llm_backend import LLMBackend
+from .llm_client import DeepSeekClient, LocalLLMClient
+from .offline_backend import OfflineBackend
+
+logger = logging.getLogger(__name__)
+
+# openrouter, local or offline. Unset, rooms use openrouter when DEEPSEEK_API_KEY is set and offline otherwise
+LLM_BACKEND = os.getenv("LLM_BACKEND", "")
+
+BACKENDS: Dict[str, Callable[[], LLMBackend]] = {
+    "openrouter": DeepSeekClient,
+    "local": LocalLLMClient,
+    "offline": OfflineBackend,
+}
+
+
+def make_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Create the LLM backend for a room
+
+    Every room gets an instance of its own, which is what the LLM scheduler's
+    per-room cap counts.
+
+    Args:
+        name: Backend to create, the deployment's LLM_BACKEND when not given
+
+    Returns:
+        A new backend instance
+    """
+    name = name or LLM_BACKEND
+    if not name:
+        name = "openrouter" if os.getenv("DEEPSEEK_API_KEY") else "offline"
+        if name == "offline":
+            logger.warning("No DEEPSEEK_API_KEY set, narrating with the offline generator")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend {name!r}, expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -1,12 +1,22 @@
 from typing import List, Dict, Any
-import time
 import random
 import asyncio
+import json
 import logging
-from .llm_client import DeepSeekClient
+import os
+from .llm_backend import LLMBackend
+from .llm_scheduler import Priority
 
 logger = logging.getLogger(__name__)
 
+PROFILE_CONCURRENCY = int(os.getenv("PROFILE_CONCURRENCY", "4"))
+PROFILE_DEADLINE_S = float(os.getenv("PROFILE_DEADLINE_S", "20"))
+# ask for every profile in one JSON completion instead of one prompt per player
+PROFILE_BATCH = os.getenv("PROFILE_BATCH", "1") == "1"
+# follow-up batches for players whose entries came back missing or malformed
+PROFILE_BATCH_RETRIES = int(os.getenv("PROFILE_BATCH_RETRIES", "1"))
+MAX_DESCRIPTION_LENGTH = 400
+
 class CharacterProfile:
     """Data class for character profile information"""
 
@@ -30,8 +40,19 @@ class CharacterProfile:
 class CharacterGenerator:
     """Generates character profiles for mafia game players"""
 
-    def __init__(self, llm_client: DeepSeekClient):
+    def __init__(
+        self,
+        llm_client: LLMBackend,
+        concurrency: int = PROFILE_CONCURRENCY,
+        deadline_s: float = PROFILE_DEADLINE_S,
+        batch: bool = PROFILE_BATCH,
+        batch_retries: int = PROFILE_BATCH_RETRIES,
+    ):
         self.llm_client = llm_client
+        self.concurrency = concurrency
+        self.deadline_s = deadline_s
+        self.batch = batch
+        self.batch_retries = batch_retries
         self.available_professions = [
             "Baker", "Librarian", "Mechanic", "Teacher",
             "Doctor", "Shop Owner", "Postman", "Firefighter",
@@ -39,39 +60,92 @@ class CharacterGenerator:
             "Police Officer", "Nurse", "Chef", "Taxi Driver"
         ]
 
-    def generate_profiles_for_players(self, player_data: List[Dict[str, str]]) -> List[CharacterProfile]:
+    async def generate_profiles_for_players(self, player_data: List[Dict[str, str]]) -> List[CharacterProfile]:
         """
         Generate character profiles for all players
 
+        In batch mode one completion returns every profile, otherwise at most
+        `concurrency` single profiles are generated at a time. Players whose
+        profile isn't ready by the overall deadline get a fallback profile,
+        the others keep what the LLM wrote.
+
         Args:
             player_data: List of dicts with 'player_id' and 'name' keys
 
         Returns:
-            List of CharacterProfile objects
+            List of CharacterProfile objects, in the order of player_data
         """
         if not player_data:
             return []
-        
+
         player_count = len(player_data)
         professions = self._select_professions(player_count)
-        
-        profiles = []
-        for i, player in enumerate(player_data):
-            player_id = player["player_id"]
-            name = player["name"]
-            profession = professions[i]
+        # filled in as profiles arrive, whatever is missing at the deadline falls back
+        generated: Dict[str, CharacterProfile] = {}
 
-            logger.info(f"Generating profile {i+1}/{player_count}: {name} as {profession}")
+        if self.batch:
+            tasks = [asyncio.create_task(self._generate_batched_profiles(player_data, professions, generated))]
+        else:
+            limit = asyncio.Semaphore(max(1, self.concurrency))
 
-            profile = self.generate_single_profile(player_id, name, profession)
-            profiles.append(profile)
+            async def generate(i: int, player: Dict[str, str]):
+                async with limit:
+                    logger.info(f"Generating profile {i+1}/{player_count}: {player['name']} as {professions[i]}")
+                    generated[player["player_id"]] = await self.generate_single_profile(
+                        player["player_id"], player["name"], professions[i]
+                    )
+
+            tasks = [asyncio.create_task(generate(i, player)) for i, player in enumerate(player_data)]
+
+        _, late = await asyncio.wait(tasks, timeout=self.deadline_s)
+        for task in late:
+            task.cancel()
 
-            if i < player_count - 1:
-                time.sleep(0.5)
+        profiles = []
+        for i, player in enumerate(player_data):
+            profile = generated.get(player["player_id"])
+            if profile is None:
+                logger.warning(f"Profile for {player['name']} missed the {self.deadline_s:.0f}s deadline, using fallback")
+                profile = self._create_fallback_profile(player["player_id"], player["name"], professions[i])
+            profiles.append(profile)
         logger.info(f"Generated {len(profiles)} character profiles")
         return profiles
 
-    def generate_single_profile(self, player_id: str, name: str, profession: str) -> CharacterProfile:
+    async def _generate_batched_profiles(
+        self, player_data: List[Dict[str, str]], professions: List[str], generated: Dict[str, CharacterProfile]
+    ) -> None:
+        """
+        Generate profiles with one JSON completion, asking again only for the players it got wrong
+
+        Args:
+            player_data: List of dicts with 'player_id' and 'name' keys
+            professions: Profession assigned to each player, in the same order
+            generated: Receives each valid profile under its player_id
+        """
+        pending = {
+            player["player_id"]: (player["name"], professions[i]) for i, player in enumerate(player_data)
+        }
+        for attempt in range(1 + self.batch_retries):
+            if not pending:
+                return
+            logger.info(f"Generating {len(pending)} profiles in one batch (attempt {attempt + 1})")
+            try:
+                response = await self.llm_client.generate_text(
+                    self._create_batch_prompt(pending),
+                    max_tokens=60 + 90 * len(pending),
+                    temperature=0.8,
+                    priority=Priority.BACKGROUND
+                )
+            except Exception as e:
+                logger.warning(f"Batched profile generation failed: {str(e)}")
+                continue
+            for profile in self._parse_batch_response(response, pending):
+                generated[profile.player_id] = profile
+                del pending[profile.player_id]
+        if pending:
+            logger.warning(f"No valid batched profile for {len(pending)} players")
+
+    async def generate_single_profile(self, player_id: str, name: str, profession: str) -> CharacterProfile:
         """
         Generate a single character profile
 
@@ -87,10 +161,11 @@ class CharacterGenerator:
             prompt = self._create_character_prompt(name, profession)
             
             logger.info(f"Generating profile for {name} - {profession}") 
-            response = self.llm_client.generate_text(
+            response = await self.llm_client.generate_text(
                 prompt,
                 max_tokens=150,
-                temperature=0.8
+                temperature=0.8,
+                priority=Priority.BACKGROUND
             )
             profile = self._parse_llm_response(response, player_id, name, profession)
             logger.info(f"Successfully generated profile for {name}")
@@ -110,10 +185,12 @@ class CharacterGenerator:
         Returns:
             List of profession names
         """
-        if player_count <= len(self.available_professions):
-            return random.sample(self.available_professions, player_count)
-        else:
-            return random.choices(self.available_professions, k=player_count)
+        professions: List[str] = []
+        # professions only repeat once every one of them is taken
+        while len(professions) < player_count:
+            count = min(len(self.available_professions), player_count - len(professions))
+            professions += random.sample(self.available_professions, count)
+        return professions
 
     def _create_character_prompt(self, name: str, profession: str) -> str:
         """
@@ -146,6 +223,88 @@ class CharacterGenerator:
     """
         return prompt
 
+    def _create_batch_prompt(self, pending: Dict[str, tuple]) -> str:
+        """
+        Create one prompt asking for the profiles of several players as JSON
+
+        Args:
+            pending: (name, profession) of each player, by player_id
+
+        Returns:
+            Formatted prompt string
+        """
+        characters = json.dumps(
+            [
+                {"player_id": player_id, "name": name, "profession": profession}
+                for player_id, (name, profession) in pending.items()
+            ],
+            indent=2,
+        )
+        prompt = f"""Create character profiles for a mafia game set in a small town.
+
+    Characters:
+    {characters}
+
+    For each character write a concise description (2-3 sentences) that includes:
+    1. What they do in their profession and how they're known in town
+    2. One distinctive personality trait or memorable quirk
+    3. A hint about their place in the community or a small mystery
+
+    Style: Vivid, atmospheric, memorable but concise. Every character should feel different.
+    Language: English
+    Length: Keep each description under 200 characters for readability.
+    Format: Return only a JSON array with one object per character, keeping its
+    player_id, name and profession exactly as given:
+    [{{"player_id": "...", "name": "...", "profession": "...", "description": "..."}}]
+    """
+        return prompt
+
+    def _parse_batch_response(self, response: str, pending: Dict[str, tuple]) -> List[CharacterProfile]:
+        """
+        Parse a batched JSON response, keeping only the entries valid for a pending player
+
+        Args:
+            response: Raw LLM response
+            pending: (name, profession) of each player, by player_id
+
+        Returns:
+            CharacterProfile objects for the valid entries
+        """
+        text = response.strip()
+        start, end = text.find("["), text.rfind("]")
+        if start == -1 or end < start:
+            logger.warning("Batched profile response holds no JSON array")
+            return []
+        try:
+            entries = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Batched profile response is not valid JSON: {str(e)}")
+            return []
+
+        profiles = []
+        seen = set()
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            player_id = entry.get("player_id")
+            # model output, a list or dict here would make the lookup raise
+            if not isinstance(player_id, str) or player_id not in pending or player_id in seen:
+                continue
+            name, profession = pending[player_id]
+            description = entry.get("description")
+            if (
+                entry.get("name") != name
+                or not isinstance(entry.get("profession"), str)
+                or entry["profession"].lower() != profession.lower()
+                or not isinstance(description, str)
+                or not description.strip()
+                or len(description) > MAX_DESCRIPTION_LENGTH
+            ):
+                continue
+            seen.add(player_id)
+            profiles.append(self._parse_llm_response(description, player_id, name, profession))
+        return profiles
+
     def _parse_llm_response(self, response: str, player_id: str, name: str, profession: str) -> CharacterProfile:
         """
         Parse LLM response into CharacterProfile
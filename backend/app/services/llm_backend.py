@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+from app.services.llm_scheduler import Priority
+
+
+class LLMBackend(ABC):
+    """Whatever writes the narrations and character profiles.
+
+    NarratorService and CharacterGenerator only talk to this interface, so a
+    room runs the same on the OpenRouter provider, a local OpenAI-compatible
+    server or the in-process offline generator.
+    """
+
+    @abstractmethod
+    async def generate_text(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        priority: Priority = Priority.FLAVOR,
+        deadline_s: Optional[float] = None,
+    ) -> str:
+        raise NotImplementedError
+
+    async def stream_text(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        priority: Priority = Priority.FLAVOR,
+        deadline_s: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Pieces of the completion as they are written, the whole of it at once unless overridden"""
+        yield await self.generate_text(prompt, max_tokens, temperature, priority, deadline_s)
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "512"))
+LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+# share of cache hits actually served, the rest ask the LLM for a new variant
+LLM_CACHE_REUSE = float(os.getenv("LLM_CACHE_REUSE", "0.6"))
+# different texts kept for one prompt, served at random
+LLM_CACHE_VARIANTS = int(os.getenv("LLM_CACHE_VARIANTS", "4"))
+# SQLite file the cache survives restarts in, memory only when unset
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+LOOKUPS = metrics.counter(
+    "llm_cache_lookups_total", "Narrative cache lookups, by result: hit, miss, expired or refresh"
+)
+HIT_RATIO = metrics.gauge("llm_cache_hit_ratio", "Share of narrative cache lookups served from the cache")
+SECONDS_SAVED = metrics.counter(
+    "llm_cache_seconds_saved_total", "LLM time the served cache hits originally took to generate"
+)
+ENTRIES = metrics.gauge("llm_cache_entries", "Prompts held in the in-memory narrative cache")
+
+
+class CacheEntry:
+    __slots__ = ("texts", "seconds", "stored_at")
+
+    def __init__(self, texts: List[str], seconds: float, stored_at: float):
+        self.texts = texts
+        self.seconds = seconds
+        self.stored_at = stored_at
+
+
+class NarrativeCache:
+    """Content-addressed cache of LLM completions.
+
+    Entries are keyed by a hash of the model, prompt and sampling parameters,
+    kept in memory in LRU order up to `size` entries and dropped after
+    `ttl_s`. With a `path` they are also written through to SQLite and read
+    back after a restart, on a thread of the cache's own so the event loop
+    never waits on the disk. Only a `reuse` share of hits is served, the rest go
+    to the LLM and their text becomes another variant of the entry, so
+    repeated narration doesn't always read the same.
+    """
+
+    def __init__(
+        self,
+        size: int = LLM_CACHE_SIZE,
+        ttl_s: float = LLM_CACHE_TTL_S,
+        reuse: float = LLM_CACHE_REUSE,
+        variants: int = LLM_CACHE_VARIANTS,
+        path: Optional[str] = LLM_CACHE_PATH,
+        clock: Callable[[], float] = time.time,
+        rng: Optional[random.Random] = None,
+    ):
+        self.size = size
+        self.ttl_s = ttl_s
+        self.reuse = reuse
+        self.variants = max(1, variants)
+        self.clock = clock
+        # separate from the global random, which also deals out roles
+        self.rng = rng or random.Random()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._hits = 0
+        self._lookups = 0
+        self._db: Optional[sqlite3.Connection] = None
+        # a single worker runs every query, in the order they were issued
+        self._io: Optional[ThreadPoolExecutor] = None
+        if path:
+            self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-cache")
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS narratives "
+                "(key TEXT PRIMARY KEY, texts TEXT NOT NULL, seconds REAL NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(model: str, prompt: str, **params) -> str:
+        material = json.dumps({"model": model, "prompt": prompt, **params}, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """A cached text for `key`, None when the LLM should be asked"""
+        if self.size <= 0:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = await self._load(key)
+
+        result = "hit"
+        if entry is None:
+            result = "miss"
+        elif self.clock() - entry.stored_at > self.ttl_s:
+            result = "expired"
+            self._drop(key)
+        elif self.rng.random() >= self.reuse:
+            result = "refresh"
+            self._entries.move_to_end(key)
+        else:
+            self._entries.move_to_end(key)
+
+        self._lookups += 1
+        self._hits += result == "hit"
+        LOOKUPS.inc(result=result)
+        HIT_RATIO.set(self._hits / self._lookups)
+        if result != "hit":
+            return None
+        SECONDS_SAVED.inc(entry.seconds)
+        return self.rng.choice(entry.texts)
+
+    def put(self, key: str, text: str, seconds: float):
+        """Store a freshly generated text, `seconds` being how long the LLM took"""
+        if self.size <= 0 or not text:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = CacheEntry([], seconds, self.clock())
+            self._entries[key] = entry
+        if text not in entry.texts:
+            entry.texts = (entry.texts + [text])[-self.variants:]
+        entry.seconds = seconds
+        entry.stored_at = self.clock()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        ENTRIES.set(len(self._entries))
+
+        if self._io is not None:
+            self._io.submit(self._write, key, json.dumps(entry.texts), entry.seconds, entry.stored_at)
+
+    def close(self):
+        """Wait for the queued writes and close the SQLite store"""
+        if self._io is not None:
+            self._io.shutdown(wait=True)
+            self._io = None
+            self._db.close()
+            self._db = None
+
+    async def _load(self, key: str) -> Optional[CacheEntry]:
+        if self._io is None:
+            return None
+        row = await asyncio.get_running_loop().run_in_executor(self._io, self._read, key)
+        if row is None:
+            return None
+        # a put for the same key may have landed while the row was read
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = CacheEntry(json.loads(row[0]), row[1], row[2])
+            self._entries[key] = entry
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        ENTRIES.set(len(self._entries))
+        return entry
+
+    def _drop(self, key: str):
+        self._entries.pop(key, None)
+        ENTRIES.set(len(self._entries))
+        if self._io is not None:
+            self._io.submit(self._delete, key)
+
+    # the methods below run on the cache's I/O thread
+
+    def _read(self, key: str):
+        try:
+            return self._db.execute(
+                "SELECT texts, seconds, stored_at FROM narratives WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            # a locked or damaged store is a miss, the LLM is asked instead
+            logger.warning(f"💾 Failed to read narrative from the cache: {e}")
+            return None
+
+    def _write(self, key: str, texts: str, seconds: float, stored_at: float):
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO narratives (key, texts, seconds, stored_at) VALUES (?, ?, ?, ?)",
+                (key, texts, seconds, stored_at),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"💾 Failed to store narrative in the cache: {e}")
+
+    def _delete(self, key: str):
+        try:
+            self._db.execute("DELETE FROM narratives WHERE key = ?", (key,))
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"💾 Failed to drop narrative from the cache: {e}")
+
+
+# shared by every room of this process
+llm_cache = NarrativeCache()
@@ -1,32 +1,162 @@
-import requests
+import asyncio
+import httpx
 import json
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Awaitable, Callable, Optional, Dict, Any, TypeVar
 import logging
 import os
+import time
 from dotenv import load_dotenv
 
+from app import metrics
+from app.services.llm_backend import LLMBackend
+from app.services.llm_cache import NarrativeCache, llm_cache
+from app.services.llm_resilience import CircuitBreaker, LatencyWindow, llm_breaker, llm_latencies
+from app.services.llm_scheduler import LLMScheduler, Priority, RateLimitedError, estimate_tokens, llm_scheduler
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-class DeepSeekClient:
-    """Client for DeepSeek R1 API integration"""
+LLM_CONNECT_TIMEOUT_S = float(os.getenv("LLM_CONNECT_TIMEOUT_S", "5"))
+LLM_READ_TIMEOUT_S = float(os.getenv("LLM_READ_TIMEOUT_S", "30"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_KEEPALIVE_S = float(os.getenv("LLM_KEEPALIVE_S", "60"))
+# needs the h2 package, httpx[http2]
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "0") == "1"
+# latency percentile after which a second attempt races the first, 0 disables hedging
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0"))
+# successful calls seen before the percentile is trusted
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# an OpenAI-compatible server standing in for OpenRouter, e.g. llama.cpp or vLLM
+LOCAL_LLM_URL = os.getenv("LOCAL_LLM_URL", "http://localhost:8080/v1")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "local")
+
+DEADLINES_EXCEEDED = metrics.counter(
+    "llm_deadline_exceeded_total", "LLM calls abandoned for the fallback once their deadline budget ran out"
+)
+HEDGES = metrics.counter(
+    "llm_hedged_requests_total", "Second attempts fired at slow LLM calls, and how many of them won the race"
+)
+
+T = TypeVar("T")
+
+class _Attempt:
+    """Whether a scheduled call got past the queue and reached the provider"""
+
+    __slots__ = ("reached",)
+
+    def __init__(self):
+        self.reached = False
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# closes of clients left behind by another loop, referenced until they finish
+_retiring: set = set()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Pooled HTTP client shared by every LLM call of the process
+
+    Connections are kept alive between calls, so a narration doesn't pay for
+    a new TLS handshake. The pool belongs to the running event loop and is
+    rebuilt when a different loop asks for it, closing the previous one so
+    its connections don't leak.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        if _http_client is not None and not _http_client.is_closed:
+            _retire_http_client(_http_client, _http_client_loop)
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(LLM_READ_TIMEOUT_S, connect=LLM_CONNECT_TIMEOUT_S),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE_S,
+            ),
+            http2=LLM_HTTP2,
+        )
+        _http_client_loop = loop
+    return _http_client
+
 
-    def __init__(self, api_key: str = None, base_url: str = "https://openrouter.ai/api/v1"):
+def _retire_http_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close a client pooled by another event loop without waiting for it"""
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        # its connections live on that loop, so they are closed there
+        asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+        return
+    task = asyncio.get_running_loop().create_task(_close_quietly(client))
+    _retiring.add(task)
+    task.add_done_callback(_retiring.discard)
+
+
+async def _close_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as e:
+        # sockets of a loop that is already closed may refuse a clean shutdown
+        logger.debug(f"🔌 Closing a stale HTTP client failed: {e}")
+
+
+async def close_http_client() -> None:
+    """Close the pooled connections, on shutdown"""
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+
+class DeepSeekClient(LLMBackend):
+    """Client for DeepSeek R1 API integration, served by OpenRouter"""
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = "https://openrouter.ai/api/v1",
+        model: str = "deepseek/deepseek-chat",
+        scheduler: Optional[LLMScheduler] = None,
+        cache: Optional[NarrativeCache] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        latencies: Optional[LatencyWindow] = None,
+        hedge_percentile: float = LLM_HEDGE_PERCENTILE,
+    ):
         self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
         if not self.api_key:
             raise ValueError("DeepSeek API key is required. Set DEEPSEEK_API_KEY environment variable or pass api_key parameter.")
         self.base_url = base_url
-        self.model = "deepseek/deepseek-chat"
+        self.model = model
+        # every room has its own client, which is what the per-room cap counts
+        self.scheduler = llm_scheduler if scheduler is None else scheduler
+        self.cache = llm_cache if cache is None else cache
+        self.breaker = llm_breaker if breaker is None else breaker
+        self.latencies = llm_latencies if latencies is None else latencies
+        self.hedge_percentile = hedge_percentile
 
-    def generate_text(self, prompt: str, max_tokens: int = 200, temperature: float = 0.7) -> str:
+    async def generate_text(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        priority: Priority = Priority.FLAVOR,
+        deadline_s: Optional[float] = None,
+    ) -> str:
         """
-        Generate text using DeepSeek R1 API
+        Generate text using DeepSeek R1 API, queued on the shared LLM scheduler
+
+        Near-identical prompts recur game after game, so completions go through
+        the narrative cache first. While the circuit breaker is open the call
+        fails at once, and a call slower than the hedge percentile gets a
+        second attempt racing it.
 
         Args:
             prompt: Input prompt for the model
             max_tokens: Maximum tokens to generate
             temperature: Creativity level (0.0 - 1.0)
+            priority: Scheduling class of the request
+            deadline_s: Budget for the whole call, queueing included, None for no limit
 
         Returns:
             Generated text response
@@ -45,8 +175,34 @@ class DeepSeekClient:
             "stream": False
         }
 
+        cache_key = self.cache.key(self.model, prompt, max_tokens=max_tokens, temperature=temperature)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            response_data = self._make_request(payload)
+            self.breaker.check()
+            started = time.perf_counter()
+            tokens = estimate_tokens(prompt, max_tokens)
+
+            def request():
+                return self._make_request(payload)
+
+            def hedge():
+                # a second attempt takes a slot and tokens of its own
+                return self.scheduler.submit(request, priority=priority, tokens=tokens, owner=self)
+
+            attempt = _Attempt()
+            response_data = await self._within_deadline(
+                self.scheduler.submit(
+                    lambda: self._call_provider(request, hedge=hedge, attempt=attempt),
+                    priority=priority,
+                    tokens=tokens,
+                    owner=self,
+                ),
+                deadline_s,
+                attempt,
+            )
 
             if "choices" in response_data and len(response_data["choices"]) > 0:
                 choice = response_data["choices"][0]
@@ -55,9 +211,11 @@ class DeepSeekClient:
                     message = choice["message"]
 
                     if "content" in message and message["content"]:
-                        generated_text = message["content"]
-                        return generated_text.strip()
+                        generated_text = message["content"].strip()
+                        self.cache.put(cache_key, generated_text, time.perf_counter() - started)
+                        return generated_text
                     elif "reasoning" in message and message["reasoning"]:
+                        # a reasoning trace is a poor narration, not worth caching
                         generated_text = message["reasoning"]
                         return generated_text.strip()
                     else:
@@ -71,9 +229,203 @@ class DeepSeekClient:
             logger.error(f"Error generating text: {str(e)}")
             raise Exception(f"Failed to generate text: {str(e)}")
 
-    def _make_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def stream_text(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        priority: Priority = Priority.FLAVOR,
+        deadline_s: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate text like generate_text, yielding the pieces as the model writes them
+
+        Streams aren't hedged, a second attempt would write a different text.
+
+        Args:
+            prompt: Input prompt for the model
+            max_tokens: Maximum tokens to generate
+            temperature: Creativity level (0.0 - 1.0)
+            priority: Scheduling class of the request
+            deadline_s: Budget until the first piece arrives, players are reading from then on
+
+        Yields:
+            Text deltas, in order. A cached completion comes as a single delta.
+        """
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+        cache_key = self.cache.key(self.model, prompt, max_tokens=max_tokens, temperature=temperature)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            self.breaker.check()
+        except Exception as e:
+            logger.error(f"Error streaming text: {str(e)}")
+            raise Exception(f"Failed to generate text: {str(e)}")
+
+        started = time.perf_counter()
+        parts = []
+        deltas: asyncio.Queue = asyncio.Queue()
+        attempt = _Attempt()
+        # the request holds its scheduler slot until the stream is over
+        job = asyncio.ensure_future(self.scheduler.submit(
+            lambda: self._call_provider(lambda: self._stream_request(payload, deltas.put_nowait), attempt=attempt),
+            priority=priority,
+            tokens=estimate_tokens(prompt, max_tokens),
+            owner=self,
+        ))
+        job.add_done_callback(lambda _: deltas.put_nowait(None))
+
+        try:
+            delta = await self._within_deadline(deltas.get(), deadline_s, attempt)
+            while delta is not None:
+                parts.append(delta)
+                yield delta
+                delta = await deltas.get()
+            await job
+            self.cache.put(cache_key, "".join(parts).strip(), time.perf_counter() - started)
+        except Exception as e:
+            logger.error(f"Error streaming text: {str(e)}")
+            raise Exception(f"Failed to generate text: {str(e)}")
+        finally:
+            job.cancel()
+
+    async def _within_deadline(self, call: Awaitable[T], deadline_s: Optional[float], attempt: _Attempt) -> T:
+        """
+        Await `call`, giving up on it once `deadline_s` have passed
+
+        The timeout counts against the breaker only when `attempt` reached the
+        provider, a call which ran out of time in the scheduler's queue says
+        nothing about the provider's health.
+        """
+        try:
+            return await asyncio.wait_for(call, deadline_s)
+        except asyncio.TimeoutError:
+            DEADLINES_EXCEEDED.inc()
+            if attempt.reached:
+                self.breaker.record_failure()
+            raise Exception(f"Deadline of {deadline_s:.1f}s exceeded")
+
+    async def _call_provider(
+        self,
+        request: Callable[[], Awaitable[T]],
+        hedge: Optional[Callable[[], Awaitable[T]]] = None,
+        attempt: Optional[_Attempt] = None,
+    ) -> T:
+        """
+        Make one call to the provider, keeping the circuit breaker and latency window up to date
+
+        Only provider errors count as failures. A call cancelled by its caller,
+        or throttled, reports nothing and hands back the probe slot if it held it.
+
+        Args:
+            request: Makes the HTTP request
+            hedge: Starts a second attempt through the scheduler when the call is slow, None to never hedge
+            attempt: Marked once the call gets past the breaker to the provider
+
+        Returns:
+            Result of the first attempt to succeed
+        """
+        probe = self.breaker.acquire()
+        if attempt is not None:
+            attempt.reached = True
+        started = time.perf_counter()
+        try:
+            result = await (request() if hedge is None else self._hedged(request, hedge))
+        except RateLimitedError:
+            # throttled, not down, the scheduler waits it out
+            self.breaker.release(probe)
+            raise
+        except asyncio.CancelledError:
+            self.breaker.release(probe)
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.latencies.add(time.perf_counter() - started)
+        self.breaker.record_success()
+        return result
+
+    async def _hedged(self, request: Callable[[], Awaitable[T]], hedge: Callable[[], Awaitable[T]]) -> T:
+        """Run `request`, firing `hedge` if it's slower than the hedge percentile"""
+        delay = None
+        if self.hedge_percentile and len(self.latencies) >= LLM_HEDGE_MIN_SAMPLES:
+            delay = self.latencies.percentile(self.hedge_percentile)
+
+        attempts = [asyncio.ensure_future(request())]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done:
+                    HEDGES.inc(result="fired")
+                    attempts.append(asyncio.ensure_future(hedge()))
+
+            pending, error = set(attempts), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not attempts[0]:
+                            HEDGES.inc(result="won")
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            # the slower attempt is no longer needed
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def _stream_request(self, payload: Dict[str, Any], on_delta: Callable[[str], None]) -> None:
+        """
+        Make a streaming HTTP request to OpenRouter API, reading its server-sent events
+
+        Args:
+            payload: Request payload with "stream" set
+            on_delta: Called with every piece of generated text
         """
-        Make HTTP request to OpenRouter API
+        headers = self._prepare_headers()
+        headers["Accept"] = "text/event-stream"
+        url = f"{self.base_url}/chat/completions"
+
+        try:
+            async with get_http_client().stream("POST", url, headers=headers, json=payload) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    self._handle_api_error(response)
+
+                async for line in response.aiter_lines():
+                    # blank separators and ": keep-alive" comments carry no data
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        return
+                    choices = json.loads(data).get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        on_delta(delta)
+
+        except httpx.TimeoutException:
+            raise Exception("OpenRouter API request timed out")
+        except httpx.HTTPError as e:
+            raise Exception(f"Network error connecting to OpenRouter API: {str(e)}")
+
+    async def _make_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make HTTP request to OpenRouter API over the pooled client
         
         Args:
             payload: Request payload
@@ -85,7 +437,7 @@ class DeepSeekClient:
         url = f"{self.base_url}/chat/completions"
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = await get_http_client().post(url, headers=headers, json=payload)
 
             if response.status_code != 200:
                 self._handle_api_error(response)
@@ -93,9 +445,9 @@ class DeepSeekClient:
             response_data = response.json()
             return response_data
             
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise Exception("OpenRouter API request timed out")
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Network error connecting to OpenRouter API: {str(e)}")
 
     def _prepare_headers(self) -> Dict[str, str]:
@@ -113,7 +465,7 @@ class DeepSeekClient:
             "X-Title": "Mafia Online Game"
         }
 
-    def _handle_api_error(self, response: requests.Response) -> None:
+    def _handle_api_error(self, response: httpx.Response) -> None:
         """
         Handle API errors and raise appropriate exceptions
 
@@ -123,7 +475,11 @@ class DeepSeekClient:
         if response.status_code == 401:
             raise Exception("Invalid API key - check your DeepSeek API credentials")
         elif response.status_code == 429:
-            raise Exception("Rate limit exceeded - too many requests")
+            try:
+                retry_after = float(response.headers.get("Retry-After", "5"))
+            except ValueError:
+                retry_after = 5.0
+            raise RateLimitedError("Rate limit exceeded - too many requests", retry_after)
         elif response.status_code == 500:
             raise Exception("DeepSeek API server error - try again later")
         elif response.status_code >= 400:
@@ -132,4 +488,27 @@ class DeepSeekClient:
                 error_message = error_data.get("error", {}).get("message", "Unknown API error")
                 raise Exception(f"DeepSeek API error: {error_message}")
             except:
-                raise Exception(f"DeepSeek API error: HTTP {response.status_code}")
\ No newline at end of file
+                raise Exception(f"DeepSeek API error: HTTP {response.status_code}")
+
+
+# the local server has a capacity, health and latencies of its own
+local_scheduler = LLMScheduler()
+local_breaker = CircuitBreaker("local")
+local_latencies = LatencyWindow()
+
+
+class LocalLLMClient(DeepSeekClient):
+    """Client for a local OpenAI-compatible server, e.g. llama.cpp or vLLM
+
+    Speaks the same chat completions API as OpenRouter but needs no API key,
+    and queues on its own scheduler behind its own circuit breaker so it
+    can't hold up or trip rooms on the real provider.
+    """
+
+    def __init__(self, base_url: str = LOCAL_LLM_URL, model: str = LOCAL_LLM_MODEL, **kwargs):
+        kwargs.setdefault("scheduler", local_scheduler)
+        kwargs.setdefault("breaker", local_breaker)
+        kwargs.setdefault("latencies", local_latencies)
+        super().__init__(
+            api_key=os.getenv("LOCAL_LLM_API_KEY", "local"), base_url=base_url, model=model, **kwargs
+        )
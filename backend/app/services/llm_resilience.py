@@ -0,0 +1,145 @@
+import logging
+import os
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+# consecutive failed calls which open the breaker
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+# how long an open breaker rejects calls before letting a probe through
+LLM_BREAKER_RESET_S = float(os.getenv("LLM_BREAKER_RESET_S", "30"))
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+
+BREAKER_STATE = metrics.gauge(
+    "llm_breaker_state", "Circuit breaker state, by breaker: 0 closed, 1 half open, 2 open"
+)
+BREAKER_TRANSITIONS = metrics.counter(
+    "llm_breaker_transitions_total", "Circuit breaker state changes, by breaker and the state entered"
+)
+BREAKER_REJECTED = metrics.counter(
+    "llm_breaker_rejected_total", "LLM calls sent straight to their fallback by an open breaker"
+)
+
+
+class CircuitOpenError(Exception):
+    """The provider is considered unhealthy, the call was never made"""
+
+
+class CircuitBreaker:
+    """Stops calling a provider which keeps failing.
+
+    Closed, calls go through and `failure_threshold` failures in a row open
+    it. Open, calls are rejected at once so callers go to their fallback,
+    until `reset_s` have passed. Half open, a single probe call goes through:
+    its success closes the breaker, its failure opens it for another `reset_s`.
+
+    The probe slot is taken with acquire when the call reaches the provider,
+    not when it's queued, and a probe ending without a result, cancelled or
+    throttled, hands the slot back with release.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    _GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        reset_s: float = LLM_BREAKER_RESET_S,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_s = reset_s
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe: Optional[object] = None
+        BREAKER_STATE.set(self._GAUGE[self.state], breaker=name)
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now, without taking the probe slot"""
+        if self.state == self.OPEN:
+            return self.clock() - self.opened_at >= self.reset_s
+        if self.state == self.HALF_OPEN:
+            return self._probe is None
+        return True
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may go to the provider now"""
+        if not self.allow():
+            BREAKER_REJECTED.inc(breaker=self.name)
+            raise CircuitOpenError(f"{self.name} is unhealthy, circuit breaker is {self.state}")
+
+    def acquire(self) -> Optional[object]:
+        """
+        Admit a call reaching the provider, raising CircuitOpenError if it may not
+
+        Returns:
+            The probe token when the call is the half-open probe, else None
+        """
+        self.check()
+        if self.state == self.OPEN:
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            self._probe = object()
+            return self._probe
+        return None
+
+    def release(self, probe: Optional[object]):
+        """Hand back the probe slot of a call which ended without a result"""
+        if probe is not None and self._probe is probe:
+            self._probe = None
+
+    def record_success(self):
+        self.failures = 0
+        self._probe = None
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe = None
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            if self.state != self.OPEN:
+                self._transition(self.OPEN)
+
+    def _transition(self, state: str):
+        logger.warning(f"⚡ Circuit breaker {self.name}: {self.state} -> {state}")
+        self.state = state
+        BREAKER_STATE.set(self._GAUGE[state], breaker=self.name)
+        BREAKER_TRANSITIONS.inc(breaker=self.name, state=state)
+
+
+class LatencyWindow:
+    """Latencies of the most recent successful calls, for percentiles"""
+
+    def __init__(self, size: int = LLM_LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The `q`th percentile of the window, nearest rank, None while it's empty"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+
+# one provider behind every room of this process
+llm_breaker = CircuitBreaker("openrouter")
+llm_latencies = LatencyWindow()
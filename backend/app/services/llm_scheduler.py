@@ -0,0 +1,250 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, TypeVar
+
+from app import metrics
+from app.domain.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_CONCURRENCY_PER_ROOM = int(os.getenv("LLM_MAX_CONCURRENCY_PER_ROOM", "4"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "100000"))
+# times a job rejected with a 429 goes back into the queue
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))
+
+QUEUE_DEPTH = metrics.gauge("llm_queue_depth", "LLM jobs waiting for a slot, by priority")
+IN_FLIGHT = metrics.gauge("llm_in_flight", "LLM requests currently being served")
+JOBS = metrics.counter("llm_jobs_total", "Finished LLM jobs, by priority and outcome")
+QUEUE_WAIT = metrics.counter(
+    "llm_queue_wait_seconds_total", "Time LLM jobs spent queued, by priority"
+)
+LAST_QUEUE_WAIT = metrics.gauge(
+    "llm_last_queue_wait_seconds", "Queue time of the most recently started LLM job, by priority"
+)
+TOKENS = metrics.counter("llm_budgeted_tokens_total", "Estimated tokens admitted by the token budget")
+RATE_LIMITED = metrics.counter("llm_rate_limited_total", "LLM requests the provider answered with 429")
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    # narration a phase or a player is waiting on
+    CRITICAL = 0
+    # character profiles prepared ahead of the intro
+    BACKGROUND = 1
+    # phase transition lines, nice to have
+    FLAVOR = 2
+
+
+class RateLimitedError(Exception):
+    """The provider refused the request, nothing should be sent for `retry_after` seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Usage:
+    """Jobs and estimated tokens the scheduler started on behalf of one piece of work"""
+
+    def __init__(self):
+        self.jobs = 0
+        self.tokens = 0
+
+
+_usage: ContextVar[Optional[Usage]] = ContextVar("llm_usage", default=None)
+
+
+def charge_to(usage: Usage):
+    """Count the jobs the current task submits from now on against `usage`, once they start.
+
+    Jobs still queued when the task is cancelled never reach the provider and
+    cost nothing, so they aren't counted.
+    """
+    _usage.set(usage)
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough cost of a completion, about four characters a token plus the reply"""
+    return len(prompt) // 4 + max_tokens
+
+
+class _Job:
+    __slots__ = ("call", "priority", "tokens", "owner", "future", "enqueued", "retries", "task", "usage")
+
+    def __init__(self, call, priority: Priority, tokens: int, owner: Hashable, future: asyncio.Future, enqueued: float):
+        self.call = call
+        self.priority = priority
+        self.tokens = tokens
+        self.owner = owner
+        self.future = future
+        self.enqueued = enqueued
+        self.retries = 0
+        self.task: Optional[asyncio.Task] = None
+        self.usage = _usage.get()
+
+
+class LLMScheduler:
+    """Process-wide queue every room's LLM requests go through.
+
+    Jobs start in priority order, then in order of arrival, as long as there
+    is a free global slot, the submitting room is under its own cap and the
+    token budget covers the job's estimated cost. A job the budget can't
+    cover yet holds back everything behind it, so big critical narrations
+    aren't starved by a stream of small ones. A 429 pauses the whole queue
+    for the provider's Retry-After and sends the job back in.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_per_room: int = LLM_MAX_CONCURRENCY_PER_ROOM,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+        rate_limit_retries: int = LLM_RATE_LIMIT_RETRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_room = max_per_room
+        self.rate_limit_retries = rate_limit_retries
+        self.clock = clock
+        self._budget = TokenBucket(tokens_per_minute / 60, tokens_per_minute, clock())
+        self._queue: List[Tuple[int, int, _Job]] = []
+        self._order = itertools.count()
+        self._running = 0
+        self._running_by_room: Dict[Hashable, int] = defaultdict(int)
+        self._paused_until = 0.0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._wakeup_at = 0.0
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self):
+        return len(self._queue)
+
+    async def submit(
+        self,
+        call: Callable[[], Awaitable[T]],
+        priority: Priority = Priority.FLAVOR,
+        tokens: int = 0,
+        owner: Hashable = None,
+    ) -> T:
+        """Run `call()` once the job's turn comes, `owner` is the room the per-room cap applies to"""
+        job = _Job(call, priority, tokens, owner, asyncio.get_running_loop().create_future(), self.clock())
+        self._enqueue(job)
+        self._pump()
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            # the caller gave up, e.g. its deadline ran out, so free the slot its call holds
+            if job.task is not None:
+                job.task.cancel()
+            raise
+
+    def _enqueue(self, job: _Job):
+        heapq.heappush(self._queue, (job.priority, next(self._order), job))
+        QUEUE_DEPTH.inc(priority=job.priority.name.lower())
+
+    def _pump(self):
+        now = self.clock()
+        if now < self._paused_until:
+            self._wake_at(self._paused_until)
+            return
+
+        held: List[Tuple[int, int, _Job]] = []
+        while self._queue and self._running < self.max_concurrency:
+            entry = heapq.heappop(self._queue)
+            job = entry[2]
+            if job.future.done():
+                # the caller gave up waiting
+                QUEUE_DEPTH.dec(priority=job.priority.name.lower())
+                JOBS.inc(priority=job.priority.name.lower(), outcome="cancelled")
+                continue
+            if self._running_by_room[job.owner] >= self.max_per_room:
+                held.append(entry)
+                continue
+            cost = min(job.tokens, self._budget.burst)
+            if not self._budget.take(now, cost):
+                held.append(entry)
+                self._wake_at(now + (cost - self._budget.tokens) / self._budget.rate)
+                break
+            self._start(job, now)
+
+        for entry in held:
+            heapq.heappush(self._queue, entry)
+
+    def _wake_at(self, when: float):
+        """Pump again at `when`, unless an earlier wakeup is already set"""
+        if self._wakeup is not None:
+            if self._wakeup_at <= when:
+                return
+            self._wakeup.cancel()
+        self._wakeup_at = when
+        self._wakeup = asyncio.get_running_loop().call_later(max(0.0, when - self.clock()), self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._pump()
+
+    def _start(self, job: _Job, now: float):
+        priority = job.priority.name.lower()
+        QUEUE_DEPTH.dec(priority=priority)
+        QUEUE_WAIT.inc(now - job.enqueued, priority=priority)
+        LAST_QUEUE_WAIT.set(now - job.enqueued, priority=priority)
+        TOKENS.inc(job.tokens)
+        if job.usage is not None:
+            job.usage.jobs += 1
+            job.usage.tokens += job.tokens
+        IN_FLIGHT.inc()
+        self._running += 1
+        self._running_by_room[job.owner] += 1
+        task = asyncio.create_task(self._run(job))
+        job.task = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _Job):
+        priority = job.priority.name.lower()
+        # jobs the call submits itself, e.g. a hedge, are charged like this one
+        _usage.set(job.usage)
+        try:
+            result = await job.call()
+        except RateLimitedError as e:
+            RATE_LIMITED.inc()
+            self._paused_until = max(self._paused_until, self.clock() + e.retry_after)
+            logger.warning(f"🚦 LLM provider rate limited us, pausing for {e.retry_after:.1f}s")
+            if job.retries < self.rate_limit_retries and not job.future.done():
+                job.retries += 1
+                self._enqueue(job)
+            else:
+                JOBS.inc(priority=priority, outcome="rate_limited")
+                if not job.future.done():
+                    job.future.set_exception(e)
+        except asyncio.CancelledError:
+            JOBS.inc(priority=priority, outcome="cancelled")
+            raise
+        except Exception as e:
+            JOBS.inc(priority=priority, outcome="error")
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            JOBS.inc(priority=priority, outcome="ok")
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            IN_FLIGHT.dec()
+            self._running -= 1
+            self._running_by_room[job.owner] -= 1
+            if not self._running_by_room[job.owner]:
+                del self._running_by_room[job.owner]
+            self._pump()
+
+
+# shared by every room of this process
+llm_scheduler = LLMScheduler()
@@ -1,11 +1,15 @@
-from typing import List, Dict, Any, Optional
+from typing import Awaitable, Callable, List, Dict, Any, Optional
 import time
 import logging
-from .llm_client import DeepSeekClient
+from .llm_backend import LLMBackend
+from .llm_scheduler import Priority
 from .character_generator import CharacterProfile
 
 logger = logging.getLogger(__name__)
 
+# receives each piece of a narration as the LLM writes it
+ChunkCallback = Callable[[str], Awaitable[None]]
+
 class GameContext:
     """Stores game context for narrative generation"""
 
@@ -40,7 +44,7 @@ class GameContext:
 class NarratorService:
     """Main service for generating game narratives using LLM"""
 
-    def __init__(self, llm_client: DeepSeekClient):
+    def __init__(self, llm_client: LLMBackend):
         self.llm_client = llm_client
         self.game_context = GameContext()
 
@@ -57,12 +61,19 @@ class NarratorService:
         
         logger.info(f"Set {len(profiles)} character profiles for narrative context")
 
-    def generate_story_opening(self, player_names: List[str]) -> str:
+    async def generate_story_opening(
+        self,
+        player_names: List[str],
+        on_chunk: Optional[ChunkCallback] = None,
+        deadline_s: Optional[float] = None,
+    ) -> str:
         """
         Generate opening story for the game
         
         Args:
             player_names: List of player display names
+            on_chunk: Streams the narration piece by piece while it is written
+            deadline_s: How long the narration may take before the fallback is used
             
         Returns:
             Opening narrative text
@@ -94,10 +105,13 @@ class NarratorService:
 
     Style: Dark, atmospheric, cinematic, literary. Think Stephen King meets Agatha Christie."""
 
-            response = self.llm_client.generate_text(
+            response = await self._complete(
+                on_chunk,
                 prompt=prompt,
                 max_tokens=250,
-                temperature=0.8
+                temperature=0.8,
+                priority=Priority.CRITICAL,
+                deadline_s=deadline_s
             )
             
             self._update_game_context("game_start", {
@@ -111,7 +125,16 @@ class NarratorService:
             logger.error(f"Failed to generate opening story: {str(e)}")
             return f"Night falls over the quiet town. {len(player_names)} residents lock their doors, knowing that danger lurks in the shadows. The mafia will strike tonight, but who can be trusted?"
 
-    def generate_death_narrative(self, victim_name: str, killer_role: str, context: Dict[str, Any]) -> str:
+    async def generate_death_narrative(
+        self,
+        victim_name: str,
+        killer_role: str,
+        context: Dict[str, Any],
+        record: bool = True,
+        on_chunk: Optional[ChunkCallback] = None,
+        deadline_s: Optional[float] = None,
+        priority: Priority = Priority.CRITICAL,
+    ) -> str:
         """
         Generate narrative for player death
         
@@ -119,6 +142,11 @@ class NarratorService:
             victim_name: Name of killed player
             killer_role: Role of killer (mafia/vote)
             context: Additional context information
+            record: Whether the death goes into the game context, speculative
+                narratives are recorded with record_death once used
+            on_chunk: Streams the narration piece by piece while it is written
+            deadline_s: How long the narration may take before the fallback is used
+            priority: Scheduler priority, speculative narratives run in the background
             
         Returns:
             Death narrative text
@@ -155,17 +183,17 @@ class NarratorService:
 
     Style: Cinematic, dramatic, immersive, literary. Think noir thriller meets small-town mystery."""
 
-            response = self.llm_client.generate_text(
+            response = await self._complete(
+                on_chunk,
                 prompt=prompt,
                 max_tokens=200,
-                temperature=0.7
+                temperature=0.7,
+                priority=priority,
+                deadline_s=deadline_s
             )
             
-            self._update_game_context("player_death", {
-                "victim": victim_name,
-                "killer_role": killer_role,
-                "day_count": self.game_context.day_count
-            })
+            if record:
+                self.record_death(victim_name, killer_role)
             
             return response.strip()
             
@@ -176,13 +204,18 @@ class NarratorService:
             else:
                 return f"With heavy hearts and trembling hands, the townspeople have spoken. {victim_name} walks toward an uncertain fate, their footsteps echoing through streets that may never see them again."
 
-    def generate_voting_narrative(self, voted_player: str, vote_results: Dict[str, Any]) -> str:
+    async def generate_voting_narrative(
+        self, voted_player: str, vote_results: Dict[str, Any], on_chunk: Optional[ChunkCallback] = None,
+        deadline_s: Optional[float] = None,
+    ) -> str:
         """
         Generate narrative for voting results
         
         Args:
             voted_player: Name of voted out player
             vote_results: Voting statistics
+            on_chunk: Streams the narration piece by piece while it is written
+            deadline_s: How long the narration may take before the fallback is used
             
         Returns:
             Voting narrative text
@@ -216,10 +249,13 @@ class NarratorService:
 
     Style: Tense, emotional, community-focused, literary. Think town hall drama meets psychological thriller."""
 
-            response = self.llm_client.generate_text(
+            response = await self._complete(
+                on_chunk,
                 prompt=prompt,
                 max_tokens=200,
-                temperature=0.7
+                temperature=0.7,
+                priority=Priority.CRITICAL,
+                deadline_s=deadline_s
             )
             
             self._update_game_context("voting_execution", {
@@ -234,13 +270,26 @@ class NarratorService:
             logger.error(f"Failed to generate voting narrative: {str(e)}")
             return f"After intense deliberation, the town has decided. {voted_player} must leave. Was this the right choice?"
 
-    def generate_save_narrative(self, saved_player: str, context: Dict[str, Any]) -> str:
+    async def generate_save_narrative(
+        self,
+        saved_player: str,
+        context: Dict[str, Any],
+        record: bool = True,
+        on_chunk: Optional[ChunkCallback] = None,
+        deadline_s: Optional[float] = None,
+        priority: Priority = Priority.CRITICAL,
+    ) -> str:
         """
         Generate narrative for when someone is saved by medic
 
         Args:
             saved_player: Name of saved player
             context: Additional context information
+            record: Whether the save goes into the game context, speculative
+                narratives are recorded with record_save once used
+            on_chunk: Streams the narration piece by piece while it is written
+            deadline_s: How long the narration may take before the fallback is used
+            priority: Scheduler priority, speculative narratives run in the background
 
         Returns:
             Save narrative text
@@ -269,16 +318,17 @@ class NarratorService:
 
     Style: Mysterious, hopeful, atmospheric. Think divine intervention meets small-town mystery."""
 
-            response = self.llm_client.generate_text(
+            response = await self._complete(
+                on_chunk,
                 prompt=prompt,
                 max_tokens=150,
-                temperature=0.7
+                temperature=0.7,
+                priority=priority,
+                deadline_s=deadline_s
             )
 
-            self._update_game_context("player_saved", {
-                "saved_player": saved_player,
-                "day_count": self.game_context.day_count
-            })
+            if record:
+                self.record_save(saved_player)
 
             return response.strip()
 
@@ -286,13 +336,18 @@ class NarratorService:
             logger.error(f"Failed to generate save narrative: {str(e)}")
             return f"The night passed quietly. {saved_player} was protected by unseen forces."
 
-    def generate_phase_transition(self, from_phase: str, to_phase: str) -> str:
+    async def generate_phase_transition(
+        self, from_phase: str, to_phase: str, on_chunk: Optional[ChunkCallback] = None,
+        deadline_s: Optional[float] = None,
+    ) -> str:
         """
         Generate narrative for phase transitions
         
         Args:
             from_phase: Current phase
             to_phase: Next phase
+            on_chunk: Streams the narration piece by piece while it is written
+            deadline_s: How long the narration may take before the fallback is used
             
         Returns:
             Transition narrative text
@@ -325,10 +380,13 @@ class NarratorService:
 
     Style: Atmospheric, cinematic, brief"""
 
-            response = self.llm_client.generate_text(
+            response = await self._complete(
+                on_chunk,
                 prompt=prompt,
                 max_tokens=80,
-                temperature=0.6
+                temperature=0.6,
+                priority=Priority.FLAVOR,
+                deadline_s=deadline_s
             )
             
             if to_phase == "day":
@@ -352,13 +410,18 @@ class NarratorService:
             }
             return fallbacks.get(transition_type, f"The {to_phase} phase begins...")
 
-    def generate_game_ending(self, winner: str, final_players: List[str]) -> str:
+    async def generate_game_ending(
+        self, winner: str, final_players: List[str], on_chunk: Optional[ChunkCallback] = None,
+        deadline_s: Optional[float] = None,
+    ) -> str:
         """
         Generate ending narrative
         
         Args:
             winner: Winning side (mafia/innocents/draw)
             final_players: List of surviving players
+            on_chunk: Streams the narration piece by piece while it is written
+            deadline_s: How long the narration may take before the fallback is used
             
         Returns:
             Ending narrative text
@@ -400,10 +463,13 @@ class NarratorService:
 
     Style: Epic, conclusive, emotionally resonant"""
 
-            response = self.llm_client.generate_text(
+            response = await self._complete(
+                on_chunk,
                 prompt=prompt,
                 max_tokens=150,
-                temperature=0.7
+                temperature=0.7,
+                priority=Priority.CRITICAL,
+                deadline_s=deadline_s
             )
             
             self._update_game_context("game_end", {
@@ -437,6 +503,31 @@ class NarratorService:
         # TODO: Create appropriate prompt based on type
         pass
 
+    async def _complete(self, on_chunk: Optional[ChunkCallback], **request) -> str:
+        """Run a completion, streamed to `on_chunk` when one is given"""
+        if on_chunk is None:
+            return await self.llm_client.generate_text(**request)
+        parts = []
+        async for chunk in self.llm_client.stream_text(**request):
+            parts.append(chunk)
+            await on_chunk(chunk)
+        return "".join(parts)
+
+    def record_death(self, victim_name: str, killer_role: str) -> None:
+        """Add a death to the game context"""
+        self._update_game_context("player_death", {
+            "victim": victim_name,
+            "killer_role": killer_role,
+            "day_count": self.game_context.day_count
+        })
+
+    def record_save(self, saved_player: str) -> None:
+        """Add a medic's save to the game context"""
+        self._update_game_context("player_saved", {
+            "saved_player": saved_player,
+            "day_count": self.game_context.day_count
+        })
+
     def _get_character_context(self, player_name: str) -> Optional[CharacterProfile]:
         """
         Get character profile for player
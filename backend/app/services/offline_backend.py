@@ -0,0 +1,149 @@
+import json
+import random
+import re
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from .llm_backend import LLMBackend
+from .llm_scheduler import Priority
+
+# what the Markov chain learns to write like
+CORPUS = [
+    "The fog rolled in from the river and settled over the rooftops like a held breath.",
+    "Somewhere a shutter banged in the wind and nobody dared to look outside.",
+    "The church bell rang once and the silence that followed felt heavier than before.",
+    "Lanterns flickered in the windows as the town pretended to sleep.",
+    "Footsteps echoed on the cobblestones long after the streets were empty.",
+    "The town square held its breath as the residents traded suspicious glances.",
+    "Whispers drifted from house to house and every door stayed locked.",
+    "The wind carried the smell of rain and something older than fear.",
+    "Nobody in the town trusted the silence that settled over the square.",
+    "The old clock above the bakery stopped as the last light faded.",
+    "Behind drawn curtains the residents counted the hours until dawn.",
+    "The shadows stretched across the square and the town held its breath.",
+    "Every creak of the floorboards sounded like a secret being kept.",
+    "The residents gathered in the square with tired eyes and sharp tongues.",
+    "Dawn came grey and slow over the rooftops of the wary town.",
+]
+
+# first sentence of a narration about someone, by the prompt line naming them
+SUBJECT_TEMPLATES = {
+    "Victim": [
+        "{name} was found at first light, and the town has not spoken since.",
+        "The town woke to the news that {name} would never open their door again.",
+    ],
+    "Saved player": [
+        "Something stood between {name} and the dark last night.",
+        "{name} woke to a quiet morning, unaware of how close the shadows came.",
+    ],
+    "Voted player": [
+        "The town has spoken, and {name} must leave.",
+        "With trembling hands the residents pointed at {name}.",
+    ],
+}
+
+TRAITS = [
+    "hums old songs nobody else remembers",
+    "never forgets a face or a debt",
+    "keeps a notebook no one has ever seen opened",
+    "laughs a little too loudly at funerals",
+    "walks the streets long after midnight",
+    "collects keys without saying what they open",
+]
+
+RUMOURS = [
+    "Some say they arrived in town the same night the mill burned down.",
+    "Neighbours swear a light burns in their window until dawn.",
+    "Nobody knows where they were the winter the old mayor vanished.",
+    "They receive letters with no return address every week.",
+    "The children in town give their house a wide berth.",
+    "They once knew a secret that ruined a family, and kept it.",
+]
+
+State = Tuple[str, ...]
+
+
+class OfflineBackend(LLMBackend):
+    """Writes narrations in-process from templates and a small Markov chain.
+
+    No network and no model, a completion takes microseconds, so rooms can be
+    load-tested or run offline at full speed. It reads what it needs from the
+    prompts NarratorService and CharacterGenerator write: how many sentences
+    are asked for, who a narration is about, and which characters a profile
+    batch wants as JSON. Seeded, it writes the same text every run.
+    """
+
+    def __init__(self, seed: Optional[int] = None, corpus: List[str] = CORPUS, order: int = 2):
+        self.rng = random.Random(seed)
+        self.order = order
+        self.starts: List[State] = []
+        self.chain: Dict[State, List[str]] = defaultdict(list)
+        for sentence in corpus:
+            words = sentence.split()
+            self.starts.append(tuple(words[:order]))
+            for i in range(len(words) - order):
+                self.chain[tuple(words[i:i + order])].append(words[i + order])
+
+    async def generate_text(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        priority: Priority = Priority.FLAVOR,
+        deadline_s: Optional[float] = None,
+    ) -> str:
+        if "Characters:" in prompt and "JSON array" in prompt:
+            return self._profiles(prompt)
+        profile = re.search(r"- Name: (.+)\n\s*- Profession: (.+)\n", prompt)
+        if profile:
+            return self._describe(profile.group(1).strip(), profile.group(2).strip())
+        return self._narrate(prompt)
+
+    async def stream_text(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        priority: Priority = Priority.FLAVOR,
+        deadline_s: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        text = await self.generate_text(prompt, max_tokens, temperature, priority, deadline_s)
+        # word by word, the way a model streams
+        for piece in re.findall(r"\S+\s*", text):
+            yield piece
+
+    def _narrate(self, prompt: str) -> str:
+        count = re.search(r"(\d+)(?:-(\d+))? sentences", prompt)
+        low, high = (int(count.group(1)), int(count.group(2) or count.group(1))) if count else (2, 3)
+        sentences = []
+        subject = re.search(r"^\s*(Victim|Saved player|Voted player): ([^(\n]+)", prompt, re.MULTILINE)
+        if subject:
+            template = self.rng.choice(SUBJECT_TEMPLATES[subject.group(1)])
+            sentences.append(template.format(name=subject.group(2).strip()))
+        target = self.rng.randint(low, high)
+        while len(sentences) < target:
+            sentences.append(self._sentence())
+        return " ".join(sentences)
+
+    def _sentence(self, max_words: int = 30) -> str:
+        state = self.rng.choice(self.starts)
+        words = list(state)
+        while len(words) < max_words and not words[-1].endswith("."):
+            followers = self.chain.get(state)
+            if not followers:
+                break
+            words.append(self.rng.choice(followers))
+            state = tuple(words[-self.order:])
+        sentence = " ".join(words)
+        return sentence if sentence.endswith(".") else sentence + "."
+
+    def _describe(self, name: str, profession: str) -> str:
+        return f"{name} is the town's {profession.lower()} and {self.rng.choice(TRAITS)}. {self.rng.choice(RUMOURS)}"
+
+    def _profiles(self, prompt: str) -> str:
+        start = prompt.index("[", prompt.index("Characters:"))
+        characters, _ = json.JSONDecoder().raw_decode(prompt, start)
+        return json.dumps([
+            {**character, "description": self._describe(character["name"], character["profession"])}
+            for character in characters
+        ])
@@ -0,0 +1,59 @@
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.domain.clock import VirtualClock
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.game_state import Phase
+from app.services.offline_backend import OfflineBackend
+from schemas.game import PlayerJoin, PlayerJoinPayload
+
+
+class NullPlayer(PlayerAdapter):
+    async def receive_event(self, event):
+        pass
+
+
+async def simulate(players: int, days: int, seed: int) -> float:
+    """Run a room with idle players through `days` night/day/voting rounds, return the game time covered
+
+    Narrations and profiles are written by the offline backend, so the whole
+    narrator path runs without waiting on a model.
+    """
+    clock = VirtualClock()
+    gm = GameManager(clock=clock, llm_backend=OfflineBackend(seed))
+    for i in range(players):
+        await gm.receive_event(
+            PlayerJoin(type="player.join", payload=PlayerJoinPayload(player_id=f"p{i}", name=f"Player {i}")),
+            NullPlayer(),
+        )
+
+    nights = 0
+    was_night = False
+    while nights < days:
+        await clock.advance(1)
+        is_night = not gm.lobby and gm.game_state.phase == Phase.NIGHT
+        nights += is_night and not was_night
+        was_night = is_night
+    return clock.monotonic()
+
+
+async def bench(games: int = 20, players: int = 8, days: int = 5):
+    random.seed(0)
+    start = time.perf_counter()
+    game_time = 0.0
+    for game in range(games):
+        game_time += await simulate(players, days, seed=game)
+    elapsed = time.perf_counter() - start
+    print(f"{games} games, {players} players, {days} days each")
+    print(f"{elapsed:.2f}s wall for {game_time / 60:.0f} minutes of game time ({game_time / elapsed:,.0f}x real time)")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench())
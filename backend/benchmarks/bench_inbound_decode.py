@@ -0,0 +1,93 @@
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from pydantic import ValidationError
+
+from schemas.game import (
+    GameStateAck,
+    GameStateRequest,
+    NarratorFinished,
+    NightAction,
+    OpeningStoryRequest,
+    PlayerJoin,
+    PlayerLeave,
+    SendMessage,
+    Vote,
+    inbound_event_adapter,
+)
+
+UUID_A = "0b6a3c5e-1f0e-4c43-9d59-3e2f3c1a9b11"
+UUID_B = "6f1d2a7b-8c3e-4b5a-a1f2-7d9e0c4b3a22"
+
+FRAMES = {
+    "player.join": {"type": "player.join", "payload": {"player_id": UUID_A, "name": "Alice"}},
+    "player.leave": {"type": "player.leave", "payload": {"player_id": UUID_A}},
+    "action.night": {"type": "action.night", "payload": {"actor_id": UUID_A, "action": "kill", "target_id": UUID_B}},
+    "action.vote": {"type": "action.vote", "payload": {"actor_id": UUID_A, "target_id": UUID_B}},
+    "message.send": {"type": "message.send", "payload": {"actor_id": UUID_A, "timestamp": 1750000000.0, "text": "I think it was Bob"}},
+    "game.sync_request": {"type": "game.sync_request", "player_id": UUID_A},
+    "game.state_ack": {"type": "game.state_ack", "payload": {"player_id": UUID_A, "version": 42}},
+    "opening.story_request": {"type": "opening.story_request"},
+    "narrator.finished": {"type": "narrator.finished", "payload": {"player_id": UUID_A}},
+    "unknown type": {"type": "game.state", "payload": {}},
+    "invalid payload": {"type": "action.vote", "payload": {"actor_id": UUID_A}},
+}
+
+
+def legacy_decode(raw: str):
+    """The former websocket_endpoint path: dict first, then dispatch on msg["type"]"""
+    msg = json.loads(raw)
+    match msg["type"]:
+        case "player.join":
+            return PlayerJoin.model_validate(msg)
+        case "player.leave":
+            return PlayerLeave.model_validate(msg)
+        case "action.night":
+            return NightAction.model_validate(msg)
+        case "action.vote":
+            return Vote.model_validate(msg)
+        case "message.send":
+            return SendMessage.model_validate(msg)
+        case "game.sync_request":
+            return GameStateRequest.model_validate(msg)
+        case "game.state_ack":
+            return GameStateAck.model_validate(msg)
+        case "opening.story_request":
+            return OpeningStoryRequest.model_validate(msg)
+        case "narrator.finished":
+            return NarratorFinished.model_validate(msg)
+        case _:
+            raise ValueError("Unknown event type")
+
+
+def adapter_decode(raw: str):
+    return inbound_event_adapter.validate_json(raw)
+
+
+def timed(decode, raw: str, number: int) -> float:
+    def run():
+        try:
+            decode(raw)
+        except (ValueError, ValidationError):
+            pass
+    return timeit.timeit(run, number=number) / number * 1e6
+
+
+def bench(number: int = 20000):
+    print(f"{'frame':<24}{'before µs':>11}{'after µs':>10}{'speedup':>9}")
+    print("-" * 54)
+    for name, frame in FRAMES.items():
+        raw = json.dumps(frame)
+        before = timed(legacy_decode, raw, number)
+        after = timed(adapter_decode, raw, number)
+        print(f"{name:<24}{before:>11.2f}{after:>10.2f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench")
+
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.game_state import Phase, Role
+from app.domain.scheduler import DeadlineScheduler
+from schemas.game import (
+    GameStateRequest,
+    MessagePayload,
+    SendMessage,
+    Vote,
+    VotePayload,
+)
+
+
+class NullPlayer(PlayerAdapter):
+    async def receive_event(self, event):
+        pass
+
+
+def make_room(players: int) -> GameManager:
+    gm = GameManager(scheduler=DeadlineScheduler(), sync_interval_s=3600)
+    for i in range(players):
+        gm.add_player(f"p{i}", f"Player {i}", NullPlayer())
+    gm.lobby = False
+    gm.game_state.phase = Phase.DAY
+    gm.game_state.players["p0"]["role"] = Role.MAFIA
+    return gm
+
+
+async def timed(gm: GameManager, name: str, apply, number: int):
+    """Time the state transition alone, the queued events are dropped instead of dispatched"""
+    start = time.perf_counter()
+    frames = 0
+    for i in range(number):
+        result = apply(i)
+        if asyncio.iscoroutine(result):
+            await result
+        frames += len(gm._outbox)
+        gm._outbox.clear()
+    elapsed = (time.perf_counter() - start) / number * 1e6
+    print(f"{name:<28}{elapsed:>10.2f}{frames / number:>10.1f}")
+
+
+async def bench(players: int = 12, number: int = 2000):
+    gm = make_room(players)
+    player = gm.players["p1"]
+    print(f"{players} players")
+    print(f"{'command':<28}{'µs':>10}{'frames':>10}")
+    print("-" * 48)
+
+    await timed(gm, "message.send", lambda i: gm._apply_event(
+        SendMessage(type="message.send", payload=MessagePayload(actor_id="p1", timestamp=float(i), text="It was Bob")),
+        player,
+    ), number)
+
+    gm.game_state.phase = Phase.VOTING
+    await timed(gm, "action.vote", lambda i: gm._apply_event(
+        Vote(type="action.vote", payload=VotePayload(actor_id="p1", target_id=f"p{i % players}")), player
+    ), number)
+
+    await timed(gm, "game.sync_request", lambda i: gm._apply_event(
+        GameStateRequest(type="game.sync_request", player_id="p1"), player
+    ), number)
+
+    def changed_sync(i):
+        gm.cast_votes["p1"] = f"p{i % players}"
+        gm._mark_dirty("votes")
+        gm._sync_game_state()
+    await timed(gm, "sync (votes changed)", changed_sync, number)
+    await timed(gm, "sync (clean)", lambda i: gm._sync_game_state(), number)
+
+
+if __name__ == "__main__":
+    asyncio.run(bench())
@@ -0,0 +1,114 @@
+import sys
+import timeit
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from schemas.game import (
+    ActionAck, ActionAckPayload, CharacterProfile, CharacterProfilePayload,
+    EveningNews, EveningNewsPayload, GameLog, GameLogEntry, GameLogPayload, GameLogRequest,
+    GameLogRequestPayload, GameStateAck, GameStateAckPayload,
+    GameStatePatch, GameStatePatchPayload, GameStateRequest, GameStateSync,
+    HeartbeatPayload, HeartbeatPing, HeartbeatPong,
+    GameStateSyncPayload, MessagePayload, MessageReceived, MorningNews, MorningNewsPayload,
+    NarratorChunk, NarratorChunkPayload, NarratorFinished, NarratorFinishedPayload,
+    NarratorMessage, NarratorMessagePayload,
+    NightAction, NightActionPayload, OpeningStoryRequest, PhaseChange, PhaseChangePayload,
+    PlayerJoin, PlayerJoinPayload, PlayerJoined, PlayerJoinedPayload, PlayerLeave,
+    PlayerLeavePayload, PlayerLeft, PlayerLeftPayload, PlayerState, PlayerUuid,
+    PlayerUuidPayload, ProfilesComplete, ProfilesCompletePayload, ProfilesStart,
+    ProfilesStartPayload, SendMessage, SessionResumed, SessionResumedPayload, Vote,
+    VoteCast, VoteCastPayload, VotePayload,
+)
+from schemas.wire import CODECS, event_models
+
+UUID_A = "0b6a3c5e-1f0e-4c43-9d59-3e2f3c1a9b11"
+UUID_B = "6f1d2a7b-8c3e-4b5a-a1f2-7d9e0c4b3a22"
+STORY = ("As dawn broke over the town square, the baker was discovered motionless, "
+         "their secrets forever silenced by the shadows that prowl these streets.")
+
+
+def sample_events():
+    players = [
+        PlayerState(player_id=f"{UUID_A[:-2]}{i:02d}", name=f"Player {i}", alive=i % 3 != 0,
+                    role_revealed="innocent")
+        for i in range(10)
+    ]
+    logs = [GameLogEntry(timestamp=1750000000.0 + i, event="player.joined",
+                         details={"player_id": UUID_A}) for i in range(20)]
+    return [
+        PlayerUuid(type="player.uuid", payload=PlayerUuidPayload(uuid=UUID_A, resume_token="ytm01rvs7Xd2EtWD8t0LJiuGlcFuVhov")),
+        SessionResumed(type="session.resumed", payload=SessionResumedPayload(uuid=UUID_A, seq=120, replayed=4, complete=True)),
+        HeartbeatPing(type="heartbeat.ping", payload=HeartbeatPayload(timestamp=1750000000.0)),
+        HeartbeatPong(type="heartbeat.pong", payload=HeartbeatPayload(timestamp=1750000000.0)),
+        PlayerJoin(type="player.join", payload=PlayerJoinPayload(player_id=UUID_A, name="Alice")),
+        PlayerLeave(type="player.leave", payload=PlayerLeavePayload(player_id=UUID_A)),
+        PlayerJoined(type="player.joined", payload=PlayerJoinedPayload(player_id=UUID_A, name="Alice")),
+        PlayerLeft(type="player.left", payload=PlayerLeftPayload(player_id=UUID_A)),
+        NightAction(type="action.night", payload=NightActionPayload(actor_id=UUID_A, action="kill", target_id=UUID_B)),
+        Vote(type="action.vote", payload=VotePayload(actor_id=UUID_A, target_id=UUID_B)),
+        ActionAck(type="action.ack", payload=ActionAckPayload(success=True, message="Successfully cast vote")),
+        MorningNews(type="action.morning_news", payload=MorningNewsPayload(target_id=UUID_B)),
+        EveningNews(type="action.evening_news", payload=EveningNewsPayload(target_id=UUID_B)),
+        VoteCast(type="action.vote_cast", payload=VoteCastPayload(actor_id=UUID_A, target_id=UUID_B)),
+        PhaseChange(type="phase.change", payload=PhaseChangePayload(phase="night", ends_at=1750000035.5)),
+        SendMessage(type="message.send", payload=MessagePayload(actor_id=UUID_A, timestamp=1750000000.0, text="I think it was Bob")),
+        MessageReceived(type="message.received", payload=MessagePayload(actor_id=UUID_A, timestamp=1750000000.0, text="I think it was Bob")),
+        NarratorMessage(type="narrator.message", payload=NarratorMessagePayload(text=STORY, timestamp=1750000000.0, duration=9.4, stream_id=3)),
+        NarratorChunk(type="narrator.chunk", payload=NarratorChunkPayload(stream_id=3, index=0, text="As dawn broke over")),
+        NarratorFinished(type="narrator.finished", payload=NarratorFinishedPayload(player_id=UUID_A)),
+        OpeningStoryRequest(type="opening.story_request"),
+        GameStateSync(type="game.state", payload=GameStateSyncPayload(
+            version=42, players=players, phase="day", phase_ends_at=1750000075.0,
+            votes={UUID_A: UUID_B})),
+        GameStatePatch(type="game.state_patch", payload=GameStatePatchPayload(
+            version=43, base_version=42, players=players[:1], votes={UUID_A: None},
+            fields={"phase_ends_at": 1750000080.0})),
+        GameStateRequest(type="game.sync_request", player_id=UUID_A),
+        GameLog(type="game.log", payload=GameLogPayload(offset=80, entries=logs, first_offset=0, next_offset=100)),
+        GameLogRequest(type="game.log_request", payload=GameLogRequestPayload(player_id=UUID_A, before=80, limit=20)),
+        GameStateAck(type="game.state_ack", payload=GameStateAckPayload(player_id=UUID_A, version=42)),
+        CharacterProfile(type="character.profile", payload=CharacterProfilePayload(
+            player_id=UUID_A, name="Alice", profession="Baker", description=STORY, emoji="🍞",
+            current_index=1, total_count=10)),
+        ProfilesStart(type="character.profiles_start", payload=ProfilesStartPayload(total_count=10)),
+        ProfilesComplete(type="character.profiles_complete", payload=ProfilesCompletePayload()),
+    ]
+
+
+def bench(number: int = 2000):
+    models = event_models()
+    events = sample_events()
+    missing = set(models) - {e.type for e in events}
+    if missing:
+        print(f"⚠️ No sample for: {', '.join(sorted(missing))}")
+
+    header = f"{'event':<28}" + "".join(
+        f"{codec.name + ' B':>12}{'enc µs':>9}{'dec µs':>9}" for codec in CODECS.values()
+    )
+    print(header)
+    print("-" * len(header))
+    totals = {codec.name: [0, 0.0, 0.0] for codec in CODECS.values()}
+    for event in events:
+        model = models[event.type]
+        row = f"{event.type:<28}"
+        for codec in CODECS.values():
+            data = codec.encode(event)
+            assert model.model_validate(codec.decode(data)) == event, f"{codec.name} round trip failed for {event.type}"
+            encode_us = timeit.timeit(lambda: codec.encode(event), number=number) / number * 1e6
+            decode_us = timeit.timeit(lambda: model.model_validate(codec.decode(data)), number=number) / number * 1e6
+            size = len(data.encode() if isinstance(data, str) else data)
+            total = totals[codec.name]
+            total[0] += size
+            total[1] += encode_us
+            total[2] += decode_us
+            row += f"{size:>12}{encode_us:>9.2f}{decode_us:>9.2f}"
+        print(row)
+    print("-" * len(header))
+    print(f"{'total':<28}" + "".join(f"{s:>12}{e:>9.2f}{d:>9.2f}" for s, e, d in totals.values()))
+
+
+if __name__ == "__main__":
+    bench()
@@ -1,5 +1,5 @@
-from typing import Any, Dict, List, Literal, Optional
-from pydantic import Field
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+from pydantic import Field, TypeAdapter
 
 from fastapi_camelcase import CamelModel
 
@@ -7,6 +7,16 @@ from fastapi_camelcase import CamelModel
 class GameEvent(CamelModel):
     pass
 
+class PlayerUuidPayload(CamelModel):
+    uuid: str = Field(..., description="UUID assigned to this connection")
+    resume_token: Optional[str] = Field(None, description="Secret to resume this session after a reconnect")
+
+
+class PlayerUuid(GameEvent):
+    type: Literal["player.uuid"]
+    payload: PlayerUuidPayload
+
+
 class PlayerJoinPayload(CamelModel):
     player_id: str = Field(..., description="UUID of the joining player")
     name: str = Field(..., description="Display name")
@@ -139,6 +149,9 @@ class NarratorMessagePayload(CamelModel):
         ..., description="When this message was sent (Unix timestamp)"
     )
     duration: float = Field(..., description="Total animation duration in seconds")
+    stream_id: Optional[int] = Field(
+        None, description="Narration whose streamed chunks this final text replaces"
+    )
 
 
 class NarratorMessage(GameEvent):
@@ -146,6 +159,17 @@ class NarratorMessage(GameEvent):
     payload: NarratorMessagePayload
 
 
+class NarratorChunkPayload(CamelModel):
+    stream_id: int = Field(..., description="Narration the chunk belongs to")
+    index: int = Field(..., description="Position of the chunk in its narration, from 0")
+    text: str = Field(..., description="Text to append to the narration")
+
+
+class NarratorChunk(GameEvent):
+    type: Literal["narrator.chunk"]
+    payload: NarratorChunkPayload
+
+
 class NarratorFinishedPayload(CamelModel):
     player_id: str = Field(..., description="UUID of the player reporting narrator finished")
 
@@ -175,6 +199,7 @@ class GameLogEntry(CamelModel):
 
 
 class GameStateSyncPayload(CamelModel):
+    version: int = Field(0, description="Room state version this snapshot corresponds to")
     players: List[PlayerState]
     phase: Literal["lobby", "character_intro", "day", "night", "voting", "ended"] = Field(
         ..., description="Current game phase"
@@ -188,7 +213,8 @@ class GameStateSyncPayload(CamelModel):
         None, description="Who won the game (if it ended)"
     )
     logs: List[GameLogEntry] = Field(
-        ..., description="Past game events, chronologically"
+        default_factory=list,
+        description="Always empty, game log entries are read with game.log_request",
     )
 
 
@@ -197,11 +223,98 @@ class GameStateSync(GameEvent):
     payload: GameStateSyncPayload
 
 
+class GameStatePatchPayload(CamelModel):
+    version: int = Field(..., description="Room state version after applying this patch")
+    base_version: int = Field(..., description="Acknowledged state version this patch applies to")
+    players: List[PlayerState] = Field(
+        default_factory=list, description="Player rows that were added or changed"
+    )
+    removed_players: List[str] = Field(
+        default_factory=list, description="UUIDs of players no longer in the game"
+    )
+    votes: Dict[str, Optional[str]] = Field(
+        default_factory=dict, description="Changed votes, null means the vote was withdrawn"
+    )
+    fields: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Changed scalar fields of game.state (phase, phase_ends_at, narrator_active, winner)",
+    )
+
+
+class GameStatePatch(GameEvent):
+    type: Literal["game.state_patch"]
+    payload: GameStatePatchPayload
+
+
 class GameStateRequest(GameEvent):
     type: Literal["game.sync_request"]
     player_id: str
 
 
+class GameLogPayload(CamelModel):
+    offset: int = Field(..., description="Log offset of the first entry in this batch")
+    entries: List[GameLogEntry] = Field(..., description="Consecutive game log entries, chronologically")
+    first_offset: int = Field(..., description="Offset of the oldest entry the server still retains")
+    next_offset: int = Field(..., description="Offset the next appended entry will get")
+
+
+class GameLog(GameEvent):
+    type: Literal["game.log"]
+    payload: GameLogPayload
+
+
+class GameLogRequestPayload(CamelModel):
+    player_id: str = Field(..., description="UUID of the requesting player")
+    before: Optional[int] = Field(
+        None, description="Return entries preceding this offset, the newest ones when omitted"
+    )
+    after: Optional[int] = Field(
+        None, description="Return entries from this offset on, the next_offset of the last batch read"
+    )
+    limit: int = Field(50, ge=1, le=200, description="Maximum number of entries to return")
+
+
+class GameLogRequest(GameEvent):
+    type: Literal["game.log_request"]
+    payload: GameLogRequestPayload
+
+
+class GameStateAckPayload(CamelModel):
+    player_id: str = Field(..., description="UUID of the acknowledging player")
+    version: int = Field(..., description="Last game.state version applied by the client")
+
+
+class GameStateAck(GameEvent):
+    type: Literal["game.state_ack"]
+    payload: GameStateAckPayload
+
+
+class HeartbeatPayload(CamelModel):
+    timestamp: float = Field(..., description="Server time the ping was sent, echoed back by the pong")
+
+
+class HeartbeatPing(GameEvent):
+    type: Literal["heartbeat.ping"]
+    payload: HeartbeatPayload
+
+
+class HeartbeatPong(GameEvent):
+    type: Literal["heartbeat.pong"]
+    payload: HeartbeatPayload
+
+
+class SessionResumedPayload(CamelModel):
+    uuid: str = Field(..., description="UUID of the resumed session")
+    seq: int = Field(..., description="Sequence number to count on from, the next sequenced frame is seq + 1")
+    replayed: int = Field(..., description="Number of missed frames replayed right after this one")
+    complete: bool = Field(..., description="False when missed frames were no longer buffered, a full state sync follows instead")
+
+
+class SessionResumed(GameEvent):
+    type: Literal["session.resumed"]
+    payload: SessionResumedPayload
+
+
 class CharacterProfilePayload(CamelModel):
     player_id: str = Field(..., description="UUID of the player")
     name: str = Field(..., description="Display name of the player")
@@ -231,4 +344,26 @@ class ProfilesCompletePayload(CamelModel):
 
 class ProfilesComplete(GameEvent):
     type: Literal["character.profiles_complete"]
-    payload: ProfilesCompletePayload
\ No newline at end of file
+    payload: ProfilesCompletePayload
+
+
+InboundEvent = Annotated[
+    Union[
+        PlayerJoin,
+        PlayerLeave,
+        NightAction,
+        Vote,
+        SendMessage,
+        GameStateRequest,
+        GameStateAck,
+        GameLogRequest,
+        OpeningStoryRequest,
+        NarratorFinished,
+        HeartbeatPong,
+    ],
+    Field(discriminator="type"),
+]
+
+# Built once: validates raw frames straight into the matching event model,
+# rejecting unknown types by the discriminator without trying each model
+inbound_event_adapter: TypeAdapter[InboundEvent] = TypeAdapter(InboundEvent)
@@ -0,0 +1,245 @@
+"""Wire encodings of game events, negotiated per connection via Sec-WebSocket-Protocol"""
+from functools import lru_cache
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from schemas.game import GameEvent, inbound_event_adapter
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, only needed for the binary protocol
+    msgpack = None
+
+
+JSON_SUBPROTOCOL = "mafia.json.v1"
+MSGPACK_SUBPROTOCOL = "mafia.msgpack.v1"
+
+# Integer tags replacing event type strings in binary frames. Never reuse a tag.
+EVENT_TAGS: Dict[str, int] = {
+    "player.uuid": 1,
+    "player.join": 2,
+    "player.leave": 3,
+    "player.joined": 4,
+    "player.left": 5,
+    "action.night": 6,
+    "action.vote": 7,
+    "action.ack": 8,
+    "action.morning_news": 9,
+    "action.evening_news": 10,
+    "action.vote_cast": 11,
+    "phase.change": 12,
+    "message.send": 13,
+    "message.received": 14,
+    "narrator.message": 15,
+    "narrator.finished": 16,
+    "opening.story_request": 17,
+    "game.state": 18,
+    "game.state_patch": 19,
+    "game.sync_request": 20,
+    "game.state_ack": 21,
+    "character.profile": 22,
+    "character.profiles_start": 23,
+    "character.profiles_complete": 24,
+    "game.log": 25,
+    "game.log_request": 26,
+    "session.resumed": 27,
+    "heartbeat.ping": 28,
+    "heartbeat.pong": 29,
+    "narrator.chunk": 30,
+}
+EVENT_TYPES_BY_TAG = {tag: event_type for event_type, tag in EVENT_TAGS.items()}
+
+# Short keys for model fields in binary frames. Keys of free-form dicts (votes,
+# log details) are player ids or arbitrary data and are never shortened.
+FIELD_KEYS: Dict[str, str] = {
+    "action": "a",
+    "actor_id": "ai",
+    "after": "af",
+    "alive": "al",
+    "base_version": "bv",
+    "before": "b",
+    "complete": "c",
+    "current_index": "ci",
+    "description": "ds",
+    "details": "dt",
+    "duration": "du",
+    "emoji": "em",
+    "ends_at": "ea",
+    "entries": "en",
+    "event": "ev",
+    "fields": "f",
+    "first_offset": "fo",
+    "index": "ix",
+    "limit": "li",
+    "logs": "l",
+    "message": "m",
+    "name": "n",
+    "narrator_active": "na",
+    "next_offset": "no",
+    "offset": "o",
+    "payload": "pl",
+    "phase": "ph",
+    "phase_ends_at": "pe",
+    "player_id": "p",
+    "players": "ps",
+    "profession": "pr",
+    "removed_players": "rp",
+    "replayed": "rc",
+    "resume_token": "rt",
+    "role_revealed": "r",
+    "seq": "sq",
+    "stream_id": "si",
+    "success": "s",
+    "target_id": "ti",
+    "text": "tx",
+    "timestamp": "ts",
+    "total_count": "tc",
+    "uuid": "u",
+    "version": "v",
+    "votes": "vo",
+    "winner": "w",
+}
+
+
+def event_models() -> Dict[str, Type[GameEvent]]:
+    """Maps every event type string to its model"""
+    models = {}
+    pending = list(GameEvent.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending.extend(model.__subclasses__())
+        type_field = model.model_fields.get("type")
+        if type_field is not None:
+            for event_type in get_args(type_field.annotation):
+                models[event_type] = model
+    return models
+
+
+def _nested_model(annotation) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Model class held by a field annotation and whether it's a list of them"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, True
+    if origin is Union:
+        for arg in get_args(annotation):
+            model, is_list = _nested_model(arg)
+            if model is not None:
+                return model, is_list
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _field_plan(model: Type[BaseModel]):
+    plan = []
+    for name, field in model.model_fields.items():
+        if name == "type" and issubclass(model, GameEvent):
+            continue
+        nested, is_list = _nested_model(field.annotation)
+        plan.append((name, FIELD_KEYS.get(name, name), nested, is_list))
+    return tuple(plan)
+
+
+def _shorten(model: Type[BaseModel], data: Dict[str, Any]) -> Dict[str, Any]:
+    compact = {}
+    for name, short, nested, is_list in _field_plan(model):
+        if name not in data:
+            continue
+        value = data[name]
+        if nested is not None and value is not None:
+            value = [_shorten(nested, v) for v in value] if is_list else _shorten(nested, value)
+        compact[short] = value
+    return compact
+
+
+def _expand(model: Type[BaseModel], compact: Dict[str, Any]) -> Dict[str, Any]:
+    data = {}
+    for name, short, nested, is_list in _field_plan(model):
+        if short not in compact:
+            continue
+        value = compact[short]
+        if nested is not None and value is not None:
+            value = [_expand(nested, v) for v in value] if is_list else _expand(nested, value)
+        data[name] = value
+    return data
+
+
+class JsonCodec:
+    """Default text protocol: the JSON produced by model_dump_json"""
+
+    name = "json"
+    subprotocol = JSON_SUBPROTOCOL
+    binary = False
+
+    def encode(self, event: GameEvent) -> str:
+        return event.model_dump_json()
+
+    def decode(self, data: Union[str, bytes]) -> Dict[str, Any]:
+        msg = json.loads(data)
+        if not isinstance(msg, dict):
+            raise ValueError("Frame is not an object")
+        return msg
+
+    def decode_event(self, data: Union[str, bytes]) -> GameEvent:
+        """Validate an inbound frame into its event model in a single pass over the raw JSON"""
+        return inbound_event_adapter.validate_json(data)
+
+
+class MsgpackCodec:
+    """Compact binary protocol: MessagePack `[tag, fields]` with short field keys"""
+
+    name = "msgpack"
+    subprotocol = MSGPACK_SUBPROTOCOL
+    binary = True
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        self._models = event_models()
+
+    def encode(self, event: GameEvent) -> bytes:
+        data = event.model_dump(mode="json")
+        return msgpack.packb(
+            [EVENT_TAGS[event.type], _shorten(type(event), data)], use_bin_type=True
+        )
+
+    def decode(self, data: Union[str, bytes]) -> Dict[str, Any]:
+        if isinstance(data, str):
+            raise ValueError("Expected a binary frame")
+        try:
+            frame = msgpack.unpackb(data, raw=False)
+            tag, compact = frame
+            event_type = EVENT_TYPES_BY_TAG[tag]
+        except (ValueError, TypeError, KeyError, msgpack.UnpackException) as e:
+            raise ValueError(f"Malformed binary frame: {e}")
+        if not isinstance(compact, dict):
+            raise ValueError("Malformed binary frame: fields are not a map")
+
+        msg = _expand(self._models[event_type], compact)
+        msg["type"] = event_type
+        return msg
+
+    def decode_event(self, data: Union[str, bytes]) -> GameEvent:
+        return inbound_event_adapter.validate_python(self.decode(data))
+
+
+JSON_CODEC = JsonCodec()
+CODECS = {JSON_SUBPROTOCOL: JSON_CODEC}
+if msgpack is not None:
+    CODECS[MSGPACK_SUBPROTOCOL] = MsgpackCodec()
+
+
+def negotiate(requested: Sequence[str]):
+    """Pick the first requested subprotocol we support, JSON when none is.
+
+    Returns the codec and the subprotocol to accept the connection with.
+    """
+    for subprotocol in requested:
+        codec = CODECS.get(subprotocol)
+        if codec is not None:
+            return codec, subprotocol
+    return JSON_CODEC, None
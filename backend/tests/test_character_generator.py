@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -29,7 +30,7 @@ def test_character_generator():
         print(f"\n🎭 Generating profiles for {len(test_players)} players...")
         
         # 3. Generuj profile
-        profiles = generator.generate_profiles_for_players(test_players)
+        profiles = asyncio.run(generator.generate_profiles_for_players(test_players))
         
         print(f"✅ Generated {len(profiles)} profiles:")
         
@@ -42,7 +43,7 @@ def test_character_generator():
         
         # 5. Test pojedynczego profilu
         print(f"\n🔍 Testing single profile generation...")
-        single_profile = generator.generate_single_profile("test-uuid", "TestPlayer", "Baker")
+        single_profile = asyncio.run(generator.generate_single_profile("test-uuid", "TestPlayer", "Baker"))
         print(f"✅ Single profile: {single_profile.name} - {single_profile.description}")
         
         # 6. Test metod pomocniczych
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -33,7 +34,7 @@ def test_complete_system():
         
         # 3. Generowanie profili (jak w prawdziwej grze)
         print(f"\n🎭 Generating character profiles...")
-        profiles = char_generator.generate_profiles_for_players(players)
+        profiles = asyncio.run(char_generator.generate_profiles_for_players(players))
         
         print(f"✅ Generated profiles:")
         for profile in profiles:
@@ -48,32 +49,32 @@ def test_complete_system():
         
         # Opening
         player_names = [p["name"] for p in players]
-        opening = narrator.generate_story_opening(player_names)
+        opening = asyncio.run(narrator.generate_story_opening(player_names))
         print(f"\n🌅 GAME START:")
         print(f"   {opening}")
         
         # Night -> Day transition
-        transition1 = narrator.generate_phase_transition("night", "day")
+        transition1 = asyncio.run(narrator.generate_phase_transition("night", "day"))
         print(f"\n🌅 DAWN:")
         print(f"   {transition1}")
         
         # Death discovery
-        death = narrator.generate_death_narrative("Alice", "mafia", {})
+        death = asyncio.run(narrator.generate_death_narrative("Alice", "mafia", {}))
         print(f"\n⚰️ MORNING NEWS:")
         print(f"   {death}")
         
         # Day -> Voting transition
-        transition2 = narrator.generate_phase_transition("day", "voting")
+        transition2 = asyncio.run(narrator.generate_phase_transition("day", "voting"))
         print(f"\n🗳️ VOTING TIME:")
         print(f"   {transition2}")
         
         # Voting result
-        vote_result = narrator.generate_voting_narrative("Bob", {"total_votes": 3, "margin": "unanimous"})
+        vote_result = asyncio.run(narrator.generate_voting_narrative("Bob", {"total_votes": 3, "margin": "unanimous"}))
         print(f"\n⚖️ VOTING RESULT:")
         print(f"   {vote_result}")
         
         # Game ending
-        ending = narrator.generate_game_ending("innocents", ["Charlie", "Diana"])
+        ending = asyncio.run(narrator.generate_game_ending("innocents", ["Charlie", "Diana"]))
         print(f"\n🏆 GAME END:")
         print(f"   {ending}")
         
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -22,17 +23,17 @@ def test_deepseek_client():
         prompt = "Write a short description of a baker in a small town. Maximum 2 sentences."
         print(f"🔄 Testing with prompt: {prompt}")
         
-        response = client.generate_text(prompt, max_tokens=100, temperature=0.7)
+        response = asyncio.run(client.generate_text(prompt, max_tokens=100, temperature=0.7))
         print(f"✅ Response received: {response}")
         print(f"📏 Response length: {len(response)} characters")
 
         # Test with different parameters
         print("\n🔄 Testing with lower temperature...")
-        response2 = client.generate_text(
+        response2 = asyncio.run(client.generate_text(
             "Describe a librarian in one sentence.",
             max_tokens=50,
             temperature=0.3
-        )
+        ))
         print(f"✅ Second response: {response2}")
         
         print("\n🎉 All tests passed!")
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -34,32 +35,32 @@ def test_narrator_service():
         # 4. Test opening story
         print(f"\n📖 Testing story opening...")
         player_names = ["Alice", "Bob", "Charlie"]
-        opening = narrator.generate_story_opening(player_names)
+        opening = asyncio.run(narrator.generate_story_opening(player_names))
         print(f"✅ Opening story:")
         print(f"   {opening}")
         
         # 5. Test death narrative
         print(f"\n⚰️ Testing death narrative...")
-        death_story = narrator.generate_death_narrative("Alice", "mafia", {})
+        death_story = asyncio.run(narrator.generate_death_narrative("Alice", "mafia", {}))
         print(f"✅ Death narrative:")
         print(f"   {death_story}")
         
         # 6. Test voting narrative
         print(f"\n🗳️ Testing voting narrative...")
         vote_results = {"total_votes": 3, "margin": "close"}
-        voting_story = narrator.generate_voting_narrative("Bob", vote_results)
+        voting_story = asyncio.run(narrator.generate_voting_narrative("Bob", vote_results))
         print(f"✅ Voting narrative:")
         print(f"   {voting_story}")
         
         # 7. Test phase transition
         print(f"\n🌅 Testing phase transition...")
-        transition = narrator.generate_phase_transition("night", "day")
+        transition = asyncio.run(narrator.generate_phase_transition("night", "day"))
         print(f"✅ Phase transition:")
         print(f"   {transition}")
         
         # 8. Test game ending
         print(f"\n🏆 Testing game ending...")
-        ending = narrator.generate_game_ending("innocents", ["Charlie"])
+        ending = asyncio.run(narrator.generate_game_ending("innocents", ["Charlie"]))
         print(f"✅ Game ending:")
         print(f"   {ending}")
         
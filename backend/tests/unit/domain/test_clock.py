@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from app.domain.clock import Clock, VirtualClock
+from app.domain.game_manager import GameManager
+
+
+class FakeClock(Clock):
+    def __init__(self):
+        self.now = 1000.0
+        self.wall_offset = 1_750_000_000.0
+
+    def monotonic(self):
+        return self.now
+
+    def wall(self):
+        return self.now + self.wall_offset
+
+
+def test_to_wall():
+    clock = FakeClock()
+    assert clock.to_wall(1030.0) == 1_750_001_030.0
+
+
+def test_phase_deadline_ignores_wall_clock_jumps(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    clock = FakeClock()
+    gm = GameManager(clock=clock)
+    assert gm.scheduler.clock == clock.monotonic
+
+    gm._set_phase_deadline(35)
+    assert gm.phase_deadline == 1035.0
+    assert gm.next_phase_timestamp == 1_750_001_035.0
+
+    # NTP steps the wall clock forward, the phase still ends 35s after it started
+    clock.wall_offset += 3600
+    assert gm.phase_deadline == 1035.0
+    gm._extend_phase(5)
+    assert gm.phase_deadline == 1040.0
+    assert gm.next_phase_timestamp == 1_750_001_040.0
+
+
+@pytest.mark.asyncio
+async def test_virtual_clock_jumps_to_each_deadline():
+    clock = VirtualClock()
+    fired = []
+
+    async def record(name):
+        fired.append((name, clock.monotonic()))
+
+    clock.scheduler.call_at(30, lambda: record("late"))
+    clock.scheduler.call_at(10, lambda: record("early"))
+    await clock.advance(20)
+    assert fired == [("early", 10)]
+    assert clock.monotonic() == 20
+
+    await clock.advance(20)
+    assert fired == [("early", 10), ("late", 30)]
+    assert clock.monotonic() == 40
+
+
+@pytest.mark.asyncio
+async def test_virtual_sleep_wakes_when_advanced():
+    clock = VirtualClock()
+    woke = []
+
+    async def sleeper():
+        await clock.sleep(5)
+        woke.append(clock.monotonic())
+
+    task = asyncio.create_task(sleeper())
+    await clock.advance(4)
+    assert woke == []
+    await clock.advance(1)
+    assert woke == [5]
+    await task
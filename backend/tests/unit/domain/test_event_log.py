@@ -0,0 +1,99 @@
+import pytest
+from app.domain.event_log import EventLog
+from app.domain.game_manager import GameManager, PlayerAdapter
+from schemas.game import GameLogEntry, GameLogRequest, GameLogRequestPayload
+
+
+def entry(i):
+    return GameLogEntry(timestamp=float(i), event="player.joined", details={"i": i})
+
+
+@pytest.fixture
+def log():
+    log = EventLog(retention=5)
+    for i in range(8):
+        log.append(entry(i))
+    return log
+
+
+def test_offsets_survive_retention(log):
+    assert log.next_offset == 8
+    assert log.first_offset == 3
+
+
+def test_read_from_cursor(log):
+    offset, entries = log.read(6)
+    assert offset == 6
+    assert [e.details["i"] for e in entries] == [6, 7]
+
+
+def test_read_clamps_evicted_cursor(log):
+    offset, entries = log.read(0, limit=2)
+    assert offset == 3
+    assert [e.details["i"] for e in entries] == [3, 4]
+
+
+def test_page_before(log):
+    offset, entries = log.page_before(None, 2)
+    assert offset == 6
+    assert [e.details["i"] for e in entries] == [6, 7]
+    offset, entries = log.page_before(6, 10)
+    assert offset == 3
+    assert [e.details["i"] for e in entries] == [3, 4, 5]
+    assert log.page_before(3, 10) == (3, [])
+
+
+class DummyPlayer(PlayerAdapter):
+    def __init__(self):
+        self.events = []
+
+    async def receive_event(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def gm(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    return GameManager(log_retention=10)
+
+
+def logs_received(player):
+    return [e.payload for e in player.events if e.type == "game.log"]
+
+
+@pytest.mark.asyncio
+async def test_log_is_read_on_request_not_pushed(gm):
+    p1 = DummyPlayer()
+    gm.add_player("p1", "Alice", p1)
+    for i in range(4):
+        gm.event_log.append(entry(i))
+    gm._mark_dirty("votes")
+    gm._sync_game_state()
+    await gm._dispatch()
+    # syncs carry the state only, nobody reads the log unless they ask
+    assert logs_received(p1) == []
+    assert all(not e.type == "game.state" or e.payload.logs == [] for e in p1.events)
+
+    # a client reading along asks for what came after the last batch it read
+    request = GameLogRequest(
+        type="game.log_request", payload=GameLogRequestPayload(player_id="p1", after=1, limit=2)
+    )
+    await gm.receive_event(request, p1)
+    batch = logs_received(p1)[-1]
+    assert (batch.offset, [e.details["i"] for e in batch.entries]) == (1, [1, 2])
+
+
+@pytest.mark.asyncio
+async def test_log_request_pages_older_entries(gm):
+    p1 = DummyPlayer()
+    gm.add_player("p1", "Alice", p1)
+    for i in range(6):
+        gm.event_log.append(entry(i))
+    request = GameLogRequest(
+        type="game.log_request", payload=GameLogRequestPayload(player_id="p1", before=4, limit=2)
+    )
+    await gm.receive_event(request, p1)
+    batch = logs_received(p1)[-1]
+    assert batch.offset == 2
+    assert [e.details["i"] for e in batch.entries] == [2, 3]
+    assert batch.next_offset == 6
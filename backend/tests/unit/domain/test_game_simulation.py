@@ -0,0 +1,141 @@
+import random
+import pytest
+from app.domain.clock import VirtualClock
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.game_state import Phase, Role
+from app.services import backends
+from app.services.offline_backend import OfflineBackend
+from schemas.game import (
+    NightAction,
+    NightActionPayload,
+    PlayerJoin,
+    PlayerJoinPayload,
+    Vote,
+    VotePayload,
+)
+
+
+class DummyPlayer(PlayerAdapter):
+    def __init__(self):
+        self.events = []
+
+    async def receive_event(self, event):
+        self.events.append(event)
+
+
+class OfflineService:
+    """Stands in for the LLM services, every generation fails so the room falls back to canned text"""
+
+    def __getattr__(self, name):
+        def unavailable(*args, **kwargs):
+            raise RuntimeError("offline")
+        return unavailable
+
+    def set_character_profiles(self, profiles):
+        pass
+
+
+def make_room(monkeypatch, clock):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    gm = GameManager(clock=clock)
+    gm.narrator_service = OfflineService()
+    gm.character_generator = OfflineService()
+    return gm
+
+
+async def join(gm, count):
+    players = {}
+    for i in range(count):
+        players[f"p{i}"] = DummyPlayer()
+        await gm.receive_event(
+            PlayerJoin(type="player.join", payload=PlayerJoinPayload(player_id=f"p{i}", name=f"Player {i}")),
+            players[f"p{i}"],
+        )
+    return players
+
+
+async def advance_until(clock, reached, limit=600):
+    """Let virtual time run until `reached()` holds"""
+    start = clock.monotonic()
+    while not reached():
+        assert clock.monotonic() - start < limit, "room got stuck"
+        await clock.advance(1)
+
+
+async def advance_to(gm, clock, phase):
+    await advance_until(clock, lambda: not gm.lobby and gm.game_state.phase == phase)
+
+
+async def play_one_game(monkeypatch, seed):
+    random.seed(seed)
+    clock = VirtualClock()
+    gm = make_room(monkeypatch, clock)
+    players = await join(gm, 4)
+
+    await advance_to(gm, clock, Phase.NIGHT)
+    roles = {uuid: state["role"] for uuid, state in gm.game_state.players.items()}
+    mafioso = next(uuid for uuid, role in roles.items() if role == Role.MAFIA)
+    victim = next(uuid for uuid, role in roles.items() if role == Role.INNOCENT)
+    await gm.receive_event(
+        NightAction(type="action.night", payload=NightActionPayload(actor_id=mafioso, action="kill", target_id=victim)),
+        players[mafioso],
+    )
+
+    await advance_to(gm, clock, Phase.VOTING)
+    assert not gm.game_state.players[victim]["alive"]
+    for uuid in players:
+        if gm.game_state.players[uuid]["alive"]:
+            await gm.receive_event(
+                Vote(type="action.vote", payload=VotePayload(actor_id=uuid, target_id=mafioso)), players[uuid]
+            )
+
+    await advance_to(gm, clock, Phase.ENDED)
+    await advance_until(clock, lambda: gm.lobby)
+    return clock.monotonic(), [
+        event.payload.phase if event.type == "phase.change" else event.type for event in players["p0"].events
+    ]
+
+
+@pytest.mark.asyncio
+async def test_full_game_runs_on_virtual_time(monkeypatch):
+    elapsed, events = await play_one_game(monkeypatch, seed=7)
+    phases = [e for e in events if e in ("lobby", "character_intro", "night", "day", "voting", "ended")]
+    # voting announces the next night before the game over check ends it
+    assert phases == ["character_intro", "night", "day", "voting", "night", "ended", "lobby"]
+    assert "character.profiles_complete" in events
+    assert "narrator.message" in events
+    # several minutes of game time went by without waiting for any of it
+    assert elapsed > 120
+
+
+@pytest.mark.asyncio
+async def test_virtual_games_are_deterministic(monkeypatch):
+    assert await play_one_game(monkeypatch, seed=3) == await play_one_game(monkeypatch, seed=3)
+
+
+@pytest.mark.asyncio
+async def test_room_narrates_offline_without_an_api_key(monkeypatch):
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    monkeypatch.setattr(backends, "LLM_BACKEND", "")
+    random.seed(5)
+    clock = VirtualClock()
+    gm = GameManager(clock=clock)
+    assert isinstance(gm.llm_client, OfflineBackend)
+    players = await join(gm, 4)
+
+    await advance_to(gm, clock, Phase.NIGHT)
+    # the generator wrote every profile, none of them is a fallback
+    assert all(" is the town's " in profile.description for profile in gm.character_profiles.values())
+
+    roles = {uuid: state["role"] for uuid, state in gm.game_state.players.items()}
+    mafioso = next(uuid for uuid, role in roles.items() if role == Role.MAFIA)
+    victim = next(uuid for uuid, role in roles.items() if role == Role.INNOCENT)
+    await gm.receive_event(
+        NightAction(type="action.night", payload=NightActionPayload(actor_id=mafioso, action="kill", target_id=victim)),
+        players[mafioso],
+    )
+    await advance_to(gm, clock, Phase.DAY)
+    narrations = [e.payload.text for e in players["p0"].events if e.type == "narrator.message"]
+    death = next(text for text in narrations if gm.player_names[victim] in text)
+    # written by the generator, not the room's canned fallback
+    assert "found dead this morning" not in death
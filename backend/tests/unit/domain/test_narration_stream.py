@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from app.domain.clock import VirtualClock
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.game_state import Phase
+
+
+class RecordingPlayer(PlayerAdapter):
+    def __init__(self):
+        self.events = []
+
+    async def receive_event(self, event):
+        self.events.append(event)
+
+
+class StreamingNarrator:
+    def __init__(self, clock):
+        self.clock = clock
+
+    async def generate_story_opening(self, player_names, on_chunk=None, deadline_s=None):
+        for chunk in ["Night falls", " over the town."]:
+            # the model takes two seconds for each chunk
+            self.clock.now += 2
+            await on_chunk(chunk)
+        # the final text may differ from the chunks, here it's a longer retelling
+        return "Night falls over the town. " * 10
+
+
+@pytest.mark.asyncio
+async def test_opening_story_streams_before_the_final_message(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    clock = VirtualClock()
+    gm = GameManager(clock=clock)
+    gm.narrator_service = StreamingNarrator(clock)
+    player = RecordingPlayer()
+    gm.add_player("p1", "Alice", player)
+    player.events.clear()
+    seen_mid_stream = []
+
+    real_send = gm.narrator_service.generate_story_opening
+
+    async def generate(names, on_chunk=None, deadline_s=None):
+        async def chunk(text):
+            await on_chunk(text)
+            seen_mid_stream.append([e.type for e in player.events])
+        return await real_send(names, on_chunk=chunk)
+
+    gm.narrator_service.generate_story_opening = generate
+    await gm.send_opening_story()
+
+    # each chunk reached the player while the story was still being written
+    assert seen_mid_stream[0] == ["narrator.chunk"]
+    chunks = [e for e in player.events if e.type == "narrator.chunk"]
+    assert [c.payload.text for c in chunks] == ["Night falls", " over the town."]
+    assert [c.payload.index for c in chunks] == [0, 1]
+
+    message = next(e for e in player.events if e.type == "narrator.message")
+    assert message.payload.stream_id == chunks[0].payload.stream_id
+    assert message.payload.text == "Night falls over the town. " * 10
+    # the two seconds between the first chunk and the end come off the animation
+    full = gm._calculate_narrator_duration(message.payload.text)
+    assert message.payload.duration == pytest.approx(full - 2)
+
+
+@pytest.mark.asyncio
+async def test_deltas_are_batched_into_chunks(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    clock = VirtualClock()
+    gm = GameManager(clock=clock)
+    player = RecordingPlayer()
+    gm.add_player("p1", "Alice", player)
+    player.events.clear()
+
+    stream = gm._open_narration()
+    for delta in ["The", " fog", " rolled", " in.", " Nobody", " moved"]:
+        await stream.send(delta)
+    clock.now += 0.1
+    for delta in [" for", " hours"]:
+        await stream.send(delta)
+
+    # the first delta at once, then a sentence, then what gathered over the interval
+    chunks = [e.payload.text for e in player.events if e.type == "narrator.chunk"]
+    assert chunks == ["The", " fog rolled in.", " Nobody moved for"]
+    assert stream.pending == " hours"
+
+
+@pytest.mark.asyncio
+async def test_phase_narration_streams_beside_the_actor(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    gm = GameManager(clock=VirtualClock())
+    player = RecordingPlayer()
+    gm.add_player("p1", "Alice", player)
+    gm.lobby = False
+    gm.game_state.phase = Phase.DAY
+    finish = asyncio.Event()
+
+    class SlowNarrator:
+        async def generate_phase_transition(self, from_phase, to_phase, on_chunk=None, deadline_s=None):
+            await on_chunk("The sun climbs.")
+            await finish.wait()
+            return "The sun climbs over the square."
+
+    gm.narrator_service = SlowNarrator()
+    await gm._submit(gm._end_day)
+    # the room keeps applying commands while the narration is still being written
+    await asyncio.wait_for(gm._submit(lambda: None), 0.1)
+    assert [e.type for e in player.events if e.type.startswith("narrator.")] == ["narrator.chunk"]
+
+    finish.set()
+    await asyncio.gather(*gm._background)
+    message = next(e for e in player.events if e.type == "narrator.message")
+    assert message.payload.text == "The sun climbs over the square."
@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.game_state import Phase, Role
+from app.domain.night_narratives import SPECULATION_RESULTS, WASTED_SPECULATIONS, WASTED_TOKENS, NightNarratives
+from app.domain.scheduler import DeadlineScheduler
+from app.services.llm_scheduler import LLMScheduler, Priority
+from schemas.game import NightAction, NightActionPayload
+
+
+class Narrations:
+    """Generates '<kind> of <target>' once released, recording every call"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def generate(self, kind, target):
+        self.calls.append((kind, target))
+        await self.release.wait()
+        return f"{kind} of {target}"
+
+
+@pytest.mark.asyncio
+async def test_finished_narrative_is_a_hit():
+    narrations = Narrations()
+    narrations.release.set()
+    night = NightNarratives(narrations.generate)
+    hits = SPECULATION_RESULTS.value(result="hit")
+
+    night.update(("death", "p1"))
+    await asyncio.sleep(0)
+    assert await night.take(("death", "p1")) == "death of p1"
+    assert SPECULATION_RESULTS.value(result="hit") == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_changed_votes_cancel_the_stale_narrative():
+    narrations = Narrations()
+    night = NightNarratives(narrations.generate)
+    wasted = WASTED_SPECULATIONS.value(kind="death")
+
+    night.update(("death", "p1"))
+    await asyncio.sleep(0)
+    stale = night._tasks[("death", "p1")]
+    night.update(("save", "p1"))
+    await asyncio.sleep(0)
+    assert stale.cancelled()
+    assert WASTED_SPECULATIONS.value(kind="death") == wasted + 1
+
+    # the end of the night waits for the generation still in flight
+    narrations.release.set()
+    assert await night.take(("save", "p1")) == "save of p1"
+    assert narrations.calls == [("death", "p1"), ("save", "p1")]
+
+
+@pytest.mark.asyncio
+async def test_only_speculations_reaching_the_provider_are_wasted_tokens():
+    # one slot, the first speculation holds it and the second stays queued
+    scheduler = LLMScheduler(max_concurrency=1)
+    release = asyncio.Event()
+
+    async def generate(kind, target):
+        return await scheduler.submit(release.wait, priority=Priority.BACKGROUND, tokens=100)
+
+    night = NightNarratives(generate)
+    wasted = WASTED_TOKENS.value()
+    night.update(("death", "p1"))
+    await asyncio.sleep(0)
+    night.update(("save", "p1"))
+    await asyncio.sleep(0)
+    assert WASTED_TOKENS.value() == wasted + 100
+
+    night.discard()
+    await asyncio.sleep(0)
+    assert WASTED_TOKENS.value() == wasted + 100
+
+
+@pytest.mark.asyncio
+async def test_unexpected_outcome_is_a_miss():
+    narrations = Narrations()
+    narrations.release.set()
+    night = NightNarratives(narrations.generate)
+    night.update(("death", "p1"))
+    assert await night.take(("death", "p2")) is None
+    assert night._tasks == {}
+
+
+class FakeNarrator:
+    def __init__(self):
+        self.generated = []
+        self.recorded = []
+        self.game_context = type("Context", (), {"day_count": 1})()
+
+    async def generate_death_narrative(self, name, killer_role, context, record=True, deadline_s=None, priority=None):
+        self.generated.append((name, record))
+        return f"{name} was found in the bakery."
+
+    async def generate_phase_transition(self, from_phase, to_phase, on_chunk=None, deadline_s=None):
+        return "Dawn breaks."
+
+    def record_death(self, name, killer_role):
+        self.recorded.append(name)
+
+
+class DummyPlayer(PlayerAdapter):
+    async def receive_event(self, event):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_end_of_night_uses_the_speculated_narrative(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    gm = GameManager(scheduler=DeadlineScheduler(), sync_interval_s=600)
+    gm.narrator_service = FakeNarrator()
+    for i in range(4):
+        gm.add_player(f"p{i}", f"Player {i}", DummyPlayer())
+    gm.lobby = False
+    gm.game_state.phase = Phase.NIGHT
+    gm.game_state.players["p0"]["role"] = Role.MAFIA
+
+    await gm._apply_event(
+        NightAction(type="action.night", payload=NightActionPayload(actor_id="p0", action="kill", target_id="p2")),
+        gm.players["p0"],
+    )
+    await asyncio.sleep(0)
+    assert gm.narrator_service.generated == [("Player 2", False)]
+
+    await gm._end_night()
+    # narrated beside the actor, the day starts once it's done
+    await gm._narration_task
+    assert gm.game_state.phase == Phase.DAY and not gm._narrating
+    # no second generation, and the death only went into the story once it happened
+    assert gm.narrator_service.generated == [("Player 2", False)]
+    assert gm.narrator_service.recorded == ["Player 2"]
+    assert not gm.game_state.players["p2"]["alive"]
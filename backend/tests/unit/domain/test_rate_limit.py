@@ -0,0 +1,51 @@
+from app.domain.rate_limit import (
+    DEFAULT_KEY,
+    InboundRateLimiter,
+    RateLimit,
+    parse_rate_limits,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = InboundRateLimiter({DEFAULT_KEY: RateLimit(2, 3)}, clock=clock)
+    assert [limiter.allow("message.send") for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5
+    assert limiter.allow("message.send")
+    assert not limiter.allow("message.send")
+
+
+def test_event_types_have_separate_buckets():
+    clock = FakeClock()
+    limiter = InboundRateLimiter(
+        {DEFAULT_KEY: RateLimit(1, 5), "message.send": RateLimit(1, 1)}, clock=clock
+    )
+    assert limiter.allow("message.send")
+    assert not limiter.allow("message.send")
+    assert limiter.allow("action.vote")
+
+
+def test_repeat_offender_runs_out_of_strikes():
+    clock = FakeClock()
+    limiter = InboundRateLimiter({DEFAULT_KEY: RateLimit(1, 1)}, strikes=2, forgive_rate=0.1, clock=clock)
+    assert limiter.strike()
+    assert limiter.strike()
+    assert not limiter.strike()
+    clock.now += 10
+    assert limiter.strike()
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("message.send=0.5:3, *=10:40") == {
+        "message.send": RateLimit(0.5, 3),
+        "*": RateLimit(10, 40),
+    }
+    assert parse_rate_limits("") == {}
@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.scheduler import DeadlineScheduler
+from schemas.game import PlayerJoin, PlayerJoinPayload, SendMessage, MessagePayload
+
+
+class DummyPlayer(PlayerAdapter):
+    def __init__(self):
+        self.events = []
+
+    async def receive_event(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def gm(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    return GameManager(scheduler=DeadlineScheduler(), sync_interval_s=600)
+
+
+@pytest.mark.asyncio
+async def test_commands_never_interleave(gm):
+    order = []
+
+    async def slow(name):
+        order.append(f"{name} start")
+        await asyncio.sleep(0.01)
+        order.append(f"{name} end")
+
+    await asyncio.gather(gm._submit(slow, "a"), gm._submit(slow, "b"))
+    assert order == ["a start", "a end", "b start", "b end"]
+    assert gm._actor_task.done()
+
+
+@pytest.mark.asyncio
+async def test_events_are_dispatched_after_the_command(gm):
+    player = DummyPlayer()
+
+    def apply():
+        gm._broadcast(
+            SendMessage(type="message.send", payload=MessagePayload(actor_id="p1", timestamp=1.0, text="hi"))
+        )
+        # nothing reaches the players while the command is being applied
+        assert player.events == []
+
+    gm.add_player("p1", "Alice", player)
+    await gm._submit(apply)
+    assert [e.type for e in player.events] == ["message.send"]
+
+
+@pytest.mark.asyncio
+async def test_receive_event_goes_through_the_inbox(gm):
+    player = DummyPlayer()
+    await gm.receive_event(
+        PlayerJoin(type="player.join", payload=PlayerJoinPayload(player_id="p1", name="Alice")), player
+    )
+    assert [e.type for e in player.events] == ["player.joined", "game.state"]
+
+    await gm.leave("p1")
+    assert "p1" not in gm.players
+
+
+@pytest.mark.asyncio
+async def test_failed_command_reaches_the_caller(gm):
+    def fail():
+        raise KeyError("nobody")
+
+    with pytest.raises(KeyError):
+        await gm._submit(fail)
+    # the actor carries on with later commands
+    await gm._submit(lambda: None)
+
+
+@pytest.mark.asyncio
+async def test_profiles_are_written_beside_the_actor(gm):
+    written = asyncio.Event()
+
+    async def generate(player_data):
+        await written.wait()
+        raise RuntimeError("no provider")
+
+    gm.character_generator.generate_profiles_for_players = generate
+    for i in range(4):
+        await gm.receive_event(
+            PlayerJoin(type="player.join", payload=PlayerJoinPayload(player_id=f"p{i}", name=f"P{i}")), DummyPlayer()
+        )
+    # the room keeps applying commands while the profiles are written
+    await asyncio.wait_for(gm._submit(lambda: None), 0.1)
+    assert not gm.profiles_generated
+
+    written.set()
+    profiles = await gm.prepare_character_profiles()
+    assert gm.profiles_generated
+    assert sorted(gm.character_profiles) == sorted(profile.player_id for profile in profiles) == ["p0", "p1", "p2", "p3"]
+
+
+@pytest.mark.asyncio
+async def test_waiting_lobby_ticks_send_nothing(gm):
+    player = DummyPlayer()
+    for i in range(3):
+        await gm.receive_event(
+            PlayerJoin(type="player.join", payload=PlayerJoinPayload(player_id=f"p{i}", name=f"P{i}")), player
+        )
+    player.events.clear()
+    deadline = gm.phase_deadline
+    for _ in range(3):
+        await gm._submit(gm._tick)
+    assert player.events == []
+    assert gm.phase_deadline == deadline
+
+    # the countdown starts with the 4th player
+    async def generate(player_data):
+        raise RuntimeError("no provider")
+
+    gm.character_generator.generate_profiles_for_players = generate
+    await gm.receive_event(
+        PlayerJoin(type="player.join", payload=PlayerJoinPayload(player_id="p3", name="P3")), DummyPlayer()
+    )
+    assert gm.phase_deadline == pytest.approx(gm.clock.monotonic() + gm.lobby_duration_s, abs=1)
@@ -0,0 +1,98 @@
+import asyncio
+import time
+import pytest
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.scheduler import DeadlineScheduler
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def callback(self, name):
+        async def run():
+            self.calls.append((name, time.monotonic()))
+        return run
+
+
+@pytest.mark.asyncio
+async def test_fires_in_deadline_order():
+    scheduler = DeadlineScheduler()
+    recorder = Recorder()
+    now = time.monotonic()
+    scheduler.call_at(now + 0.03, recorder.callback("late"))
+    scheduler.call_at(now + 0.01, recorder.callback("early"))
+    await asyncio.sleep(0.06)
+    assert [name for name, _ in recorder.calls] == ["early", "late"]
+    assert recorder.calls[0][1] >= now + 0.01
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_timer_never_fires():
+    scheduler = DeadlineScheduler()
+    recorder = Recorder()
+    timer = scheduler.call_at(time.monotonic() + 0.01, recorder.callback("cancelled"))
+    scheduler.cancel(timer)
+    assert len(scheduler) == 0
+    await asyncio.sleep(0.03)
+    assert recorder.calls == []
+
+
+@pytest.mark.asyncio
+async def test_earlier_deadline_wakes_the_runner():
+    scheduler = DeadlineScheduler()
+    recorder = Recorder()
+    scheduler.call_at(time.monotonic() + 60, recorder.callback("far"))
+    await asyncio.sleep(0)
+    scheduler.call_at(time.monotonic() + 0.01, recorder.callback("near"))
+    await asyncio.sleep(0.03)
+    assert [name for name, _ in recorder.calls] == ["near"]
+
+
+class FakePlayer(PlayerAdapter):
+    async def receive_event(self, event):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_room_schedules_phase_deadline(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "x")
+    scheduler = DeadlineScheduler()
+    gm = GameManager(scheduler=scheduler, sync_interval_s=600)
+    assert len(scheduler) == 0
+
+    for i in range(4):
+        gm.add_player(f"p{i}", f"Player {i}", FakePlayer())
+    assert len(scheduler) == 1
+    assert gm._tick_timer.when == gm.phase_deadline
+
+    # the narrator extends the phase, and the deadline moves with it
+    gm._extend_phase(5)
+    gm._schedule_tick()
+    assert len(scheduler) == 1
+    assert gm._tick_timer.when == gm.phase_deadline
+
+    for i in range(4):
+        gm.remove_player(f"p{i}")
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_room_arms_no_timer(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "x")
+    scheduler = DeadlineScheduler()
+    gm = GameManager(scheduler=scheduler, sync_interval_s=1)
+    gm.add_player("p0", "Player 0", FakePlayer())
+    # the join is waiting to be synced
+    assert gm._tick_timer.when == pytest.approx(gm.clock.monotonic() + 1, abs=0.1)
+
+    # as if the timer fired
+    scheduler.cancel(gm._tick_timer)
+    await gm._run_tick()
+    # synced and no countdown in a lobby waiting for players, nothing to wake up for
+    assert gm._tick_timer is None and len(scheduler) == 0
+
+    gm._mark_dirty("votes")
+    assert len(scheduler) == 1
+    assert gm._tick_timer.when == pytest.approx(gm.clock.monotonic() + 1, abs=0.1)
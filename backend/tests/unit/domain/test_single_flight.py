@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from app.domain.clock import VirtualClock
+from app.domain.game_manager import GameManager, PlayerAdapter
+from app.domain.single_flight import SingleFlight
+from schemas.game import OpeningStoryRequest
+
+
+class Counter:
+    def __init__(self, result="told", fail=False):
+        self.calls = 0
+        self.result = result
+        self.fail = fail
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("model down")
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    call = Counter()
+    waiters = [asyncio.create_task(flights.do("opening", call)) for _ in range(10)]
+    await asyncio.sleep(0)
+    call.release.set()
+    assert await asyncio.gather(*waiters) == ["told"] * 10
+    assert call.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_late_duplicates_replay_the_result_until_forgotten():
+    flights = SingleFlight()
+    call = Counter()
+    call.release.set()
+    assert await flights.do("opening", call) == "told"
+    assert await flights.do("opening", call) == "told"
+    assert flights.result("opening") == "told"
+    assert call.calls == 1
+
+    flights.forget()
+    assert flights.result("opening") is None
+    await flights.do("opening", call)
+    assert call.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flight_is_retried_by_the_next_caller():
+    flights = SingleFlight()
+    call = Counter(fail=True)
+    call.release.set()
+    with pytest.raises(RuntimeError):
+        await flights.do("opening", call)
+    assert "opening" not in flights
+
+    call.fail = False
+    assert await flights.do("opening", call) == "told"
+    assert call.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_leaves_the_flight_running():
+    flights = SingleFlight()
+    call = Counter()
+    impatient = asyncio.create_task(flights.do("opening", call))
+    patient = asyncio.create_task(flights.do("opening", call))
+    await asyncio.sleep(0)
+    impatient.cancel()
+    call.release.set()
+    assert await patient == "told"
+
+
+class RecordingPlayer(PlayerAdapter):
+    def __init__(self):
+        self.events = []
+
+    async def receive_event(self, event):
+        self.events.append(event)
+
+
+class SlowNarrator:
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = 0
+
+    async def generate_story_opening(self, player_names, on_chunk=None, deadline_s=None):
+        self.calls += 1
+        await self.clock.sleep(3)
+        return "Night falls over the town."
+
+
+@pytest.mark.asyncio
+async def test_room_tells_the_opening_story_once(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    clock = VirtualClock()
+    gm = GameManager(clock=clock)
+    gm.narrator_service = SlowNarrator(clock)
+    players = {f"p{i}": RecordingPlayer() for i in range(10)}
+    for uuid, player in players.items():
+        gm.add_player(uuid, uuid, player)
+
+    request = OpeningStoryRequest(type="opening.story_request")
+    await asyncio.gather(*(gm._submit(gm._apply_event, request, p) for p in players.values()))
+    await clock.advance(3)
+    assert gm.narrator_service.calls == 1
+    for player in players.values():
+        assert [e.type for e in player.events].count("narrator.message") == 1
+
+    # a client asking after the story was told hears it alone, nobody else again
+    late = players["p3"]
+    await gm._submit(gm._apply_event, request, late)
+    assert gm.narrator_service.calls == 1
+    assert [e.type for e in late.events].count("narrator.message") == 2
+    assert [e.type for e in players["p4"].events].count("narrator.message") == 1
@@ -0,0 +1,163 @@
+import pytest
+from app.domain.state_sync import StateSyncTracker
+from schemas.game import GameStatePatch, GameStateSync, GameStateSyncPayload, PlayerState
+
+
+def make_payload(alive=True, votes=None, phase_ends_at=100.0):
+    return GameStateSyncPayload(
+        players=[
+            PlayerState(player_id='p1', name='Alice', alive=True, role_revealed='innocent'),
+            PlayerState(player_id='p2', name='Bob', alive=alive, role_revealed='innocent'),
+        ],
+        phase='day',
+        phase_ends_at=phase_ends_at,
+        votes=votes or {},
+        logs=[],
+    )
+
+
+@pytest.fixture
+def tracker():
+    tracker = StateSyncTracker(history_size=4)
+    tracker.publish({'innocent': make_payload()})
+    return tracker
+
+
+def test_publish_bumps_version_only_on_change(tracker):
+    assert tracker.version == 1
+    assert tracker.publish({'innocent': make_payload()}) == 1
+    assert tracker.publish({'innocent': make_payload(alive=False)}) == 2
+
+
+def test_full_snapshot_until_acked(tracker):
+    first = tracker.event_for('p1', 'innocent').event
+    assert isinstance(first, GameStateSync)
+    assert first.payload.version == 1
+    second = tracker.event_for('p1', 'innocent').event
+    assert isinstance(second, GameStateSync)
+
+
+def test_patch_after_ack(tracker):
+    tracker.event_for('p1', 'innocent')
+    assert tracker.ack('p1', 1)
+    assert tracker.event_for('p1', 'innocent') is None
+
+    tracker.publish({'innocent': make_payload(alive=False, votes={'p1': 'p2'}, phase_ends_at=130.0)})
+    patch = tracker.event_for('p1', 'innocent').event
+    assert isinstance(patch, GameStatePatch)
+    assert patch.payload.base_version == 1
+    assert patch.payload.version == 2
+    assert [p.player_id for p in patch.payload.players] == ['p2']
+    assert patch.payload.votes == {'p1': 'p2'}
+    assert patch.payload.fields == {'phase_ends_at': 130.0}
+
+
+def test_withdrawn_vote_and_removed_player(tracker):
+    tracker.publish({'innocent': make_payload(votes={'p1': 'p2'})})
+    tracker.event_for('p1', 'innocent')
+    tracker.ack('p1', 2)
+
+    payload = make_payload()
+    payload.players = payload.players[:1]
+    tracker.publish({'innocent': payload})
+    patch = tracker.event_for('p1', 'innocent').event
+    assert patch.payload.votes == {'p1': None}
+    assert patch.payload.removed_players == ['p2']
+
+
+def test_patches_are_cumulative_from_acked_version(tracker):
+    tracker.event_for('p1', 'innocent')
+    tracker.ack('p1', 1)
+    tracker.publish({'innocent': make_payload(phase_ends_at=110.0)})
+    tracker.event_for('p1', 'innocent')
+    tracker.publish({'innocent': make_payload(alive=False, phase_ends_at=110.0)})
+    patch = tracker.event_for('p1', 'innocent').event
+    assert patch.payload.base_version == 1
+    assert patch.payload.fields == {'phase_ends_at': 110.0}
+    assert [p.player_id for p in patch.payload.players] == ['p2']
+
+
+def test_full_snapshot_when_acked_version_evicted(tracker):
+    tracker.event_for('p1', 'innocent')
+    tracker.ack('p1', 1)
+    for i in range(5):
+        tracker.publish({'innocent': make_payload(phase_ends_at=200.0 + i)})
+    assert isinstance(tracker.event_for('p1', 'innocent').event, GameStateSync)
+
+
+def test_resync_sends_full_snapshot(tracker):
+    tracker.event_for('p1', 'innocent')
+    tracker.ack('p1', 1)
+    tracker.resync('p1')
+    assert isinstance(tracker.event_for('p1', 'innocent').event, GameStateSync)
+
+
+def test_ack_of_unknown_version_ignored(tracker):
+    tracker.event_for('p1', 'innocent')
+    assert not tracker.ack('p1', 7)
+    assert not tracker.ack('p2', 1)
+
+
+def test_same_audience_shares_one_frame(tracker):
+    first = tracker.event_for('p1', 'innocent')
+    second = tracker.event_for('p2', 'innocent')
+    assert first is second
+    assert first.text is second.text
+
+
+class RecordingPlayer:
+    def __init__(self):
+        self.events = []
+
+    async def receive_event(self, event):
+        self.events.append(event)
+
+    async def receive_encoded(self, frame):
+        self.events.append(frame.event)
+
+
+@pytest.mark.asyncio
+async def test_room_syncs_only_when_dirty(monkeypatch):
+    from app.domain.game_manager import STATE_SYNCS, GameManager
+
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    gm = GameManager()
+    player = RecordingPlayer()
+    gm.add_player("p1", "Alice", player)
+    gm._sync_game_state()
+    await gm._dispatch()
+    assert [e.type for e in player.events] == ["game.state"]
+
+    suppressed = STATE_SYNCS.value(outcome="suppressed")
+    gm._sync_game_state()
+    await gm._dispatch()
+    assert STATE_SYNCS.value(outcome="suppressed") == suppressed + 1
+    assert len(player.events) == 1
+
+    gm.cast_votes["p1"] = "p1"
+    gm._mark_dirty("votes")
+    gm._sync_game_state()
+    await gm._dispatch()
+    assert [e.type for e in player.events] == ["game.state", "game.state"]
+    assert player.events[-1].payload.votes == {"p1": "p1"}
+
+
+@pytest.mark.asyncio
+async def test_clean_time_counts_the_syncs_it_spared(monkeypatch):
+    from app.domain.clock import VirtualClock
+    from app.domain.game_manager import STATE_SYNCS, GameManager
+
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    clock = VirtualClock()
+    gm = GameManager(clock=clock, sync_interval_s=1)
+    gm.add_player("p1", "Alice", RecordingPlayer())
+    gm._sync_game_state()
+
+    suppressed = STATE_SYNCS.value(outcome="suppressed")
+    # ten quiet seconds, which used to be ten syncs
+    clock.now += 10.5
+    gm._mark_dirty("votes")
+    assert STATE_SYNCS.value(outcome="suppressed") == suppressed + 10
+    # already dirty, nothing more to count
+    gm._mark_dirty("players")
+    assert STATE_SYNCS.value(outcome="suppressed") == suppressed + 10
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from app.domain.broadcast import EncodedEvent
+from app.routers.outbound import (
+    DROPPED_FRAMES,
+    OutboundQueue,
+    OverflowPolicy,
+    QueueOverflowError,
+)
+from schemas.game import (
+    ActionAck,
+    ActionAckPayload,
+    GameStateSync,
+    GameStateSyncPayload,
+)
+
+
+def ack(message):
+    return EncodedEvent(
+        ActionAck(type="action.ack", payload=ActionAckPayload(success=True, message=message))
+    )
+
+
+def state(ends_at):
+    return EncodedEvent(
+        GameStateSync(
+            type="game.state",
+            payload=GameStateSyncPayload(players=[], phase="lobby", phase_ends_at=ends_at, logs=[]),
+        )
+    )
+
+
+def test_drop_oldest_when_full():
+    queue = OutboundQueue(maxsize=2, policy=OverflowPolicy.DROP_OLDEST)
+    dropped_before = DROPPED_FRAMES.value(policy="drop_oldest", type="action.ack")
+    for message in ["a", "b", "c"]:
+        queue.put(ack(message))
+    assert [f.event.payload.message for f in queue.frames] == ["b", "c"]
+    assert DROPPED_FRAMES.value(policy="drop_oldest", type="action.ack") == dropped_before + 1
+
+
+@pytest.mark.parametrize("policy", list(OverflowPolicy))
+def test_newer_state_replaces_queued_one(policy):
+    queue = OutboundQueue(maxsize=8, policy=policy)
+    queue.put(ack("a"))
+    queue.put(state(1.0))
+    queue.put(ack("b"))
+    queue.put(state(2.0))
+    assert [f.type for f in queue.frames] == ["action.ack", "action.ack", "game.state"]
+    assert queue.frames[-1].event.payload.phase_ends_at == 2.0
+    assert [f.event.payload.message for f in queue.frames if f.type == "action.ack"] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_state_written_is_not_replaced():
+    queue = OutboundQueue(maxsize=8)
+    first = state(1.0)
+    queue.put(first)
+    assert await queue.get() is first
+    queue.put(state(2.0))
+    assert len(queue) == 1
+
+
+def test_coalesce_keeps_pending_state_on_overflow():
+    queue = OutboundQueue(maxsize=2, policy=OverflowPolicy.COALESCE)
+    queue.put(state(1.0))
+    queue.put(ack("a"))
+    queue.put(ack("b"))
+    assert [f.type for f in queue.frames] == ["game.state", "action.ack"]
+    assert queue.frames[1].event.payload.message == "b"
+
+
+def test_disconnect_policy_raises():
+    queue = OutboundQueue(maxsize=1, policy=OverflowPolicy.DISCONNECT)
+    queue.put(ack("a"))
+    with pytest.raises(QueueOverflowError):
+        queue.put(ack("b"))
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_frame():
+    queue = OutboundQueue(maxsize=2)
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    assert not getter.done()
+    frame = ack("a")
+    queue.put(frame)
+    assert await getter is frame
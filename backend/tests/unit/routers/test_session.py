@@ -0,0 +1,152 @@
+import asyncio
+import json
+import pytest
+from fastapi import WebSocketDisconnect
+from app.domain.broadcast import EncodedEvent
+from app.routers.outbound import ReplayBuffer
+from app.routers.websocket import HALF_OPEN_CONNECTIONS, IDLE_EVICTIONS, WebSocketPlayerAdapter
+from schemas.game import ActionAck, ActionAckPayload, HeartbeatPong, PlayerUuid, PlayerUuidPayload
+from schemas.wire import JSON_CODEC
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+        self.inbound = asyncio.Queue()
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+    async def close(self, code):
+        self.closed = True
+
+    async def receive(self):
+        return await self.inbound.get()
+
+
+def ack(message):
+    return EncodedEvent(
+        ActionAck(type="action.ack", payload=ActionAckPayload(success=True, message=message))
+    )
+
+
+def messages(ws):
+    return [f["payload"]["message"] for f in ws.sent if f["type"] == "action.ack"]
+
+
+def test_replay_buffer_returns_frames_after_seq():
+    buffer = ReplayBuffer(size=3)
+    for message in "abcd":
+        buffer.record(ack(message))
+    assert buffer.seq == 4
+    assert [f.event.payload.message for f in buffer.since(2)] == ["c", "d"]
+    assert buffer.since(4) == []
+    # "a" fell out of the buffer, and the client can't be ahead of us
+    assert buffer.since(0) is None
+    assert buffer.since(5) is None
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_only_missed_frames():
+    old_ws = FakeWebSocket()
+    adapter = WebSocketPlayerAdapter(old_ws, codec=JSON_CODEC)
+    await adapter.receive_event(
+        PlayerUuid(type="player.uuid", payload=PlayerUuidPayload(uuid="p1", resume_token="t"))
+    )
+    for message in "abc":
+        await adapter.receive_encoded(ack(message))
+    await asyncio.sleep(0)
+    assert messages(old_ws) == ["a", "b", "c"]
+    # player.uuid isn't sequenced
+    assert adapter.replay.seq == 3
+
+    adapter.detach()
+    await adapter.receive_encoded(ack("d"))
+
+    new_ws = FakeWebSocket()
+    # the client only got "a" before the connection dropped
+    assert await adapter.attach(new_ws, JSON_CODEC, "p1", last_seq=1)
+    await asyncio.sleep(0)
+    assert new_ws.sent[0]["type"] == "session.resumed"
+    assert new_ws.sent[0]["payload"] == {"uuid": "p1", "seq": 1, "replayed": 2, "complete": True}
+    assert messages(new_ws) == ["b", "c", "d"]
+    assert adapter.replay.seq == 4
+    await adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_past_the_buffer_is_incomplete():
+    adapter = WebSocketPlayerAdapter(FakeWebSocket(), codec=JSON_CODEC, replay_size=2)
+    for message in "abc":
+        await adapter.receive_encoded(ack(message))
+    await asyncio.sleep(0)
+    adapter.detach()
+
+    new_ws = FakeWebSocket()
+    assert not await adapter.attach(new_ws, JSON_CODEC, "p1", last_seq=0)
+    assert new_ws.sent[0]["payload"] == {"uuid": "p1", "seq": 3, "replayed": 0, "complete": False}
+    await adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_frames_dropped_while_detached_force_a_resync():
+    adapter = WebSocketPlayerAdapter(FakeWebSocket(), codec=JSON_CODEC, send_queue_size=2)
+    await adapter.receive_encoded(ack("a"))
+    await asyncio.sleep(0)
+    adapter.detach()
+    # the queue overflows while nobody is writing it, "b" is lost
+    for message in "bcd":
+        await adapter.receive_encoded(ack(message))
+
+    new_ws = FakeWebSocket()
+    assert not await adapter.attach(new_ws, JSON_CODEC, "p1", last_seq=1)
+    await asyncio.sleep(0)
+    assert new_ws.sent[0]["payload"]["complete"] is False
+    assert messages(new_ws) == ["c", "d"]
+
+    # the gap is accounted for once, a later clean resume is complete again
+    adapter.detach()
+    assert await adapter.attach(FakeWebSocket(), JSON_CODEC, "p1", last_seq=adapter.replay.seq)
+    await adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_takes_over_a_half_open_socket():
+    old_ws = FakeWebSocket()
+    adapter = WebSocketPlayerAdapter(old_ws, codec=JSON_CODEC)
+    new_ws = FakeWebSocket()
+    await adapter.attach(new_ws, JSON_CODEC, "p1", last_seq=0)
+    assert old_ws.closed
+    assert adapter.ws is new_ws
+    await adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_missed_heartbeat_marks_connection_half_open():
+    ws = FakeWebSocket()
+    adapter = WebSocketPlayerAdapter(ws, codec=JSON_CODEC, heartbeat_interval_s=0.01)
+    half_open_before = HALF_OPEN_CONNECTIONS.value()
+    await asyncio.sleep(0.05)
+    assert any(f["type"] == "heartbeat.ping" for f in ws.sent)
+    assert adapter.half_open
+    assert HALF_OPEN_CONNECTIONS.value() == half_open_before + 1
+
+    ping = next(f for f in ws.sent if f["type"] == "heartbeat.ping")
+    await ws.inbound.put({"type": "websocket.receive", "text": json.dumps({"type": "heartbeat.pong", "payload": ping["payload"]})})
+    assert isinstance(await adapter.receive_client_event(), HeartbeatPong)
+    assert not adapter.half_open
+    assert HALF_OPEN_CONNECTIONS.value() == half_open_before
+    await adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_silent_connection_is_evicted():
+    ws = FakeWebSocket()
+    adapter = WebSocketPlayerAdapter(ws, codec=JSON_CODEC, heartbeat_interval_s=0, heartbeat_timeout_s=0.01)
+    evictions_before = IDLE_EVICTIONS.value()
+    with pytest.raises(WebSocketDisconnect):
+        await adapter.receive_client_event()
+    assert ws.closed
+    assert IDLE_EVICTIONS.value() == evictions_before + 1
+    await adapter.close()
@@ -0,0 +1,98 @@
+import pytest
+from schemas.game import (
+    GameStatePatch,
+    GameStatePatchPayload,
+    GameStateRequest,
+    GameStateSync,
+    GameStateSyncPayload,
+    GameLogEntry,
+    NightAction,
+    NightActionPayload,
+    OpeningStoryRequest,
+    PlayerState,
+)
+from schemas.wire import (
+    EVENT_TAGS,
+    JSON_CODEC,
+    MSGPACK_SUBPROTOCOL,
+    MsgpackCodec,
+    event_models,
+    negotiate,
+)
+
+msgpack = pytest.importorskip("msgpack")
+
+EVENTS = [
+    NightAction(type="action.night", payload=NightActionPayload(actor_id="p1", action="kill", target_id="p2")),
+    GameStateRequest(type="game.sync_request", player_id="p1"),
+    OpeningStoryRequest(type="opening.story_request"),
+    GameStateSync(type="game.state", payload=GameStateSyncPayload(
+        version=3,
+        players=[PlayerState(player_id="p", name="Alice", alive=True, role_revealed="mafia")],
+        phase="night",
+        phase_ends_at=10.0,
+        votes={"p": "v"},
+        logs=[GameLogEntry(timestamp=1.0, event="player.joined", details={"player_id": "p"})],
+    )),
+    GameStatePatch(type="game.state_patch", payload=GameStatePatchPayload(
+        version=4, base_version=3, votes={"p": None}, fields={"phase": "day"},
+    )),
+]
+
+
+def test_every_event_type_has_a_tag():
+    assert set(event_models()) <= set(EVENT_TAGS)
+
+
+@pytest.mark.parametrize("event", EVENTS, ids=lambda e: e.type)
+def test_msgpack_round_trip(event):
+    codec = MsgpackCodec()
+    data = codec.encode(event)
+    assert isinstance(data, bytes)
+    assert type(event).model_validate(codec.decode(data)) == event
+
+
+def test_msgpack_keeps_dynamic_dict_keys():
+    codec = MsgpackCodec()
+    tag, fields = msgpack.unpackb(codec.encode(EVENTS[3]))
+    assert tag == EVENT_TAGS["game.state"]
+    assert fields["pl"]["vo"] == {"p": "v"}
+    assert fields["pl"]["l"][0]["dt"] == {"player_id": "p"}
+
+
+def test_msgpack_rejects_malformed_frames():
+    codec = MsgpackCodec()
+    for data in [b"\xc1", msgpack.packb([999, {}]), msgpack.packb(5), "text"]:
+        with pytest.raises(ValueError):
+            codec.decode(data)
+
+
+def test_negotiate_defaults_to_json():
+    assert negotiate([]) == (JSON_CODEC, None)
+    assert negotiate(["unknown"]) == (JSON_CODEC, None)
+    codec, subprotocol = negotiate(["unknown", MSGPACK_SUBPROTOCOL])
+    assert codec.binary and subprotocol == MSGPACK_SUBPROTOCOL
+
+
+def test_json_decode_event_single_pass():
+    event = JSON_CODEC.decode_event(b'{"type": "action.night", "payload": {"actor_id": "p1", "action": "kill", "target_id": "p2"}}')
+    assert event == EVENTS[0]
+
+
+@pytest.mark.parametrize("raw", [
+    '{"type": "game.state", "payload": {}}',
+    '{"type": "action.vote", "payload": {"actor_id": "p1"}}',
+    '{"payload": {}}',
+    '[1, 2]',
+    'not json',
+])
+def test_json_decode_event_rejects_invalid_frames(raw):
+    with pytest.raises(ValueError):
+        JSON_CODEC.decode_event(raw)
+
+
+def test_msgpack_decode_event_rejects_outbound_types():
+    codec = MsgpackCodec()
+    assert codec.decode_event(codec.encode(EVENTS[1])) == EVENTS[1]
+    with pytest.raises(ValueError):
+        codec.decode_event(codec.encode(EVENTS[3]))
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import pytest
+from app.services.character_generator import CharacterGenerator
+
+
+class FakeLLM:
+    """Answers after a per-name delay and tracks how many calls overlap"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+
+    async def generate_text(self, prompt, **kwargs):
+        name = next(name for name in self.delays if name in prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays[name])
+        finally:
+            self.active -= 1
+        return f"{name} keeps a ledger of every secret in town."
+
+
+def players(*names):
+    return [{"player_id": f"id-{name}", "name": name} for name in names]
+
+
+@pytest.mark.asyncio
+async def test_profiles_are_generated_concurrently_up_to_the_limit():
+    llm = FakeLLM({"Alice": 0.05, "Bob": 0.05, "Carol": 0.05, "Dave": 0.05})
+    generator = CharacterGenerator(llm, concurrency=2, deadline_s=5, batch=False)
+    profiles = await generator.generate_profiles_for_players(players("Alice", "Bob", "Carol", "Dave"))
+    assert [p.player_id for p in profiles] == ["id-Alice", "id-Bob", "id-Carol", "id-Dave"]
+    assert llm.peak == 2
+    assert all("ledger" in p.description for p in profiles)
+
+
+@pytest.mark.asyncio
+async def test_late_profiles_fall_back_individually():
+    llm = FakeLLM({"Alice": 0.01, "Bob": 10})
+    generator = CharacterGenerator(llm, concurrency=4, deadline_s=0.1, batch=False)
+    alice, bob = await generator.generate_profiles_for_players(players("Alice", "Bob"))
+    assert "ledger" in alice.description
+    assert "ledger" not in bob.description
+    assert bob.name == "Bob"
+    await asyncio.sleep(0)
+    assert llm.active == 0
+
+
+class BatchLLM:
+    """Replies to batched prompts with scripted JSON, one reply per call"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    async def generate_text(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.replies.pop(0)
+
+
+def entry(player_id, name, profession, description="Keeps to herself, but never misses a funeral."):
+    return {"player_id": player_id, "name": name, "profession": profession, "description": description}
+
+
+@pytest.mark.asyncio
+async def test_batch_asks_again_only_for_bad_entries(monkeypatch):
+    generator = CharacterGenerator(None, batch=True, batch_retries=1)
+    monkeypatch.setattr(generator, "_select_professions", lambda count: ["Baker", "Nurse", "Chef"])
+    first = [
+        entry("id-Alice", "Alice", "Baker"),
+        # the model swapped the profession, and forgot Carol
+        entry("id-Bob", "Bob", "Mechanic"),
+    ]
+    second = [entry("id-Bob", "Bob", "Nurse"), entry("id-Carol", "Carol", "Chef")]
+    generator.llm_client = BatchLLM("```json\n" + json.dumps(first) + "\n```", json.dumps(second))
+
+    profiles = await generator.generate_profiles_for_players(players("Alice", "Bob", "Carol"))
+    assert [(p.name, p.profession) for p in profiles] == [("Alice", "Baker"), ("Bob", "Nurse"), ("Carol", "Chef")]
+    assert all("funeral" in p.description for p in profiles)
+    assert len(generator.llm_client.prompts) == 2
+    assert "id-Alice" not in generator.llm_client.prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_batch_falls_back_when_retries_run_out():
+    generator = CharacterGenerator(BatchLLM("not json", "[]"), batch=True, batch_retries=1)
+    profiles = await generator.generate_profiles_for_players(players("Alice", "Bob"))
+    assert [p.name for p in profiles] == ["Alice", "Bob"]
+    assert not any("funeral" in p.description for p in profiles)
+
+
+def test_professions_stay_unique_until_all_are_taken():
+    generator = CharacterGenerator(None)
+    professions = generator._select_professions(20)
+    assert len(set(professions[:16])) == 16
+
+
+def test_malformed_batch_entries_are_skipped_one_by_one():
+    generator = CharacterGenerator(None)
+    pending = {"id-Alice": ("Alice", "Baker"), "id-Bob": ("Bob", "Nurse")}
+    reply = [
+        {**entry("id-Alice", "Alice", "Baker"), "player_id": ["id-Alice"]},
+        {**entry("id-Alice", "Alice", "Baker"), "player_id": {"id": "id-Alice"}},
+        {**entry("id-Bob", "Bob", "Nurse"), "profession": ["Nurse"]},
+        entry("id-Alice", "Alice", "Baker"),
+    ]
+    profiles = generator._parse_batch_response(json.dumps(reply), pending)
+    assert [p.player_id for p in profiles] == ["id-Alice"]
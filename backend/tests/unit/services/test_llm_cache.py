@@ -0,0 +1,121 @@
+import asyncio
+import random
+import sqlite3
+import threading
+import httpx
+import pytest
+from app.services import llm_client
+from app.services.llm_cache import SECONDS_SAVED, NarrativeCache
+from app.services.llm_client import DeepSeekClient
+from app.services.llm_resilience import CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_covers_model_prompt_and_parameters():
+    key = NarrativeCache.key("m", "Day turns to voting", max_tokens=80, temperature=0.6)
+    assert key == NarrativeCache.key("m", "Day turns to voting", temperature=0.6, max_tokens=80)
+    assert key != NarrativeCache.key("m", "Day turns to voting", max_tokens=80, temperature=0.7)
+    assert key != NarrativeCache.key("other", "Day turns to voting", max_tokens=80, temperature=0.6)
+
+
+@pytest.mark.asyncio
+async def test_hits_expire_and_evict_least_recently_used():
+    clock = Clock()
+    cache = NarrativeCache(size=2, ttl_s=60, reuse=1.0, path=None, clock=clock)
+    cache.put("a", "Dawn breaks.", 1.5)
+    cache.put("b", "The square fills.", 1.0)
+    saved = SECONDS_SAVED.total()
+    assert await cache.get("a") == "Dawn breaks."
+    assert SECONDS_SAVED.total() == saved + 1.5
+
+    # "a" was used last, so "b" makes way
+    cache.put("c", "Night falls.", 1.0)
+    assert await cache.get("b") is None
+    assert len(cache) == 2
+
+    clock.now += 61
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_only_a_share_of_hits_is_served():
+    cache = NarrativeCache(reuse=0.25, variants=3, path=None, rng=random.Random(4))
+    cache.put("k", "Dawn breaks.", 1.0)
+    served = sum([await cache.get("k") is not None for _ in range(400)])
+    assert 60 < served < 140
+
+    # declined hits bring new variants, which are served in turn
+    cache.put("k", "The sun rises over the gallows.", 1.0)
+    cache.reuse = 1.0
+    assert {await cache.get("k") for _ in range(50)} == {"Dawn breaks.", "The sun rises over the gallows."}
+
+
+@pytest.mark.asyncio
+async def test_disk_store_survives_a_restart(tmp_path):
+    path = str(tmp_path / "narratives.db")
+    cache = NarrativeCache(reuse=1.0, path=path)
+    cache.put("k", "Dawn breaks.", 2.0)
+    cache.close()
+    assert await NarrativeCache(reuse=1.0, path=path).get("k") == "Dawn breaks."
+
+
+@pytest.mark.asyncio
+async def test_disk_lookups_run_off_the_event_loop(tmp_path):
+    cache = NarrativeCache(size=1, reuse=1.0, path=str(tmp_path / "narratives.db"))
+    cache.put("a", "Dawn breaks.", 1.0)
+    # "a" only survives on disk now
+    cache.put("b", "Night falls.", 1.0)
+    loop_thread = threading.get_ident()
+    threads = []
+    read = cache._read
+    cache._read = lambda key: threads.append(threading.get_ident()) or read(key)
+
+    assert await cache.get("a") == "Dawn breaks."
+    assert threads and loop_thread not in threads
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_unreadable_store_is_a_miss(tmp_path):
+    cache = NarrativeCache(size=1, reuse=1.0, path=str(tmp_path / "narratives.db"))
+    cache.put("a", "Dawn breaks.", 1.0)
+    cache.put("b", "Night falls.", 1.0)
+    db = cache._db
+
+    class Locked:
+        def execute(self, *args):
+            raise sqlite3.OperationalError("database is locked")
+
+        def close(self):
+            db.close()
+
+    cache._db = Locked()
+    assert await cache.get("a") is None
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeated_prompts_from_the_cache(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Dawn breaks."}}]})
+
+    monkeypatch.setattr(llm_client, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(llm_client, "_http_client_loop", asyncio.get_running_loop())
+    client = DeepSeekClient(
+        api_key="test", cache=NarrativeCache(reuse=1.0, path=None), breaker=CircuitBreaker("test")
+    )
+
+    assert await client.generate_text("night to day", max_tokens=80) == "Dawn breaks."
+    assert await client.generate_text("night to day", max_tokens=80) == "Dawn breaks."
+    assert [d async for d in client.stream_text("night to day", max_tokens=80)] == ["Dawn breaks."]
+    assert len(requests) == 1
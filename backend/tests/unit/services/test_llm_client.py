@@ -0,0 +1,268 @@
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from app.services import llm_client
+from app.services.llm_cache import NarrativeCache
+from app.services.llm_client import DeepSeekClient, get_http_client
+from app.services.llm_resilience import CircuitBreaker, LatencyWindow
+from app.services.llm_scheduler import LLMScheduler, Priority
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    # every test here talks to the transport, cached replies would hide it
+    monkeypatch.setattr(llm_client, "llm_cache", NarrativeCache(reuse=0.0, path=None))
+
+
+@pytest.fixture(autouse=True)
+def breaker(monkeypatch):
+    # failures provoked here mustn't open the process-wide breaker
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_s=60)
+    monkeypatch.setattr(llm_client, "llm_breaker", breaker)
+    monkeypatch.setattr(llm_client, "llm_latencies", LatencyWindow())
+    return breaker
+
+
+def completion(text):
+    return {"choices": [{"message": {"content": text}}]}
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Route the pooled client to an in-process handler"""
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm_client, "_http_client", client)
+        monkeypatch.setattr(llm_client, "_http_client_loop", asyncio.get_running_loop())
+    return install
+
+
+@pytest.mark.asyncio
+async def test_generate_text(transport):
+    transport(lambda request: httpx.Response(200, json=completion("  The baker knows.  ")))
+    client = DeepSeekClient(api_key="test")
+    assert await client.generate_text("Describe a baker") == "The baker knows."
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_do_not_block_the_loop(transport):
+    async def slow(request):
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json=completion("later"))
+
+    transport(slow)
+    client = DeepSeekClient(api_key="test")
+    start = time.monotonic()
+    results = await asyncio.gather(*(client.generate_text("hi") for _ in range(5)))
+    assert results == ["later"] * 5
+    assert time.monotonic() - start < 0.4
+
+
+@pytest.mark.asyncio
+async def test_api_errors_are_reported(transport):
+    transport(lambda request: httpx.Response(401, json={}))
+    with pytest.raises(Exception, match="Invalid API key"):
+        await DeepSeekClient(api_key="test").generate_text("hi")
+
+
+@pytest.mark.asyncio
+async def test_client_is_pooled_per_loop():
+    client = get_http_client()
+    assert get_http_client() is client
+    await llm_client.close_http_client()
+    assert get_http_client() is not client
+    await llm_client.close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_client_of_a_finished_loop_is_closed(monkeypatch):
+    stale_loop = asyncio.new_event_loop()
+    stale_loop.close()
+    stale = httpx.AsyncClient()
+    monkeypatch.setattr(llm_client, "_http_client", stale)
+    monkeypatch.setattr(llm_client, "_http_client_loop", stale_loop)
+    client = get_http_client()
+    assert client is not stale
+    await asyncio.gather(*llm_client._retiring)
+    assert stale.is_closed
+    await llm_client.close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_stream_text_yields_deltas(transport):
+    events = [
+        ": OPENROUTER PROCESSING",
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        'data: {"choices": [{"delta": {"content": "The baker"}}]}',
+        'data: {"choices": [{"delta": {"content": " knows."}}]}',
+        "data: [DONE]",
+    ]
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, text="\n\n".join(events) + "\n\n", headers={"Content-Type": "text/event-stream"})
+
+    transport(handler)
+    client = DeepSeekClient(api_key="test")
+    assert [delta async for delta in client.stream_text("Describe a baker")] == ["The baker", " knows."]
+
+
+@pytest.mark.asyncio
+async def test_stream_errors_are_reported(transport):
+    transport(lambda request: httpx.Response(500, json={}))
+    with pytest.raises(Exception, match="server error"):
+        async for _ in DeepSeekClient(api_key="test").stream_text("hi"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_skips_the_provider(transport, breaker):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500, json={})
+
+    transport(handler)
+    client = DeepSeekClient(api_key="test")
+    for _ in range(2):
+        with pytest.raises(Exception, match="server error"):
+            await client.generate_text("hi")
+    assert breaker.state == breaker.OPEN
+
+    with pytest.raises(Exception, match="unhealthy"):
+        await client.generate_text("hi")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_falls_back_and_frees_the_slot(transport):
+    cancelled = asyncio.Event()
+
+    async def hang(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    transport(hang)
+    client = DeepSeekClient(api_key="test")
+    with pytest.raises(Exception, match="Deadline"):
+        await client.generate_text("hi", deadline_s=0.05)
+    # the request itself was abandoned, not left holding its scheduler slot
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert client.scheduler._running == 0
+
+
+@pytest.mark.asyncio
+async def test_deadlines_running_out_in_the_queue_spare_the_breaker(transport, breaker):
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    transport(hang)
+    client = DeepSeekClient(api_key="test", scheduler=LLMScheduler(max_concurrency=1))
+    calls = [client.generate_text("hi", priority=Priority.CRITICAL, deadline_s=0.05) for _ in range(3)]
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert all("Deadline" in str(result) for result in results)
+    # only the call holding the slot reached the provider, the queued ones never did
+    assert breaker.failures == 1
+    assert breaker.state == breaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged(transport):
+    replies = iter([0.5, 0.0])
+
+    async def handler(request):
+        await asyncio.sleep(next(replies))
+        return httpx.Response(200, json=completion("hedged"))
+
+    transport(handler)
+    client = DeepSeekClient(api_key="test", hedge_percentile=95)
+    for _ in range(llm_client.LLM_HEDGE_MIN_SAMPLES):
+        client.latencies.add(0.01)
+
+    submitted = []
+    submit = client.scheduler.submit
+
+    def counting_submit(call, **kwargs):
+        submitted.append(kwargs)
+        return submit(call, **kwargs)
+
+    client.scheduler.submit = counting_submit
+    start = time.monotonic()
+    assert await client.generate_text("hi") == "hedged"
+    assert time.monotonic() - start < 0.3
+    assert llm_client.HEDGES.value(result="won") >= 1
+    # the hedge queued on the scheduler too, its tokens counted like the first attempt's
+    assert len(submitted) == 2
+    assert submitted[0] == submitted[1]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_are_not_failures(transport, breaker):
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    transport(hang)
+    client = DeepSeekClient(api_key="test")
+    for _ in range(5):
+        call = asyncio.create_task(client.generate_text("hi"))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+    assert breaker.state == breaker.CLOSED
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_probe_timing_out_in_the_queue_frees_the_slot(transport, breaker):
+    transport(lambda request: httpx.Response(200, json=completion("back")))
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.opened_at -= breaker.reset_s
+    scheduler = LLMScheduler(max_concurrency=0)
+    client = DeepSeekClient(api_key="test", scheduler=scheduler)
+
+    with pytest.raises(Exception, match="Deadline"):
+        await client.generate_text("hi", deadline_s=0.02)
+    # never reached the provider, so the probe slot was never taken
+    breaker.opened_at -= breaker.reset_s
+    assert breaker.allow()
+
+    scheduler.max_concurrency = 1
+    assert await client.generate_text("hi") == "back"
+    assert breaker.state == breaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_throttled_probe_frees_the_slot(transport, breaker):
+    replies = iter([httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, json=completion("back"))])
+    transport(lambda request: next(replies))
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.opened_at -= breaker.reset_s
+    client = DeepSeekClient(api_key="test", scheduler=LLMScheduler(rate_limit_retries=1))
+    # the 429 hands the probe back, the retry probes again and closes the breaker
+    assert await client.generate_text("hi") == "back"
+    assert breaker.state == breaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_local_client_needs_no_key(transport, monkeypatch):
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    urls = []
+
+    def handler(request):
+        urls.append(str(request.url))
+        assert json.loads(request.content)["model"] == "llama"
+        return httpx.Response(200, json=completion("Dawn breaks."))
+
+    transport(handler)
+    client = llm_client.LocalLLMClient(base_url="http://127.0.0.1:8080/v1", model="llama")
+    assert await client.generate_text("night to day") == "Dawn breaks."
+    assert urls == ["http://127.0.0.1:8080/v1/chat/completions"]
@@ -0,0 +1,90 @@
+import pytest
+from app.services.llm_resilience import BREAKER_TRANSITIONS, CircuitBreaker, CircuitOpenError, LatencyWindow
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("opens", failure_threshold=3, clock=FakeClock())
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == breaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_breaker_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker("probes", failure_threshold=1, reset_s=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 29
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    clock.now = 30
+    # queueing a call doesn't take the probe slot, reaching the provider does
+    assert breaker.allow() and breaker.allow()
+    assert breaker.acquire() is not None
+    assert breaker.state == breaker.HALF_OPEN
+    # the probe is still out, everything else keeps falling back
+    assert not breaker.allow()
+
+    # a failed probe opens the breaker for another reset period
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    clock.now = 59
+    assert not breaker.allow()
+
+    clock.now = 60
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.acquire() is None and breaker.acquire() is None
+
+
+def test_probe_without_a_result_hands_the_slot_back():
+    clock = FakeClock()
+    breaker = CircuitBreaker("released", failure_threshold=1, reset_s=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 1
+    probe = breaker.acquire()
+    assert not breaker.allow()
+
+    # a stale token from an earlier probe releases nothing
+    breaker.release(object())
+    assert not breaker.allow()
+    breaker.release(probe)
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
+
+
+def test_state_changes_are_counted():
+    clock = FakeClock()
+    breaker = CircuitBreaker("counted", failure_threshold=1, reset_s=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 1
+    breaker.acquire()
+    breaker.record_success()
+    assert [
+        BREAKER_TRANSITIONS.value(breaker="counted", state=state) for state in ("open", "half_open", "closed")
+    ] == [1, 1, 1]
+
+
+def test_latency_percentile():
+    window = LatencyWindow(size=100)
+    assert window.percentile(95) is None
+    for ms in range(1, 101):
+        window.add(ms / 1000)
+    assert window.percentile(50) == 0.05
+    assert window.percentile(95) == 0.095
+    assert window.percentile(100) == 0.1
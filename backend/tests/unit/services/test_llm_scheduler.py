@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from app.services.llm_scheduler import LLMScheduler, Priority, RateLimitedError
+
+
+class Gate:
+    """Jobs that record when they start and finish only once released"""
+
+    def __init__(self):
+        self.started = []
+        self.release = asyncio.Event()
+
+    def job(self, name):
+        async def run():
+            self.started.append(name)
+            await self.release.wait()
+            return name
+        return run
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_starts_first():
+    scheduler = LLMScheduler(max_concurrency=1)
+    gate = Gate()
+    first = asyncio.create_task(scheduler.submit(gate.job("first")))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(scheduler.submit(gate.job("flavor"), Priority.FLAVOR)),
+        asyncio.create_task(scheduler.submit(gate.job("profile"), Priority.BACKGROUND)),
+        asyncio.create_task(scheduler.submit(gate.job("death"), Priority.CRITICAL)),
+    ]
+    await asyncio.sleep(0)
+    assert gate.started == ["first"]
+    assert len(scheduler) == 3
+
+    gate.release.set()
+    await asyncio.gather(first, *queued)
+    assert gate.started == ["first", "death", "profile", "flavor"]
+
+
+@pytest.mark.asyncio
+async def test_room_cap_lets_other_rooms_through():
+    scheduler = LLMScheduler(max_concurrency=4, max_per_room=1)
+    gate = Gate()
+    jobs = [
+        asyncio.create_task(scheduler.submit(gate.job("a1"), owner="a")),
+        asyncio.create_task(scheduler.submit(gate.job("a2"), owner="a")),
+        asyncio.create_task(scheduler.submit(gate.job("b1"), owner="b")),
+    ]
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert gate.started == ["a1", "b1"]
+
+    gate.release.set()
+    assert await asyncio.gather(*jobs) == ["a1", "a2", "b1"]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_jobs():
+    now = [0.0]
+    # 60 tokens a minute is one a second, with a burst of 60
+    scheduler = LLMScheduler(tokens_per_minute=60, clock=lambda: now[0])
+    gate = Gate()
+    gate.release.set()
+    assert await scheduler.submit(gate.job("big"), tokens=50) == "big"
+
+    waiting = asyncio.create_task(scheduler.submit(gate.job("next"), tokens=20))
+    await asyncio.sleep(0)
+    assert gate.started == ["big"]
+
+    now[0] = 10.0
+    scheduler._pump()
+    assert await waiting == "next"
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_job_is_retried():
+    scheduler = LLMScheduler(rate_limit_retries=1)
+    attempts = []
+
+    async def call():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise RateLimitedError("slow down", retry_after=0.01)
+        return "ok"
+
+    assert await scheduler.submit(call) == "ok"
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_the_caller():
+    scheduler = LLMScheduler()
+
+    async def call():
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        await scheduler.submit(call)
+    assert scheduler._running == 0
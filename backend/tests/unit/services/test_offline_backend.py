@@ -0,0 +1,63 @@
+import json
+import re
+import pytest
+from app.services import backends
+from app.services.backends import make_backend
+from app.services.character_generator import CharacterGenerator
+from app.services.llm_client import DeepSeekClient, LocalLLMClient
+from app.services.narrator_service import NarratorService
+from app.services.offline_backend import OfflineBackend
+
+
+@pytest.mark.asyncio
+async def test_narrations_follow_the_prompt():
+    narrator = NarratorService(OfflineBackend(seed=1))
+    death = await narrator.generate_death_narrative("Alice", "mafia", {})
+    assert "Alice" in death.split(".")[0]
+    assert 3 <= len(re.findall(r"\.", death)) <= 4
+
+    transition = await narrator.generate_phase_transition("night", "day")
+    assert 1 <= len(re.findall(r"\.", transition)) <= 2
+
+
+@pytest.mark.asyncio
+async def test_seeded_backend_repeats_itself():
+    prompt = "Write a brief atmospheric transition.\n- 1-2 sentences maximum"
+    assert await OfflineBackend(seed=7).generate_text(prompt) == await OfflineBackend(seed=7).generate_text(prompt)
+
+
+@pytest.mark.asyncio
+async def test_stream_adds_up_to_the_text():
+    prompt = "- 4-5 sentences maximum"
+    pieces = [piece async for piece in OfflineBackend(seed=3).stream_text(prompt)]
+    assert len(pieces) > 1
+    assert "".join(pieces) == await OfflineBackend(seed=3).generate_text(prompt)
+
+
+@pytest.mark.asyncio
+async def test_batched_profiles_parse_without_fallbacks():
+    generator = CharacterGenerator(OfflineBackend(seed=2), batch=True)
+    players = [{"player_id": f"p{i}", "name": f"Player {i}"} for i in range(6)]
+    pending = {p["player_id"]: (p["name"], "Baker") for p in players}
+
+    response = await generator.llm_client.generate_text(generator._create_batch_prompt(pending))
+    assert [entry["player_id"] for entry in json.loads(response)] == list(pending)
+    assert len(generator._parse_batch_response(response, pending)) == 6
+
+    profiles = await generator.generate_profiles_for_players(players)
+    assert all(profile.description.startswith(profile.name) for profile in profiles)
+
+
+def test_backend_is_chosen_by_name(monkeypatch):
+    monkeypatch.setattr(backends, "LLM_BACKEND", "")
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    assert isinstance(make_backend(), OfflineBackend)
+    assert isinstance(make_backend("local"), LocalLLMClient)
+
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    assert type(make_backend()) is DeepSeekClient
+    monkeypatch.setattr(backends, "LLM_BACKEND", "offline")
+    assert isinstance(make_backend(), OfflineBackend)
+
+    with pytest.raises(ValueError, match="Unknown LLM backend"):
+        make_backend("gpt")